@@ -0,0 +1,256 @@
+# Copyright 2025 CycleCore Technologies
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#!/usr/bin/env python3
+"""
+JSON Extraction Benchmark
+Compare the shared single-pass extractor (lib/json_stream.py) with the two
+extractors it replaced, on EdgeJSON v3 test outputs.
+
+Without --results, model outputs are simulated from the test set: each
+expected object followed by the run-on text small models typically emit
+after it. With --results, the raw model_output strings of an eval.py run
+are used instead.
+
+Usage:
+    python benchmark_json_extraction.py --dataset ../data/edgejson_test_v3.jsonl
+    python benchmark_json_extraction.py --dataset ../data/edgejson_test_v3.jsonl --results results/slm_360m.json
+    python benchmark_json_extraction.py --dataset ../data/edgejson_test_v3.jsonl --output results/json_extraction_benchmark.json
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent / "lib"))
+
+from json_stream import find_json_object
+from latency_bench import median
+
+
+def regex_extract(text: str) -> Dict | None:
+    """Previous eval.py extractor: whole-text parse, then a two-level-nesting regex"""
+    try:
+        return json.loads(text.strip())
+    except json.JSONDecodeError:
+        pass
+
+    json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
+    for match in re.findall(json_pattern, text, re.DOTALL):
+        try:
+            return json.loads(match)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def suffix_extract(text: str) -> Dict | None:
+    """Previous test_mlm_135m_json.py extractor: json.loads on every shorter suffix"""
+    json_text = text.split("Output:")[-1].strip() if "Output:" in text else text.strip()
+
+    start = json_text.find("{")
+    if start == -1:
+        return None
+
+    for end_pos in range(len(json_text), start, -1):
+        try:
+            return json.loads(json_text[start:end_pos])
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def stream_extract(text: str) -> Dict | None:
+    """Shared single-pass extractor, as eval.py uses it: whole-text parse first"""
+    try:
+        return json.loads(text.strip())
+    except (json.JSONDecodeError, RecursionError):
+        pass
+
+    match = find_json_object(text)
+    return match.value if match else None
+
+
+EXTRACTORS: Dict[str, Callable[[str], Dict | None]] = {
+    "regex (eval.py, previous)": regex_extract,
+    "suffix retry (test_mlm_135m_json.py, previous)": suffix_extract,
+    "json_stream.find_json_object": stream_extract,
+}
+
+
+# Hand-written outputs and what eval.py should extract from them
+EDGE_CASES = [
+    ('Sure { here it is: {"a": 1}', {"a": 1}),                            # Stray '{' in prose
+    ('[{"a": 1}]', [{"a": 1}]),                                           # Bare list: kept whole, scores 0
+    ('{"a": {"b": 1}, "c": {"d": 2} ...', {"b": 1}),                      # Truncated: first nested object
+    ('Result: {"a": "}"} and {"b": 2}', {"a": "}"}),                      # Brace inside a string
+    ('{not json} then {"a": {"b": {"c": 3}}}', {"a": {"b": {"c": 3}}}),   # Invalid span, then deep nesting
+    ('{"a": ' * 2000, None),                                              # Runaway nesting, cut off
+]
+
+
+def _extracts(extract: Callable[[str], Dict | None], text: str, expected: Dict | None) -> bool:
+    try:
+        return extract(text) == expected
+    except RecursionError:
+        return False
+
+
+def check_edge_cases() -> Dict[str, int]:
+    """Number of EDGE_CASES each extractor gets right (raising counts as wrong)"""
+    return {
+        name: sum(1 for text, expected in EDGE_CASES if _extracts(extract, text, expected))
+        for name, extract in EXTRACTORS.items()
+    }
+
+
+def truncated_output(chars: int) -> str:
+    """A generation cut off at max_new_tokens while repeating list items: no closed object but the items"""
+    item = '{"sku": "A-100", "qty": 2, "options": {"gift": false}}, '
+    text = '{"order": {"id": "ORD-1", "items": [' + item * (chars // len(item) + 1)
+    return text[:chars]
+
+
+def time_truncated_outputs(lengths: List[int]) -> Dict[str, Dict]:
+    """Time find_json_object on long truncated outputs (the first item is the expected result)"""
+    expected = {"sku": "A-100", "qty": 2, "options": {"gift": False}}
+    report = {}
+    for chars in lengths:
+        text = truncated_output(chars)
+        start = time.perf_counter_ns()
+        value = stream_extract(text)
+        report[str(chars)] = {
+            "ms": (time.perf_counter_ns() - start) / 1e6,
+            "matches_expected": value == expected
+        }
+    return report
+
+
+def simulated_outputs(dataset: List[Dict]) -> List[Dict]:
+    """Expected objects followed by the start of the next example's prompt, as a run-on model would emit"""
+    outputs = []
+    for i, example in enumerate(dataset):
+        run_on = dataset[(i + 1) % len(dataset)]["prompt"]
+        outputs.append({
+            "complexity": example.get("complexity", "unknown"),
+            "expected": example["expected_output"],
+            "text": f"{json.dumps(example['expected_output'])}\n\nInput: {run_on}"
+        })
+    return outputs
+
+
+def recorded_outputs(dataset: List[Dict], results_path: Path) -> List[Dict]:
+    """Raw model outputs of an eval.py results JSON, matched to the dataset by example ID"""
+    with open(results_path, 'r') as f:
+        results = json.load(f)["individual_results"]
+
+    by_id = {example["id"]: example for example in dataset}
+    return [
+        {
+            "complexity": r["complexity"],
+            "expected": by_id[r["example_id"]]["expected_output"],
+            "text": r["model_output"]
+        }
+        for r in results if r.get("example_id") in by_id
+    ]
+
+
+def benchmark(extract: Callable[[str], Dict | None], outputs: List[Dict], repeat: int) -> Dict:
+    """Time one extractor over all outputs (median of repeats) and score what it returns"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for output in outputs:
+            extract(output["text"])
+        timings.append((time.perf_counter_ns() - start) / 1e3)
+
+    report = {"us_per_output": median(timings) / len(outputs), "by_complexity": {}}
+    for complexity in ["simple", "medium", "complex", None]:
+        subset = [o for o in outputs if complexity is None or o["complexity"] == complexity]
+        if not subset:
+            continue
+        parsed = [extract(o["text"]) for o in subset]
+        stats = {
+            "count": len(subset),
+            "parsed": sum(1 for p in parsed if isinstance(p, dict)) / len(subset),
+            "matches_expected": sum(1 for p, o in zip(parsed, subset) if p == o["expected"]) / len(subset)
+        }
+        if complexity is None:
+            report.update(stats)
+        else:
+            report["by_complexity"][complexity] = stats
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON extraction from model output")
+    parser.add_argument("--dataset", type=str, required=True, help="EdgeJSON test set (JSONL)")
+    parser.add_argument("--results", type=str, help="eval.py results JSON with raw model outputs (optional)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes per extractor (median reported)")
+    parser.add_argument("--truncated-chars", type=int, nargs="+", default=[2_000, 17_000, 143_000],
+                        help="Lengths of the truncated outputs to time find_json_object on")
+    parser.add_argument("--output", type=str, help="Save the benchmark JSON here")
+
+    args = parser.parse_args()
+
+    with open(args.dataset, 'r') as f:
+        dataset = [json.loads(line) for line in f]
+
+    if args.results:
+        outputs = recorded_outputs(dataset, Path(args.results))
+        source = args.results
+    else:
+        outputs = simulated_outputs(dataset)
+        source = "simulated run-on outputs"
+    print(f"Benchmarking {len(outputs)} outputs ({source}), {args.repeat} passes each\n")
+
+    reports = {}
+    for name, extract in EXTRACTORS.items():
+        reports[name] = benchmark(extract, outputs, args.repeat)
+
+    baseline_us = reports["json_stream.find_json_object"]["us_per_output"]
+    print(f"{'Extractor':<48} {'us/output':>10} {'vs stream':>10} {'Parsed':>8} {'Correct':>8} {'Complex':>8}")
+    print("-" * 96)
+    for name, report in reports.items():
+        complex_rate = report["by_complexity"].get("complex", {}).get("matches_expected")
+        print(f"{name:<48} {report['us_per_output']:>10.1f} {report['us_per_output'] / baseline_us:>9.1f}x "
+              f"{report['parsed']:>8.1%} {report['matches_expected']:>8.1%} "
+              f"{'n/a' if complex_rate is None else format(complex_rate, '.1%'):>8}")
+
+    edge_cases = check_edge_cases()
+    print(f"\nEdge cases ({len(EDGE_CASES)}): " + ", ".join(f"{name}: {n}" for name, n in edge_cases.items()))
+    if edge_cases["json_stream.find_json_object"] != len(EDGE_CASES):
+        print("⚠️  json_stream.find_json_object missed an edge case")
+
+    truncated = time_truncated_outputs(args.truncated_chars)
+    print("Truncated outputs (json_stream.find_json_object): " + ", ".join(
+        f"{chars} chars: {r['ms']:.1f} ms{'' if r['matches_expected'] else ' (wrong object)'}"
+        for chars, r in truncated.items()))
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w') as f:
+            json.dump({"source": source, "outputs": len(outputs), "extractors": reports,
+                       "edge_cases": edge_cases, "truncated_outputs": truncated}, f, indent=2)
+        print(f"\nResults saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
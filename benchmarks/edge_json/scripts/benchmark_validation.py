@@ -0,0 +1,274 @@
+# Copyright 2025 CycleCore Technologies
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#!/usr/bin/env python3
+"""
+Validation Benchmark
+Validations/sec of QualityValidator.validate_pair on an EdgeJSON dataset,
+before and after the compiled-validator registry.
+
+Strategies:
+- previous: a new QualityValidator (and Draft7Validator) per example
+- registry: a new QualityValidator per example, schema compiled once
+- per-schema: one QualityValidator per schema (what the callers now do)
+- codegen: per-schema, with generated Python schema validators
+- validate_many: codegen validators, fused output walk, process pool
+
+"previous" is QualityValidator before both changes: a Draft7Validator per
+example and three walks of each output (placeholders on json.dumps,
+contact fields, semantic alignment). --pool-size replicates the dataset
+into a larger candidate pool.
+
+All strategies must agree on every example. The codegen validators are
+also checked against jsonschema on schema-violating variants of each
+expected output.
+
+Usage:
+    python benchmark_validation.py --dataset ../data/edgejson_train_v3.jsonl
+    python benchmark_validation.py --dataset ../data/edgejson_train_v3.jsonl --output results/validation_benchmark.json
+    python benchmark_validation.py --dataset ../data/edgejson_train_v3.jsonl --pool-size 100000 --repeat 1 --workers 8
+"""
+
+import argparse
+import copy
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent / "lib"))
+
+from jsonschema import Draft7Validator
+
+from latency_bench import median
+from quality_validator import (
+    EMAIL_RE, PHONE_RE, QualityValidator, ValidationResult, get_compiled_schema, validate_many
+)
+from schema_loader import SchemaLoader
+
+
+# Placeholder regex before placeholder_scanner.py
+PLACEHOLDER_RE = re.compile(
+    r"\b(sample_|test_|foo|bar|lorem ipsum|placeholder|example\.com|xxx|yyy|zzz)\b",
+    re.IGNORECASE
+)
+
+
+class PreviousQualityValidator(QualityValidator):
+    """QualityValidator as it was: compiles its own Draft7Validator, collects every error, walks the output three times"""
+
+    def __init__(self, schema, alignment_threshold: float = 0.3):
+        self.schema = schema
+        self.validator = Draft7Validator(schema)
+        self.alignment_threshold = alignment_threshold
+
+    def validate_pair(self, prompt: str, output_text: str) -> ValidationResult:
+        try:
+            obj = json.loads(self._clean_json_output(output_text))
+        except Exception as e:
+            return ValidationResult(valid=False, reason=f"json_parse_error: {str(e)[:100]}")
+        if not self._validate_schema(obj):
+            return ValidationResult(valid=False, reason="schema_violation")
+        if PLACEHOLDER_RE.search(prompt) or PLACEHOLDER_RE.search(json.dumps(obj)):
+            return ValidationResult(valid=False, reason="placeholders_detected")
+        if not self._previous_contact_fields(obj):
+            return ValidationResult(valid=False, reason="invalid_contact_format")
+        if not self._previous_semantic_alignment(prompt, obj):
+            return ValidationResult(valid=False, reason="weak_semantic_alignment")
+        return ValidationResult(valid=True, reason="ok", parsed_json=obj)
+
+    def _validate_schema(self, obj) -> bool:
+        errors = list(self.validator.iter_errors(obj))
+        return len(errors) == 0
+
+    def _previous_contact_fields(self, obj) -> bool:
+        def walk(d):
+            if isinstance(d, dict):
+                for key, value in d.items():
+                    key_lower = key.lower()
+                    if isinstance(value, str) and value:
+                        if "email" in key_lower and not EMAIL_RE.match(value):
+                            return False
+                        if ("phone" in key_lower or "tel" in key_lower) and not PHONE_RE.match(value):
+                            return False
+                    if not walk(value):
+                        return False
+            elif isinstance(d, list):
+                return all(walk(item) for item in d)
+            return True
+        return walk(obj)
+
+    def _previous_semantic_alignment(self, prompt: str, obj) -> bool:
+        values = []
+
+        def collect(d):
+            if isinstance(d, dict):
+                for v in d.values():
+                    collect(v)
+            elif isinstance(d, list):
+                for v in d:
+                    collect(v)
+            elif isinstance(d, str) and len(d) > 2:
+                values.append(d)
+
+        collect(obj)
+        if not values:
+            return True
+        prompt_lower = prompt.lower()
+        hits = sum(1 for v in values if v.lower() in prompt_lower)
+        return hits / len(values) >= self.alignment_threshold
+
+
+def strategies(schema_loader: SchemaLoader, workers: int) -> Dict[str, Callable[[List[Dict]], List[ValidationResult]]]:
+    """Strategy name -> function validating every example"""
+    def previous(examples):
+        return [
+            PreviousQualityValidator(schema_loader.get(e["schema_id"]).schema).validate_pair(e["prompt"], e["output"])
+            for e in examples
+        ]
+
+    def registry(examples):
+        return [
+            QualityValidator(schema_loader.get(e["schema_id"]).schema, schema_id=e["schema_id"])
+            .validate_pair(e["prompt"], e["output"])
+            for e in examples
+        ]
+
+    def per_schema(codegen: bool):
+        def run(examples):
+            validators = {}
+            results = []
+            for e in examples:
+                validator = validators.get(e["schema_id"])
+                if validator is None:
+                    schema = schema_loader.get(e["schema_id"]).schema
+                    validator = QualityValidator(schema, schema_id=e["schema_id"], codegen=codegen)
+                    validators[e["schema_id"]] = validator
+                results.append(validator.validate_pair(e["prompt"], e["output"]))
+            return results
+        return run
+
+    schemas = {s.schema_id: s.schema for s in schema_loader.all_schemas()}
+
+    def batch(examples):
+        return validate_many(
+            ((e["schema_id"], e["prompt"], e["output"]) for e in examples),
+            schemas, codegen=True, workers=workers
+        ).results
+
+    return {
+        "previous (validator per example)": previous,
+        "registry (validator per example)": registry,
+        "per-schema validator": per_schema(False),
+        "per-schema validator + codegen": per_schema(True),
+        f"validate_many + codegen ({workers} workers)": batch,
+    }
+
+
+def schema_variants(value: Dict, schema: Dict) -> List[Dict]:
+    """Schema-violating variants: each required key dropped, each typed property given a wrong type"""
+    variants = []
+    for key in schema.get("required", []):
+        if key in value:
+            variant = copy.deepcopy(value)
+            del variant[key]
+            variants.append(variant)
+    for key, subschema in schema.get("properties", {}).items():
+        if key in value and isinstance(subschema, dict) and "type" in subschema:
+            variant = copy.deepcopy(value)
+            variant[key] = [] if subschema["type"] != "array" else "not an array"
+            variants.append(variant)
+    return variants
+
+
+def check_codegen(examples: List[Dict], schema_loader: SchemaLoader) -> Dict:
+    """Compare generated validators with jsonschema on expected outputs and their variants"""
+    checked = disagreements = 0
+    for e in examples:
+        schema = schema_loader.get(e["schema_id"]).schema
+        compiled = get_compiled_schema(schema, e["schema_id"], codegen=True)
+        for instance in [e["expected_output"], *schema_variants(e["expected_output"], schema)]:
+            checked += 1
+            if compiled.generated is not None and compiled.generated(instance) != compiled.draft7.is_valid(instance):
+                disagreements += 1
+    return {"instances": checked, "disagreements": disagreements}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark QualityValidator throughput")
+    parser.add_argument("--dataset", type=str, required=True, help="EdgeJSON dataset (JSONL)")
+    parser.add_argument("--schemas", type=str, default=str(Path(__file__).parent.parent / "schemas"),
+                        help="Schemas root directory")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes per strategy (median reported)")
+    parser.add_argument("--pool-size", type=int, help="Replicate the dataset to this many candidates")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="validate_many worker processes")
+    parser.add_argument("--output", type=str, help="Save the benchmark JSON here")
+
+    args = parser.parse_args()
+
+    schema_loader = SchemaLoader(Path(args.schemas))
+    with open(args.dataset, 'r') as f:
+        examples = [json.loads(line) for line in f]
+    for e in examples:
+        e["output"] = json.dumps(e["expected_output"])
+    dataset = examples
+    if args.pool_size:
+        examples = [dataset[i % len(dataset)] for i in range(args.pool_size)]
+    print(f"Benchmarking {len(examples)} examples over {len(schema_loader.all_schemas())} schemas, "
+          f"{args.repeat} passes each\n")
+
+    reports = {}
+    reference = None
+    for name, validate_all in strategies(schema_loader, args.workers).items():
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results = validate_all(examples)
+            timings.append(time.perf_counter() - start)
+
+        outcomes = [(r.valid, r.reason) for r in results]
+        if reference is None:
+            reference = outcomes
+        reports[name] = {
+            "validations_per_sec": len(examples) / median(timings),
+            "valid": sum(1 for r in results if r.valid),
+            "matches_previous": outcomes == reference
+        }
+
+    baseline = reports["previous (validator per example)"]["validations_per_sec"]
+    print(f"{'Strategy':<40} {'validations/s':>14} {'speedup':>8} {'Valid':>7} {'Same results':>13}")
+    print("-" * 86)
+    for name, report in reports.items():
+        print(f"{name:<40} {report['validations_per_sec']:>14,.0f} {report['validations_per_sec'] / baseline:>7.1f}x "
+              f"{report['valid']:>7} {'yes' if report['matches_previous'] else 'NO':>13}")
+
+    codegen_check = check_codegen(dataset, schema_loader)
+    print(f"\nCodegen vs jsonschema: {codegen_check['disagreements']} disagreements "
+          f"on {codegen_check['instances']} instances (expected outputs and schema-violating variants)")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w') as f:
+            json.dump({"dataset": args.dataset, "examples": len(examples), "workers": args.workers, "strategies": reports,
+                       "codegen_check": codegen_check}, f, indent=2)
+        print(f"\nResults saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
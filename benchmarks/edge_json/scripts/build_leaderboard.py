@@ -0,0 +1,107 @@
+# Copyright 2025 CycleCore Technologies
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#!/usr/bin/env python3
+"""
+Leaderboard Builder for EdgeJSON Benchmark
+
+Joins any number of eval.py result files per example ID and writes a
+compact leaderboard artifact with every metric per model, complexity tier
+and schema. generate_comparison_report.py (--leaderboard) and the paper
+figure scripts read the artifact directly.
+
+Usage:
+    python build_leaderboard.py \
+        --results results/*.json \
+        --output results/leaderboard.json
+
+    # Explicit names, paper metadata, only examples every model evaluated
+    python build_leaderboard.py \
+        --results "Maaza-SLM-360M=results/slm_360m.json" results/qwen_0.5b.json \
+        --metadata results/model_metadata.json \
+        --intersect \
+        --output results/leaderboard.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent / "lib"))
+
+from leaderboard import build_leaderboard, load_run, write_leaderboard
+
+
+def parse_result_spec(spec: str) -> Dict[str, str | None]:
+    """'name=path' or 'path'"""
+    name, sep, path = spec.partition("=")
+    if sep and not Path(spec).exists():
+        return {"name": name, "path": path}
+    return {"name": None, "path": spec}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an N-way EdgeJSON leaderboard")
+    parser.add_argument("--results", type=str, nargs="+", required=True,
+                        help="eval.py results JSON files, optionally as name=path")
+    parser.add_argument("--output", type=str, required=True, help="Path to save the leaderboard JSON")
+    parser.add_argument("--metadata", type=str,
+                        help="JSON mapping model name to extra fields (e.g. params, type) for figures")
+    parser.add_argument("--intersect", action="store_true",
+                        help="Only score examples that every model evaluated")
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    runs = []
+    names = set()
+    for spec in map(parse_result_spec, args.results):
+        run = load_run(spec["path"], spec["name"])
+        if run.name in names:
+            # Same model evaluated twice (e.g. quantized): tell the runs apart by file
+            run.name = f"{run.name} ({Path(run.source).stem})"
+        names.add(run.name)
+        runs.append(run)
+        print(f"✓ Loaded {run.name}: {len(run.columns)} examples")
+
+    metadata = None
+    if args.metadata:
+        with open(args.metadata, 'r') as f:
+            metadata = json.load(f)
+
+    leaderboard = build_leaderboard(runs, intersect=args.intersect, metadata=metadata)
+    write_leaderboard(leaderboard, args.output)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'Rank':<5} {'Model':<40} {'Examples':>9} {'JSONExact':>10} {'Field F1':>9} {'Nested F1':>10} {'Compliance':>11}")
+    print("-" * 98)
+    overall = leaderboard["overall"]
+    for i, model in enumerate(leaderboard["models"]):
+        if overall["count"][i] == 0:
+            print(f"{i + 1:<5} {model['name']:<40} {0:>9} {'n/a':>10}")
+            continue
+        print(f"{i + 1:<5} {model['name']:<40} {overall['count'][i]:>9} {overall['json_exact'][i]:>10.1%} "
+              f"{overall['avg_field_f1'][i]:>9.3f} {overall['avg_nested_field_f1'][i]:>10.3f} "
+              f"{overall['schema_compliance'][i]:>11.1%}")
+
+    print(f"\n✓ Leaderboard of {len(runs)} models over {leaderboard['examples']} examples "
+          f"saved to: {args.output} ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,10 +28,34 @@ Usage:
 
 import json
 import argparse
+import sys
 from pathlib import Path
 from typing import Dict, List, Any
 from dataclasses import dataclass, asdict
 
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent / "lib"))
+
+from metrics import ResultColumns
+from significance import paired_significance
+
+
+# Aggregate timing metrics recorded by eval.py with real token accounting
+TOKEN_TIMING_METRICS = [
+    "p50_latency_ms",
+    "p90_latency_ms",
+    "p99_latency_ms",
+    "avg_ttft_ms",
+    "decode_tokens_per_sec",
+]
+
+# Deployment footprint metrics recorded by eval.py (accuracy/latency/memory trade-off)
+FOOTPRINT_METRICS = [
+    "ms_per_token",
+    "model_size_mb",
+    "load_time_s",
+]
+
 
 @dataclass
 class ComparisonMetrics:
@@ -64,6 +88,30 @@ def calculate_comparison(baseline: float, comparison: float) -> ComparisonMetric
     )
 
 
+def refresh_aggregate(data: Dict) -> Dict:
+    """
+    Recompute accuracy aggregates from a result file's individual_results.
+
+    Uses the shared columnar metrics, so results written before nested-field
+    F1 existed are compared on it too. Files without per-example results
+    keep their stored aggregate.
+    """
+    if not data.get("individual_results"):
+        return data
+
+    columns = ResultColumns(data["individual_results"])
+    overall = columns.summary()
+    data["aggregate"].update({
+        "json_exact_score": overall["json_exact"],
+        "avg_field_f1": overall["avg_field_f1"],
+        "avg_nested_field_f1": overall["avg_nested_field_f1"],
+        "schema_compliance_rate": overall["schema_compliance"],
+        "by_complexity": columns.by_complexity(),
+        "by_schema": columns.group_by("schema")
+    })
+    return data
+
+
 def compare_overall_metrics(baseline_data: Dict, comparison_data: Dict) -> Dict:
     """Compare overall metrics between two models"""
     baseline_agg = baseline_data["aggregate"]
@@ -92,6 +140,20 @@ def compare_overall_metrics(baseline_data: Dict, comparison_data: Dict) -> Dict:
         ))
     }
 
+    if "avg_nested_field_f1" in baseline_agg and "avg_nested_field_f1" in comparison_agg:
+        overall_comparison["nested_field_f1"] = asdict(calculate_comparison(
+            baseline_agg["avg_nested_field_f1"],
+            comparison_agg["avg_nested_field_f1"]
+        ))
+
+    # Token-level timing and footprint metrics (only present in newer results)
+    for metric in TOKEN_TIMING_METRICS + FOOTPRINT_METRICS:
+        if metric in baseline_agg and metric in comparison_agg:
+            overall_comparison[metric] = asdict(calculate_comparison(
+                baseline_agg[metric],
+                comparison_agg[metric]
+            ))
+
     return overall_comparison
 
 
@@ -123,6 +185,11 @@ def compare_by_complexity(baseline_data: Dict, comparison_data: Dict) -> Dict:
                 comparison_stats["schema_compliance"]
             ))
         }
+        if "avg_nested_field_f1" in baseline_stats and "avg_nested_field_f1" in comparison_stats:
+            complexity_comparison[complexity]["nested_field_f1"] = asdict(calculate_comparison(
+                baseline_stats["avg_nested_field_f1"],
+                comparison_stats["avg_nested_field_f1"]
+            ))
 
     return complexity_comparison
 
@@ -168,6 +235,43 @@ def compare_by_schema(baseline_data: Dict, comparison_data: Dict) -> Dict:
     return schema_comparison
 
 
+def load_latency_profile(data: Dict, profile_path: str | None = None) -> Dict | None:
+    """Latency profile from a separate file, else the one embedded by eval.py --latency-bench"""
+    if profile_path:
+        with open(profile_path, 'r') as f:
+            return json.load(f)
+    return data.get("latency_profile")
+
+
+def compare_latency_profiles(baseline_profile: Dict, comparison_profile: Dict) -> Dict:
+    """Compare median latency (and its MAD) overall and per complexity tier"""
+    def compare_tier(baseline_stats: Dict, comparison_stats: Dict) -> Dict:
+        return {
+            "median_ms": asdict(calculate_comparison(
+                baseline_stats["median_ms"],
+                comparison_stats["median_ms"]
+            )),
+            "baseline_mad_ms": baseline_stats["mad_ms"],
+            "comparison_mad_ms": comparison_stats["mad_ms"]
+        }
+
+    latency_comparison = {
+        "baseline_config": baseline_profile["config"],
+        "comparison_config": comparison_profile["config"],
+        "overall": compare_tier(baseline_profile["overall"], comparison_profile["overall"]),
+        "by_complexity": {}
+    }
+
+    for complexity in ["simple", "medium", "complex"]:
+        if complexity in baseline_profile["by_complexity"] and complexity in comparison_profile["by_complexity"]:
+            latency_comparison["by_complexity"][complexity] = compare_tier(
+                baseline_profile["by_complexity"][complexity],
+                comparison_profile["by_complexity"][complexity]
+            )
+
+    return latency_comparison
+
+
 def rank_schemas_by_improvement(schema_comparison: Dict) -> Dict[str, List]:
     """Rank schemas by improvement in JSONExact score"""
     schema_improvements = []
@@ -196,6 +300,14 @@ def main():
     parser.add_argument("--baseline", type=str, required=True, help="Path to baseline evaluation JSON")
     parser.add_argument("--comparison", type=str, required=True, help="Path to comparison evaluation JSON")
     parser.add_argument("--output", type=str, required=True, help="Path to save comparison data JSON")
+    parser.add_argument("--baseline-latency", type=str,
+                        help="Baseline latency profile JSON (default: profile embedded in --baseline)")
+    parser.add_argument("--comparison-latency", type=str,
+                        help="Comparison latency profile JSON (default: profile embedded in --comparison)")
+    parser.add_argument("--bootstrap-resamples", type=int, default=10000,
+                        help="Paired-bootstrap resamples for confidence intervals (0 to skip significance)")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the intervals")
+    parser.add_argument("--seed", type=int, default=0, help="Bootstrap RNG seed")
 
     args = parser.parse_args()
 
@@ -208,6 +320,10 @@ def main():
     with open(args.comparison, 'r') as f:
         comparison_data = json.load(f)
 
+    # Recompute accuracy metrics from per-example results where available
+    refresh_aggregate(baseline_data)
+    refresh_aggregate(comparison_data)
+
     # Extract model names
     baseline_name = baseline_data["aggregate"]["model_name"]
     comparison_name = comparison_data["aggregate"]["model_name"]
@@ -233,6 +349,30 @@ def main():
     print("Ranking schemas by improvement...")
     schema_rankings = rank_schemas_by_improvement(schema_comparison)
 
+    # Compare latency profiles (from eval.py --latency-bench)
+    baseline_profile = load_latency_profile(baseline_data, args.baseline_latency)
+    comparison_profile = load_latency_profile(comparison_data, args.comparison_latency)
+    latency_comparison = None
+    if baseline_profile and comparison_profile:
+        print("Comparing latency profiles...")
+        latency_comparison = compare_latency_profiles(baseline_profile, comparison_profile)
+
+    # Paired significance from per-example results
+    significance = None
+    if args.bootstrap_resamples > 0 and baseline_data.get("individual_results") and comparison_data.get("individual_results"):
+        print(f"Computing paired significance ({args.bootstrap_resamples} bootstrap resamples)...")
+        significance = paired_significance(
+            baseline_data["individual_results"],
+            comparison_data["individual_results"],
+            n_resamples=args.bootstrap_resamples,
+            confidence=args.confidence,
+            seed=args.seed
+        )
+        if significance["paired_examples"] == 0:
+            print("⚠️  Warning: No example IDs match between the two runs (results written before example_id "
+                  "was recorded?); skipping significance")
+            significance = None
+
     # Create comparison output
     comparison_output = {
         "baseline_model": baseline_name,
@@ -242,6 +382,10 @@ def main():
         "by_schema": schema_comparison,
         "schema_rankings": schema_rankings
     }
+    if latency_comparison:
+        comparison_output["latency_profile"] = latency_comparison
+    if significance:
+        comparison_output["significance"] = significance
 
     # Save output
     output_path = Path(args.output)
@@ -269,6 +413,29 @@ def main():
     print(f"  Comparison: {field_f1['comparison_value']:.3f}")
     print(f"  Change: {field_f1['absolute_change']:+.3f} ({field_f1['relative_change']:+.1f}%)")
 
+    if "nested_field_f1" in overall_comparison:
+        nested_f1 = overall_comparison["nested_field_f1"]
+        print(f"\nNested Field F1 Score:")
+        print(f"  Baseline: {nested_f1['baseline_value']:.3f}")
+        print(f"  Comparison: {nested_f1['comparison_value']:.3f}")
+        print(f"  Change: {nested_f1['absolute_change']:+.3f} ({nested_f1['relative_change']:+.1f}%)")
+
+    if significance and significance["overall"]:
+        je = significance["overall"]["json_exact"]
+        print(f"\nJSONExact Significance ({significance['paired_examples']} paired examples):")
+        print(f"  {significance['confidence']:.0%} CI of change: [{je['ci_low']:+.1%}, {je['ci_high']:+.1%}]"
+              f"{' (significant)' if je['significant'] else ''}")
+        print(f"  McNemar: {je['mcnemar']['baseline_only']} baseline-only vs "
+              f"{je['mcnemar']['comparison_only']} comparison-only correct, p = {je['mcnemar']['p_value']:.4f}")
+
+    if latency_comparison:
+        print(f"\nMedian Latency (latency benchmark):")
+        for tier, stats in [("overall", latency_comparison["overall"]), *latency_comparison["by_complexity"].items()]:
+            median = stats["median_ms"]
+            print(f"  {tier.capitalize()}: {median['baseline_value']:.1f}ms (MAD {stats['baseline_mad_ms']:.1f}) -> "
+                  f"{median['comparison_value']:.1f}ms (MAD {stats['comparison_mad_ms']:.1f}) "
+                  f"({median['relative_change']:+.1f}%)")
+
     print(f"\nTop 5 Most Improved Schemas:")
     for i, schema_info in enumerate(schema_rankings["top_5"], 1):
         print(f"  {i}. {schema_info['schema']}: {schema_info['improvement']:+.1%}")
@@ -20,33 +20,60 @@ Evaluate SLMs on JSON extraction tasks from EdgeBench.
 Usage:
     python eval.py --model HuggingFaceTB/SmolLM2-135M --dataset dataset/test.jsonl
     python eval.py --model Qwen/Qwen2.5-0.5B --dataset dataset/test.jsonl --output results/qwen_results.json
+    python eval.py --model Qwen/Qwen2.5-0.5B --dataset dataset/test.jsonl --batch-size 8
+    python eval.py --model Qwen/Qwen2.5-0.5B --dataset dataset/test.jsonl --output results/qwen_results.json --resume
+    python eval.py --model HuggingFaceTB/SmolLM2-135M --dataset dataset/test.jsonl --workers 8
+    python eval.py --model HuggingFaceTB/SmolLM2-135M --dataset dataset/test.jsonl --limit 20 --daemon
 
 Metrics:
 - JSONExact: Exact match (binary, 1/0)
 - FieldF1: Per-field precision/recall/F1
 - SchemaCompliance: Valid JSON structure
-- Latency: Time to generate output (tokens/sec)
+- Latency: Time to generate output (p50/p90/p99, time-to-first-token)
+- Throughput: Measured generated tokens/sec (aggregate and per-sequence decode)
 """
 
 import json
 import argparse
+import os
+import queue
 import time
+import multiprocessing as mp
+import sys
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
-from dataclasses import dataclass, asdict
-import re
+from typing import Dict, List, Any, Tuple, Callable, Optional
+from dataclasses import dataclass, asdict, field, fields
 
 
 # Import transformers (will be installed via requirements.txt)
 try:
-    from transformers import AutoModelForCausalLM, AutoTokenizer
+    from transformers import StoppingCriteria, StoppingCriteriaList, LogitsProcessorList
     import torch
-    from peft import PeftModel
+    import numpy as np
 except ImportError as e:
     print(f"Error: Required library not installed: {e}")
-    print("Run: pip install transformers torch peft")
+    print("Run: pip install transformers torch peft numpy")
     exit(1)
 
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent / "lib"))
+
+from prefix_cache import PrefixCache, format_prompt
+from json_stopping import JSONObjectStoppingCriteria
+from json_stream import find_json_object
+from metrics import ResultColumns, nested_field_f1
+from schema_loader import SchemaLoader
+from constrained_decoding import SchemaConstrainedLogitsProcessor, get_automaton
+from latency_bench import build_latency_profile, median, pin_threads
+from model_cache import merged_checkpoint
+from onnx_backend import export_onnx
+from model_loader import load_model
+from speculative import SpeculativeDecoder, check_shared_vocab
+from daemon_protocol import DEFAULT_SOCKET, submit as submit_jobs
+from quantization import QUANTIZATION_MODES, model_size_mb
+
+SCHEMAS_DIR = Path(__file__).parent.parent / "schemas"
+
 
 @dataclass
 class EvaluationResult:
@@ -62,6 +89,20 @@ class EvaluationResult:
     complexity: str
     schema_name: str
     error: str | None = None
+    batch_size: int = 1
+    prompt_tokens: int = 0
+    generated_tokens: int = 0
+    ttft_ms: float = 0.0
+    decode_tokens_per_sec: float = 0.0
+    example_id: str = ""
+    cached_prompt_tokens: int = 0
+    tokens_saved: int = 0
+    latency_trials_ms: List[float] = field(default_factory=list)
+    draft_tokens: int = 0  # Speculative decoding: tokens proposed by the draft model
+    accepted_draft_tokens: int = 0
+    baseline_latency_ms: float = 0.0  # Plain greedy generate latency of the target model
+    matches_baseline: bool | None = None  # Speculative output identical to plain generate
+    nested_field_f1: float | None = None  # FieldF1 over leaf fields (None: recomputed by metrics)
 
 
 @dataclass
@@ -74,32 +115,73 @@ class AggregateResults:
     schema_compliance_rate: float
     avg_latency_ms: float
     tokens_per_sec: float
+    decode_tokens_per_sec: float
+    avg_ttft_ms: float
+    p50_latency_ms: float
+    p90_latency_ms: float
+    p99_latency_ms: float
+    total_prompt_tokens: int
+    total_generated_tokens: int
+    total_tokens_saved: int
     by_complexity: Dict[str, Dict]
     by_schema: Dict[str, Dict]
+    track: str = "standard"  # "constrained" when decoding was schema-constrained
+    quantization: str = "none"  # "int8-dynamic" | "int4" when the model was quantized
+    model_size_mb: float = 0.0
+    load_time_s: float = 0.0
+    ms_per_token: float = 0.0
+    avg_nested_field_f1: float = 0.0  # FieldF1 over every leaf of nested objects and arrays
+
+
+class GenerationTimer(StoppingCriteria):
+    """
+    Record when the first new token is produced during model.generate.
+
+    Stopping criteria run once after every decoding step, so the first call
+    marks the end of prefill plus the first decode step (time-to-first-token).
+    Never stops generation itself.
+    """
+
+    def __init__(self):
+        self.first_token_time = None
+
+    def __call__(self, input_ids, scores, **kwargs):
+        if self.first_token_time is None:
+            self.first_token_time = time.perf_counter_ns()
+        return torch.zeros(input_ids.shape[0], dtype=torch.bool, device=input_ids.device)
+
+
+def count_generated_tokens(new_tokens: List[int], eos_token_id: int | None) -> int:
+    """Count generated tokens up to and including the first EOS (ignores trailing padding)"""
+    if eos_token_id is not None and eos_token_id in new_tokens:
+        return new_tokens.index(eos_token_id) + 1
+    return len(new_tokens)
+
+
+def token_timings(start: int, end: int, timer: GenerationTimer, generated_tokens: int) -> Tuple[float, float]:
+    """Return (time-to-first-token ms, decode tokens/sec) for one generate call (perf_counter_ns times)"""
+    first_token_time = timer.first_token_time if timer.first_token_time is not None else end
+    ttft_ms = (first_token_time - start) / 1e6
+    decode_seconds = (end - first_token_time) / 1e9
+    decode_tokens_per_sec = (generated_tokens - 1) / decode_seconds if decode_seconds > 0 and generated_tokens > 1 else 0.0
+    return ttft_ms, decode_tokens_per_sec
 
 
 def extract_json_from_text(text: str) -> Dict | None:
     """
     Extract JSON from model output text.
     Handles cases where model includes extra text before/after JSON.
+    Returns the whole text if it parses (e.g. a bare list, which scores 0),
+    else the first complete JSON object (any nesting depth), or None.
     """
     # Try to parse entire text first
     try:
         return json.loads(text.strip())
-    except json.JSONDecodeError:
+    except (json.JSONDecodeError, RecursionError):
         pass
 
-    # Look for JSON-like content between braces
-    json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-    matches = re.findall(json_pattern, text, re.DOTALL)
-
-    for match in matches:
-        try:
-            return json.loads(match)
-        except json.JSONDecodeError:
-            continue
-
-    return None
+    match = find_json_object(text)
+    return match.value if match else None
 
 
 def calculate_field_f1(expected: Dict, predicted: Dict) -> Tuple[float, float, float]:
@@ -172,28 +254,273 @@ def check_schema_compliance(expected: Dict, predicted: Dict) -> bool:
     return True
 
 
+def score_example(
+    example: Dict,
+    model_output: str,
+    latency_ms: float,
+    batch_size: int = 1,
+    prompt_tokens: int = 0,
+    generated_tokens: int = 0,
+    ttft_ms: float = 0.0,
+    decode_tokens_per_sec: float = 0.0,
+    cached_prompt_tokens: int = 0,
+    tokens_saved: int = 0
+) -> EvaluationResult:
+    """Parse a model output and score it against the example's expected output"""
+    expected_output = example["expected_output"]
+
+    # Parse JSON from model output
+    model_output_parsed = extract_json_from_text(model_output)
+
+    # Calculate metrics
+    if model_output_parsed is None:
+        # Failed to parse JSON
+        json_exact = False
+        field_f1 = 0.0
+        nested_f1 = 0.0
+        schema_compliance = False
+    else:
+        # JSON parsed successfully
+        json_exact = (model_output_parsed == expected_output)
+        _, _, field_f1 = calculate_field_f1(expected_output, model_output_parsed)
+        _, _, nested_f1 = nested_field_f1(expected_output, model_output_parsed)
+        schema_compliance = check_schema_compliance(expected_output, model_output_parsed)
+
+    return EvaluationResult(
+        prompt=example["prompt"],
+        expected_output=expected_output,
+        model_output=model_output,
+        model_output_parsed=model_output_parsed,
+        json_exact=json_exact,
+        field_f1=field_f1,
+        schema_compliance=schema_compliance,
+        latency_ms=latency_ms,
+        complexity=example.get("complexity", "unknown"),
+        schema_name=example.get("schema_name", example.get("schema_id", "unknown")),
+        error=None,
+        batch_size=batch_size,
+        prompt_tokens=prompt_tokens,
+        generated_tokens=generated_tokens,
+        ttft_ms=ttft_ms,
+        decode_tokens_per_sec=decode_tokens_per_sec,
+        example_id=example.get("id", ""),
+        cached_prompt_tokens=cached_prompt_tokens,
+        tokens_saved=tokens_saved,
+        nested_field_f1=nested_f1
+    )
+
+
+def error_result(example: Dict, error: Exception, batch_size: int = 1) -> EvaluationResult:
+    """Build the result recorded for an example whose generation failed"""
+    return EvaluationResult(
+        prompt=example["prompt"],
+        expected_output=example["expected_output"],
+        model_output="",
+        model_output_parsed=None,
+        json_exact=False,
+        field_f1=0.0,
+        schema_compliance=False,
+        latency_ms=0.0,
+        complexity=example.get("complexity", "unknown"),
+        schema_name=example.get("schema_name", example.get("schema_id", "unknown")),
+        error=str(error),
+        batch_size=batch_size,
+        example_id=example.get("id", "")
+    )
+
+
 def evaluate_example(
     model,
     tokenizer,
     example: Dict,
     device: str = "cpu",
-    max_new_tokens: int = 512
+    max_new_tokens: int = 512,
+    prefix_cache: PrefixCache | None = None,
+    stop_at_json_end: bool = False,
+    schema_loader: SchemaLoader | None = None,
+    trials: int = 1,
+    speculative: SpeculativeDecoder | None = None
 ) -> EvaluationResult:
-    """Evaluate model on a single EdgeJSON example"""
+    """
+    Evaluate model on a single EdgeJSON example.
 
-    prompt = example["prompt"]
-    expected_output = example["expected_output"]
-    complexity = example.get("complexity", "unknown")
-    schema_name = example.get("schema_name", example.get("schema_id", "unknown"))
+    With a prefix_cache, generation continues from the precomputed KV cache of
+    the instruction preamble instead of re-encoding it. With stop_at_json_end,
+    generation ends as soon as the top-level JSON object is balanced. With a
+    schema_loader, decoding is constrained to the example's schema.
 
-    # Format prompt for model (matching training format)
-    formatted_prompt = f"Extract the structured JSON data from the following text.\n\nInput: {prompt}\n\nOutput:"
+    With trials > 1, generation is repeated and latency_ms is the median
+    trial latency (all trials are kept in latency_trials_ms); token timings
+    come from the last trial.
+
+    With a speculative decoder, generation is drafted and verified; one plain
+    generate call is also timed for the speedup baseline and output check.
+    """
+
+    formatted_prompt = format_prompt(example["prompt"])
 
     # Tokenize
     inputs = tokenizer(formatted_prompt, return_tensors="pt").to(device)
+    prompt_tokens = inputs["input_ids"].shape[1]
+
+    def generate(use_draft: bool):
+        cache_kwargs = prefix_cache.generate_kwargs(inputs["input_ids"]) if prefix_cache else {}
+        timer = GenerationTimer()
+        criteria = [timer]
+        json_stop = None
+        if stop_at_json_end:
+            json_stop = JSONObjectStoppingCriteria(tokenizer, prompt_tokens, max_new_tokens)
+            criteria.append(json_stop)
+
+        stats = None
+        start_time = time.perf_counter_ns()
+        with torch.no_grad():
+            if use_draft:
+                outputs, stats = speculative.generate(
+                    inputs["input_ids"],
+                    max_new_tokens,
+                    eos_token_id=tokenizer.eos_token_id,
+                    stopping_criteria=StoppingCriteriaList(criteria),
+                    **cache_kwargs
+                )
+            else:
+                outputs = model.generate(
+                    **inputs,
+                    max_new_tokens=max_new_tokens,
+                    temperature=0.0,  # Deterministic
+                    do_sample=False,
+                    pad_token_id=tokenizer.eos_token_id,
+                    stopping_criteria=StoppingCriteriaList(criteria),
+                    logits_processor=schema_processors(tokenizer, [example], prompt_tokens, schema_loader),
+                    **cache_kwargs
+                )
+        end_time = time.perf_counter_ns()
+        return outputs, start_time, end_time, timer, json_stop, len(prefix_cache) if cache_kwargs else 0, stats
+
+    # Generate (repeated trials are identical under greedy decoding; only timing differs)
+    trial_latencies_ms = []
+    try:
+        for _ in range(trials):
+            outputs, start_time, end_time, timer, json_stop, cached_prompt_tokens, stats = generate(speculative is not None)
+            trial_latencies_ms.append((end_time - start_time) / 1e6)
+
+        if speculative:
+            baseline_outputs, baseline_start, baseline_end, *_ = generate(False)
+
+        # Decode
+        generated_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
 
-    # Generate
-    start_time = time.time()
+        # Extract only the generated part (after the prompt)
+        model_output = generated_text[len(formatted_prompt):].strip()
+
+        latency_ms = median(trial_latencies_ms)
+
+    except Exception as e:
+        return error_result(example, e)
+
+    generated_tokens = outputs.shape[1] - prompt_tokens
+    ttft_ms, decode_tokens_per_sec = token_timings(start_time, end_time, timer, generated_tokens)
+
+    result = score_example(
+        example,
+        model_output,
+        latency_ms,
+        prompt_tokens=prompt_tokens,
+        generated_tokens=generated_tokens,
+        ttft_ms=ttft_ms,
+        decode_tokens_per_sec=decode_tokens_per_sec,
+        cached_prompt_tokens=cached_prompt_tokens,
+        tokens_saved=json_stop.tokens_saved() if json_stop else 0
+    )
+    if trials > 1:
+        result.latency_trials_ms = trial_latencies_ms
+    if speculative:
+        result.draft_tokens = stats.draft_tokens
+        result.accepted_draft_tokens = stats.accepted_tokens
+        result.baseline_latency_ms = (baseline_end - baseline_start) / 1e6
+        result.matches_baseline = torch.equal(outputs, baseline_outputs)
+    return result
+
+
+def schema_processors(
+    tokenizer,
+    examples: List[Dict],
+    prompt_length: int,
+    schema_loader: SchemaLoader | None = None
+) -> LogitsProcessorList:
+    """
+    Logits processors for one generate call (empty unless constrained).
+
+    Each row is masked by the token automaton of its example's schema; the
+    automata are compiled once per tokenizer and schema, then reused.
+    """
+    if schema_loader is None:
+        return LogitsProcessorList()
+
+    automata = [
+        get_automaton(tokenizer, schema_loader.get(example["schema_id"]).schema)
+        for example in examples
+    ]
+    return LogitsProcessorList([SchemaConstrainedLogitsProcessor(automata, prompt_length)])
+
+
+def bucket_by_length(tokenizer, dataset: List[Dict], batch_size: int) -> List[List[int]]:
+    """
+    Group dataset indices into batches of similar tokenized prompt length.
+
+    Sorting by length before chunking keeps left-padding per batch small,
+    so batched generation wastes little compute on pad tokens.
+    """
+    lengths = [
+        len(tokenizer(format_prompt(example["prompt"]))["input_ids"])
+        for example in dataset
+    ]
+    order = sorted(range(len(dataset)), key=lambda i: lengths[i])
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def evaluate_batch(
+    model,
+    tokenizer,
+    examples: List[Dict],
+    device: str = "cpu",
+    max_new_tokens: int = 512,
+    stop_at_json_end: bool = False,
+    schema_loader: SchemaLoader | None = None
+) -> List[EvaluationResult]:
+    """
+    Evaluate model on a batch of EdgeJSON examples with a single generate call.
+
+    Prompts are left-padded so every row's continuation starts at the same
+    position. Each example is attributed an equal share of the batch latency;
+    time-to-first-token and decode rate are those of the shared generate call.
+    """
+    batch_size = len(examples)
+    formatted_prompts = [format_prompt(example["prompt"]) for example in examples]
+
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+
+    # Left-pad so generation continues directly after each prompt (restored
+    # afterwards: the tokenizer is shared with other callers)
+    padding_side = tokenizer.padding_side
+    tokenizer.padding_side = "left"
+    try:
+        inputs = tokenizer(formatted_prompts, return_tensors="pt", padding=True).to(device)
+    finally:
+        tokenizer.padding_side = padding_side
+    prompt_length = inputs["input_ids"].shape[1]
+    prompt_tokens = inputs["attention_mask"].sum(dim=1).tolist()
+
+    timer = GenerationTimer()
+    criteria = [timer]
+    json_stop = None
+    if stop_at_json_end:
+        json_stop = JSONObjectStoppingCriteria(tokenizer, prompt_length, max_new_tokens)
+        criteria.append(json_stop)
+    processors = schema_processors(tokenizer, examples, prompt_length, schema_loader)
+
+    start_time = time.perf_counter_ns()
     try:
         with torch.no_grad():
             outputs = model.generate(
@@ -201,125 +528,566 @@ def evaluate_example(
                 max_new_tokens=max_new_tokens,
                 temperature=0.0,  # Deterministic
                 do_sample=False,
-                pad_token_id=tokenizer.eos_token_id
+                pad_token_id=tokenizer.pad_token_id,
+                stopping_criteria=StoppingCriteriaList(criteria),
+                logits_processor=processors
             )
+        end_time = time.perf_counter_ns()
 
-        # Decode
-        generated_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
-
-        # Extract only the generated part (after the prompt)
-        model_output = generated_text[len(formatted_prompt):].strip()
+        # Decode only the generated continuation of each row
+        new_tokens = outputs[:, prompt_length:]
+        model_outputs = [
+            text.strip()
+            for text in tokenizer.batch_decode(new_tokens, skip_special_tokens=True)
+        ]
 
-        latency_ms = (time.time() - start_time) * 1000
+        latency_ms = (end_time - start_time) / 1e6 / batch_size
 
     except Exception as e:
-        return EvaluationResult(
-            prompt=prompt,
-            expected_output=expected_output,
-            model_output="",
-            model_output_parsed=None,
-            json_exact=False,
-            field_f1=0.0,
-            schema_compliance=False,
-            latency_ms=0.0,
-            complexity=complexity,
-            schema_name=schema_name,
-            error=str(e)
+        return [error_result(example, e, batch_size) for example in examples]
+
+    results = []
+    for row, (example, model_output) in enumerate(zip(examples, model_outputs)):
+        if json_stop and json_stop.stopped_at[row]:
+            # Rows stopped at the JSON end are padded afterwards (pad may equal EOS)
+            generated_tokens = json_stop.stopped_at[row]
+        else:
+            generated_tokens = count_generated_tokens(new_tokens[row].tolist(), tokenizer.eos_token_id)
+        ttft_ms, decode_tokens_per_sec = token_timings(start_time, end_time, timer, generated_tokens)
+        results.append(score_example(
+            example,
+            model_output,
+            latency_ms,
+            batch_size,
+            prompt_tokens=prompt_tokens[row],
+            generated_tokens=generated_tokens,
+            ttft_ms=ttft_ms,
+            decode_tokens_per_sec=decode_tokens_per_sec,
+            tokens_saved=json_stop.tokens_saved(row) if json_stop else 0
+        ))
+
+    return results
+
+
+def warmup_model(
+    model,
+    tokenizer,
+    examples: List[Dict],
+    num_warmup: int,
+    device: str = "cpu",
+    max_new_tokens: int = 512,
+    **generation_kwargs
+):
+    """Run untimed generations so first-call and allocator overhead stay out of measurements"""
+    for i in range(num_warmup):
+        evaluate_example(
+            model,
+            tokenizer,
+            examples[i % len(examples)],
+            device=device,
+            max_new_tokens=max_new_tokens,
+            **generation_kwargs
         )
 
-    # Parse JSON from model output
-    model_output_parsed = extract_json_from_text(model_output)
 
-    # Calculate metrics
-    if model_output_parsed is None:
-        # Failed to parse JSON
-        json_exact = False
-        field_f1 = 0.0
-        schema_compliance = False
+def evaluate_dataset(
+    model,
+    tokenizer,
+    dataset: List[Dict],
+    device: str = "cpu",
+    max_new_tokens: int = 512,
+    batch_size: int = 1,
+    on_result: Optional[Callable[[EvaluationResult], None]] = None,
+    prefix_cache: PrefixCache | None = None,
+    stop_at_json_end: bool = False,
+    schema_loader: SchemaLoader | None = None,
+    trials: int = 1,
+    speculative: SpeculativeDecoder | None = None
+) -> List[EvaluationResult]:
+    """
+    Evaluate model on a list of examples, returning results in dataset order.
+
+    on_result is called with each result as soon as it is computed, so callers
+    can stream results (e.g. to the JSONL results log) before the run finishes.
+    The prefix_cache, repeated timing trials and speculative decoding are only
+    used for unbatched generation (left padding shifts the preamble away from
+    position 0).
+    """
+    if batch_size > 1:
+        print(f"Batch size: {batch_size} (length-bucketed)")
+        results = [None] * len(dataset)
+        done = 0
+        for batch_indices in bucket_by_length(tokenizer, dataset, batch_size):
+            batch_results = evaluate_batch(
+                model,
+                tokenizer,
+                [dataset[i] for i in batch_indices],
+                device=device,
+                max_new_tokens=max_new_tokens,
+                stop_at_json_end=stop_at_json_end,
+                schema_loader=schema_loader
+            )
+            for i, result in zip(batch_indices, batch_results):
+                results[i] = result
+                if on_result:
+                    on_result(result)
+
+            done += len(batch_indices)
+            print(f"  Progress: {done}/{len(dataset)}")
     else:
-        # JSON parsed successfully
-        json_exact = (model_output_parsed == expected_output)
-        _, _, field_f1 = calculate_field_f1(expected_output, model_output_parsed)
-        schema_compliance = check_schema_compliance(expected_output, model_output_parsed)
+        results = []
+        for i, example in enumerate(dataset):
+            if (i + 1) % 10 == 0:
+                print(f"  Progress: {i+1}/{len(dataset)}")
+
+            result = evaluate_example(
+                model,
+                tokenizer,
+                example,
+                device=device,
+                max_new_tokens=max_new_tokens,
+                prefix_cache=prefix_cache,
+                stop_at_json_end=stop_at_json_end,
+                schema_loader=schema_loader,
+                trials=trials,
+                speculative=speculative
+            )
+            results.append(result)
+            if on_result:
+                on_result(result)
 
-    return EvaluationResult(
-        prompt=prompt,
-        expected_output=expected_output,
-        model_output=model_output,
-        model_output_parsed=model_output_parsed,
-        json_exact=json_exact,
-        field_f1=field_f1,
-        schema_compliance=schema_compliance,
-        latency_ms=latency_ms,
-        complexity=complexity,
-        schema_name=schema_name,
-        error=None
-    )
+    return results
 
 
-def aggregate_results(results: List[EvaluationResult], model_name: str) -> AggregateResults:
-    """Aggregate evaluation results"""
+def example_key(example: Dict, index: int) -> str:
+    """Stable key identifying an example in the results log"""
+    return example.get("id") or f"example_{index:05d}"
 
-    total = len(results)
-    json_exact_count = sum(1 for r in results if r.json_exact)
-    avg_field_f1 = sum(r.field_f1 for r in results) / total
-    schema_compliance_count = sum(1 for r in results if r.schema_compliance)
-    avg_latency_ms = sum(r.latency_ms for r in results) / total
 
-    # Estimate tokens/sec (rough estimate: assume ~50 tokens per output)
-    avg_tokens = 50
-    tokens_per_sec = (avg_tokens / avg_latency_ms) * 1000 if avg_latency_ms > 0 else 0.0
+def load_dataset(dataset_path: Path, limit: int | None = None) -> List[Dict]:
+    """Load a JSONL dataset (first `limit` examples), giving every example a stable ID"""
+    dataset = []
+    with open(dataset_path, 'r') as f:
+        for line in f:
+            dataset.append(json.loads(line))
 
-    # By complexity
-    by_complexity = {}
-    for complexity in ["simple", "medium", "complex"]:
-        complexity_results = [r for r in results if r.complexity == complexity]
-        if complexity_results:
-            by_complexity[complexity] = {
-                "count": len(complexity_results),
-                "json_exact": sum(1 for r in complexity_results if r.json_exact) / len(complexity_results),
-                "avg_field_f1": sum(r.field_f1 for r in complexity_results) / len(complexity_results),
-                "schema_compliance": sum(1 for r in complexity_results if r.schema_compliance) / len(complexity_results)
-            }
+    if limit:
+        dataset = dataset[:limit]
+
+    # Give every example a stable ID for the results log
+    for i, example in enumerate(dataset):
+        example["id"] = example_key(example, i)
+
+    return dataset
+
+
+def result_from_dict(record: Dict) -> EvaluationResult:
+    """Rebuild an EvaluationResult from a serialized record (ignores unknown keys)"""
+    known = {f.name for f in fields(EvaluationResult)}
+    return EvaluationResult(**{k: v for k, v in record.items() if k in known})
+
+
+def load_results_log(log_path: Path) -> Dict[str, EvaluationResult]:
+    """
+    Load the append-only JSONL results log, keyed by example ID.
+
+    Later records for the same example replace earlier ones. A truncated final
+    line (from a crash mid-write) is skipped.
+    """
+    logged = {}
+    if not log_path.exists():
+        return logged
+
+    with open(log_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Warning: Skipping malformed line in {log_path}")
+                continue
+            logged[record["example_id"]] = result_from_dict(record)
+
+    return logged
+
+
+class ResultsLog:
+    """Append EvaluationResults to a JSONL file as soon as they are computed"""
+
+    def __init__(self, log_path: Path, resume: bool = False):
+        self.log_path = log_path
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and log_path.exists():
+            self._drop_partial_line()
+        self._file = open(log_path, 'a' if resume else 'w')
+
+    def _drop_partial_line(self, chunk_size: int = 65536):
+        """Truncate the log after its last newline, so appends never join a line cut off by a crash"""
+        with open(self.log_path, 'rb+') as f:
+            end = f.seek(0, 2)
+            pos = end
+            while pos > 0:
+                start = max(0, pos - chunk_size)
+                f.seek(start)
+                newline = f.read(pos - start).rfind(b"\n")
+                if newline != -1:
+                    pos = start + newline + 1
+                    break
+                pos = start
+            if pos < end:
+                print(f"Warning: Dropping truncated final line of {self.log_path}")
+                f.truncate(pos)
+
+    def append(self, result: EvaluationResult):
+        self._file.write(json.dumps(asdict(result)) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def _shard_worker(
+    shard_index: int,
+    shard: List[Dict],
+    model_name: str,
+    adapter: str | None,
+    device: str,
+    max_new_tokens: int,
+    batch_size: int,
+    num_threads: int,
+    use_prefix_cache: bool,
+    stop_at_json_end: bool,
+    constrained: bool,
+    backend: str,
+    quantize: str | None,
+    result_queue
+):
+    """Worker process: load the model once and stream shard results to the parent"""
+    torch.set_num_threads(num_threads)
+    torch.set_num_interop_threads(1)
+
+    try:
+        load_start = time.perf_counter()
+        model, tokenizer = load_model(model_name, adapter, device, backend, num_threads, quantize)
+        result_queue.put(("loaded", shard_index, {
+            "load_time_s": time.perf_counter() - load_start,
+            "model_size_mb": model_size_mb(model)
+        }))
+        prefix_cache = PrefixCache(model, tokenizer) if use_prefix_cache else None
+        schema_loader = SchemaLoader(SCHEMAS_DIR) if constrained else None
+
+        start_time = time.perf_counter()
+        evaluate_dataset(
+            model,
+            tokenizer,
+            shard,
+            device=device,
+            max_new_tokens=max_new_tokens,
+            batch_size=batch_size,
+            on_result=lambda result: result_queue.put(("result", shard_index, asdict(result))),
+            prefix_cache=prefix_cache,
+            stop_at_json_end=stop_at_json_end,
+            schema_loader=schema_loader
+        )
+        result_queue.put(("done", shard_index, time.perf_counter() - start_time))
+    except Exception as e:
+        result_queue.put(("error", shard_index, str(e)))
+
+
+def evaluate_sharded(
+    dataset: List[Dict],
+    model_name: str,
+    adapter: str | None,
+    num_workers: int,
+    device: str = "cpu",
+    max_new_tokens: int = 512,
+    batch_size: int = 1,
+    num_threads: int | None = None,
+    on_result: Optional[Callable[[EvaluationResult], None]] = None,
+    use_prefix_cache: bool = False,
+    stop_at_json_end: bool = False,
+    constrained: bool = False,
+    backend: str = "pytorch",
+    quantize: str | None = None
+) -> Tuple[List[EvaluationResult], float, Dict[str, float]]:
+    """
+    Shard the dataset round-robin across worker processes and merge their results.
+
+    Each worker loads the model once and runs with num_threads intra-op threads
+    (default: CPU count divided evenly among workers). Results stream back to
+    this process, which is the only writer of the results log.
+
+    Returns (results in dataset order, evaluation wall time in seconds, model
+    info). The wall time is the slowest worker's evaluation time, excluding
+    model load; model info holds the slowest load time and the model size.
+    """
+    if num_threads is None:
+        num_threads = max(1, (os.cpu_count() or 1) // num_workers)
+
+    shards = [dataset[i::num_workers] for i in range(num_workers)]
+    shards = [shard for shard in shards if shard]
+    print(f"Sharding {len(dataset)} examples across {len(shards)} workers ({num_threads} threads each)")
+
+    ctx = mp.get_context("spawn")
+    result_queue = ctx.Queue()
+    processes = [
+        ctx.Process(
+            target=_shard_worker,
+            args=(
+                i, shard, model_name, adapter, device, max_new_tokens,
+                batch_size, num_threads, use_prefix_cache, stop_at_json_end, constrained,
+                backend, quantize, result_queue
+            )
+        )
+        for i, shard in enumerate(shards)
+    ]
+    for process in processes:
+        process.start()
+
+    by_id = {}
+    eval_times = {}
+    model_info = {"load_time_s": 0.0, "model_size_mb": 0.0}
+    running = set(range(len(shards)))
+    while running:
+        try:
+            kind, shard_index, payload = result_queue.get(timeout=5)
+        except queue.Empty:
+            # Detect workers that died without reporting (e.g. OOM kill)
+            for i in list(running):
+                if not processes[i].is_alive():
+                    print(f"  Worker {i} exited unexpectedly (code {processes[i].exitcode})")
+                    running.discard(i)
+            continue
+
+        if kind == "result":
+            result = result_from_dict(payload)
+            by_id[result.example_id] = result
+            if on_result:
+                on_result(result)
+        elif kind == "loaded":
+            model_info["load_time_s"] = max(model_info["load_time_s"], payload["load_time_s"])
+            model_info["model_size_mb"] = payload["model_size_mb"]
+        elif kind == "done":
+            eval_times[shard_index] = payload
+            running.discard(shard_index)
+            print(f"  Worker {shard_index} finished {len(shards[shard_index])} examples in {payload:.1f}s")
+        else:
+            print(f"  Worker {shard_index} failed: {payload}")
+            running.discard(shard_index)
+
+    for process in processes:
+        process.join()
+
+    results = [by_id[example["id"]] for example in dataset if example["id"] in by_id]
+    wall_time_s = max(eval_times.values()) if eval_times else 0.0
+
+    return results, wall_time_s, model_info
+
+
+def evaluate_via_daemon(
+    socket_path: Path,
+    dataset: List[Dict],
+    model_name: str,
+    adapter: str | None,
+    device: str = "cpu",
+    max_new_tokens: int = 512,
+    batch_size: int = 1,
+    on_result: Optional[Callable[[EvaluationResult], None]] = None,
+    use_prefix_cache: bool = False,
+    stop_at_json_end: bool = False,
+    constrained: bool = False,
+    backend: str = "pytorch",
+    quantize: str | None = None
+) -> Tuple[List[EvaluationResult], Dict[str, float]]:
+    """
+    Evaluate on a model held by a running eval_daemon.py instead of loading it here.
+
+    Results stream back (and reach on_result) as the daemon computes them.
+    Returns (results in dataset order, model info). The model info's load
+    time is 0 when the daemon already had the model loaded.
+    """
+    job = {
+        "model": model_name,
+        "adapter": adapter,
+        "device": device,
+        "backend": backend,
+        "quantize": quantize,
+        "max_new_tokens": max_new_tokens,
+        "batch_size": batch_size,
+        "prefix_cache": use_prefix_cache,
+        "stop_at_json_end": stop_at_json_end,
+        "constrained": constrained,
+        "examples": dataset
+    }
+
+    results_by_key = {}
+    model_info = {}
+    for message in submit_jobs(socket_path, [job]):
+        if message["type"] == "result":
+            result = result_from_dict(message["result"])
+            results_by_key[result.example_id] = result
+            if on_result:
+                on_result(result)
+        elif message["type"] == "job_done":
+            print(f"✓ Daemon {'reused loaded' if message['warm'] else 'loaded'} model")
+            model_info = message["model_info"]
+        elif message["type"] == "job_error":
+            raise RuntimeError(f"Eval daemon error: {message['error']}")
+
+    # Batched jobs can finish examples out of order
+    return [results_by_key[ex["id"]] for ex in dataset if ex["id"] in results_by_key], model_info
+
+
+def scaling_report(
+    results: List[EvaluationResult],
+    wall_time_s: float,
+    num_workers: int,
+    baseline_path: Path | None = None
+) -> Dict[str, Any]:
+    """
+    Compare multi-worker throughput with a single-worker baseline run.
 
-    # By schema
-    by_schema = {}
-    schema_names = set(r.schema_name for r in results)
-    for schema_name in schema_names:
-        schema_results = [r for r in results if r.schema_name == schema_name]
-        by_schema[schema_name] = {
-            "count": len(schema_results),
-            "json_exact": sum(1 for r in schema_results if r.json_exact) / len(schema_results),
-            "avg_field_f1": sum(r.field_f1 for r in schema_results) / len(schema_results),
-            "schema_compliance": sum(1 for r in schema_results if r.schema_compliance) / len(schema_results)
+    Throughput is measured in generated tokens/sec so runs over different
+    example subsets stay comparable. The baseline is the tokens_per_sec of a
+    single-worker eval.py output for the same model.
+    """
+    generated_tokens = sum(r.generated_tokens for r in results)
+    tokens_per_sec = generated_tokens / wall_time_s if wall_time_s > 0 else 0.0
+
+    report = {
+        "workers": num_workers,
+        "wall_time_s": wall_time_s,
+        "examples_per_sec": len(results) / wall_time_s if wall_time_s > 0 else 0.0,
+        "tokens_per_sec": tokens_per_sec,
+        "baseline_tokens_per_sec": None,
+        "speedup": None,
+        "scaling_efficiency": None
+    }
+
+    if baseline_path:
+        with open(baseline_path, 'r') as f:
+            baseline_tokens_per_sec = json.load(f)["aggregate"]["tokens_per_sec"]
+        if baseline_tokens_per_sec > 0:
+            speedup = tokens_per_sec / baseline_tokens_per_sec
+            report["baseline_tokens_per_sec"] = baseline_tokens_per_sec
+            report["speedup"] = speedup
+            report["scaling_efficiency"] = speedup / num_workers
+
+    return report
+
+
+def speculative_report(
+    results: List[EvaluationResult],
+    draft_model: str,
+    num_draft_tokens: int
+) -> Dict[str, Any]:
+    """
+    Summarize speculative decoding: draft acceptance and end-to-end speedup.
+
+    Speedup is total plain-generate latency over total speculative latency
+    of the same examples, overall and per complexity tier. Output mismatches
+    count examples whose speculative output differs from plain greedy output.
+    """
+    def summarize(subset: List[EvaluationResult]) -> Dict[str, Any]:
+        draft_tokens = sum(r.draft_tokens for r in subset)
+        latency_ms = sum(r.latency_ms for r in subset)
+        baseline_latency_ms = sum(r.baseline_latency_ms for r in subset)
+        return {
+            "count": len(subset),
+            "acceptance_rate": sum(r.accepted_draft_tokens for r in subset) / draft_tokens if draft_tokens else 0.0,
+            "avg_latency_ms": latency_ms / len(subset),
+            "avg_baseline_latency_ms": baseline_latency_ms / len(subset),
+            "speedup": baseline_latency_ms / latency_ms if latency_ms > 0 else 0.0
         }
 
+    measured = [r for r in results if r.matches_baseline is not None]
+    report = {
+        "draft_model": draft_model,
+        "num_draft_tokens": num_draft_tokens,
+        **(summarize(measured) if measured else {}),
+        "output_mismatches": sum(1 for r in measured if not r.matches_baseline),
+        "by_complexity": {}
+    }
+    for complexity in ["simple", "medium", "complex"]:
+        complexity_results = [r for r in measured if r.complexity == complexity]
+        if complexity_results:
+            report["by_complexity"][complexity] = summarize(complexity_results)
+    return report
+
+
+def aggregate_results(
+    results: List[EvaluationResult],
+    model_name: str,
+    track: str = "standard",
+    quantization: str = "none",
+    model_size_mb: float = 0.0,
+    load_time_s: float = 0.0
+) -> AggregateResults:
+    """Aggregate evaluation results (model size and load time are measured by the caller)"""
+    columns = ResultColumns(results)
+    overall = columns.summary()
+    total = overall["count"]
+
+    # Measured throughput: generated tokens over total generation time
+    total_generated_tokens = int(columns.generated_tokens.sum())
+    total_latency_s = columns.latency_ms.sum() / 1000
+    tokens_per_sec = total_generated_tokens / total_latency_s if total_latency_s > 0 else 0.0
+    ms_per_token = total_latency_s * 1000 / total_generated_tokens if total_generated_tokens else 0.0
+    p50, p90, p99 = np.percentile(columns.latency_ms, [50, 90, 99])
+
     return AggregateResults(
         model_name=model_name,
         total_examples=total,
-        json_exact_score=json_exact_count / total,
-        avg_field_f1=avg_field_f1,
-        schema_compliance_rate=schema_compliance_count / total,
-        avg_latency_ms=avg_latency_ms,
+        json_exact_score=overall["json_exact"],
+        avg_field_f1=overall["avg_field_f1"],
+        schema_compliance_rate=overall["schema_compliance"],
+        avg_latency_ms=overall["avg_latency_ms"],
         tokens_per_sec=tokens_per_sec,
-        by_complexity=by_complexity,
-        by_schema=by_schema
+        decode_tokens_per_sec=columns.decode_tokens_per_sec_overall(),
+        avg_ttft_ms=float(columns.ttft_ms.mean()),
+        p50_latency_ms=float(p50),
+        p90_latency_ms=float(p90),
+        p99_latency_ms=float(p99),
+        total_prompt_tokens=int(columns.prompt_tokens.sum()),
+        total_generated_tokens=total_generated_tokens,
+        total_tokens_saved=int(columns.tokens_saved.sum()),
+        by_complexity=columns.by_complexity(),
+        by_schema=columns.group_by("schema"),
+        track=track,
+        quantization=quantization,
+        model_size_mb=model_size_mb,
+        load_time_s=load_time_s,
+        ms_per_token=ms_per_token,
+        avg_nested_field_f1=overall["avg_nested_field_f1"]
     )
 
 
 def print_results(aggregate: AggregateResults):
     """Print aggregate results to console"""
     print("\n" + "="*60)
-    print(f"EdgeJSON Evaluation Results: {aggregate.model_name}")
+    print(f"EdgeJSON Evaluation Results: {aggregate.model_name} ({aggregate.track} track)")
     print("="*60)
 
+    if aggregate.model_size_mb:
+        print(f"\nModel Footprint (quantization: {aggregate.quantization}):")
+        print(f"  Size: {aggregate.model_size_mb:.1f}MB")
+        print(f"  Load Time: {aggregate.load_time_s:.1f}s")
+
     print(f"\nOverall Metrics:")
     print(f"  Total Examples: {aggregate.total_examples}")
     print(f"  JSONExact Score: {aggregate.json_exact_score:.1%}")
-    print(f"  Average Field F1: {aggregate.avg_field_f1:.3f}")
+    print(f"  Average Field F1: {aggregate.avg_field_f1:.3f} (nested fields: {aggregate.avg_nested_field_f1:.3f})")
     print(f"  Schema Compliance: {aggregate.schema_compliance_rate:.1%}")
     print(f"  Avg Latency: {aggregate.avg_latency_ms:.1f}ms")
-    print(f"  Throughput: {aggregate.tokens_per_sec:.1f} tokens/sec (estimated)")
+    print(f"  Latency p50/p90/p99: {aggregate.p50_latency_ms:.1f} / {aggregate.p90_latency_ms:.1f} / {aggregate.p99_latency_ms:.1f}ms")
+    print(f"  Avg Time to First Token: {aggregate.avg_ttft_ms:.1f}ms")
+    print(f"  Tokens: {aggregate.total_prompt_tokens} prompt, {aggregate.total_generated_tokens} generated")
+    print(f"  Throughput: {aggregate.tokens_per_sec:.1f} tokens/sec ({aggregate.ms_per_token:.1f}ms/token)")
+    print(f"  Decode Rate: {aggregate.decode_tokens_per_sec:.1f} tokens/sec per sequence")
+    if aggregate.total_tokens_saved:
+        print(f"  JSON Early Stop: up to {aggregate.total_tokens_saved} decode tokens saved")
 
     print(f"\nBy Complexity:")
     for complexity in ["simple", "medium", "complex"]:
@@ -327,7 +1095,7 @@ def print_results(aggregate: AggregateResults):
             stats = aggregate.by_complexity[complexity]
             print(f"  {complexity.capitalize()}:")
             print(f"    JSONExact: {stats['json_exact']:.1%}")
-            print(f"    Field F1: {stats['avg_field_f1']:.3f}")
+            print(f"    Field F1: {stats['avg_field_f1']:.3f} (nested: {stats['avg_nested_field_f1']:.3f})")
             print(f"    Compliance: {stats['schema_compliance']:.1%}")
 
     print(f"\nBy Schema:")
@@ -337,6 +1105,32 @@ def print_results(aggregate: AggregateResults):
         print(f"    Field F1: {stats['avg_field_f1']:.3f}")
 
 
+def print_speculative_report(report: Dict[str, Any]):
+    """Print speculative decoding summary to console"""
+    print(f"\nSpeculative Decoding (draft: {report['draft_model']}, {report['num_draft_tokens']} tokens/step):")
+    if not report["by_complexity"]:
+        print("  No speculative results")
+        return
+    print(f"  Acceptance Rate: {report['acceptance_rate']:.1%}")
+    print(f"  Speedup vs plain generate: {report['speedup']:.2f}x "
+          f"({report['avg_baseline_latency_ms']:.1f}ms -> {report['avg_latency_ms']:.1f}ms)")
+    print(f"  Output Mismatches: {report['output_mismatches']}")
+    for complexity, stats in report["by_complexity"].items():
+        print(f"  {complexity.capitalize()}: {stats['acceptance_rate']:.1%} accepted, {stats['speedup']:.2f}x speedup")
+
+
+def print_latency_profile(profile: Dict[str, Any]):
+    """Print latency benchmark summary to console"""
+    config = profile["config"]
+    print(f"\nLatency Benchmark ({config['trials']} trials, {config['warmup']} warmup, {config['threads']} threads):")
+    overall = profile["overall"]
+    print(f"  Overall: median {overall['median_ms']:.1f}ms, MAD {overall['mad_ms']:.1f}ms "
+          f"(trial MAD {overall['trial_mad_ms']:.2f}ms)")
+    for complexity, stats in profile["by_complexity"].items():
+        print(f"  {complexity.capitalize()}: median {stats['median_ms']:.1f}ms, MAD {stats['mad_ms']:.1f}ms "
+              f"(trial MAD {stats['trial_mad_ms']:.2f}ms, n={stats['count']})")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Evaluate SLM on EdgeJSON benchmark")
     parser.add_argument("--model", type=str, required=True, help="Hugging Face model name or path")
@@ -345,31 +1139,73 @@ def main():
     parser.add_argument("--output", type=str, help="Path to save results JSON")
     parser.add_argument("--limit", type=int, help="Limit number of examples (for testing)")
     parser.add_argument("--device", type=str, default="cpu", choices=["cpu", "cuda"], help="Device to use")
+    parser.add_argument("--daemon", type=str, nargs="?", const=str(DEFAULT_SOCKET),
+                        help="Evaluate on a model kept loaded by eval_daemon.py (optional socket path)")
+    parser.add_argument("--merge-adapter", action="store_true",
+                        help="Merge --adapter into the base weights once and reuse the cached merged checkpoint")
+    parser.add_argument("--quantize", type=str, choices=QUANTIZATION_MODES,
+                        help="Quantize the model (adapter merged first) and record size/load time (CPU)")
+    parser.add_argument("--backend", type=str, default="pytorch", choices=["pytorch", "onnxruntime"],
+                        help="Inference backend (onnxruntime: cached ONNX export with past key values, CPU)")
+    parser.add_argument("--draft-model", type=str,
+                        help="Speculative decoding: smaller model with the same tokenizer that drafts tokens")
+    parser.add_argument("--draft-adapter", type=str, help="LoRA adapter for --draft-model (optional)")
+    parser.add_argument("--num-draft-tokens", type=int, default=5,
+                        help="Tokens drafted per verification step in speculative decoding")
     parser.add_argument("--max_new_tokens", type=int, default=512, help="Max tokens to generate")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="Examples per generate call (batches are bucketed by prompt length)")
+    parser.add_argument("--results-log", type=str,
+                        help="Append-only JSONL log of per-example results (default: <output>.jsonl)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip examples already in the results log and aggregate over the full log")
+    parser.add_argument("--max-examples", type=int,
+                        help="Evaluate at most N not-yet-logged examples in this run")
+    parser.add_argument("--done-exit-code", type=int, default=0,
+                        help="Exit status when --resume finds nothing pending (lets batch scripts stop "
+                             "without knowing the dataset size)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Shard the dataset across N worker processes (CPU)")
+    parser.add_argument("--threads-per-worker", type=int,
+                        help="torch intra-op threads per worker (default: CPU count / workers)")
+    parser.add_argument("--scaling-baseline", type=str,
+                        help="Single-worker results JSON to compute scaling efficiency against")
+    parser.add_argument("--prefix-cache", action="store_true",
+                        help="Reuse a precomputed KV cache of the instruction preamble (unbatched generation)")
+    parser.add_argument("--stop-at-json-end", action="store_true",
+                        help="Stop generating once the top-level JSON object is balanced")
+    parser.add_argument("--constrained", action="store_true",
+                        help="Mask logits so output follows each example's JSON schema (constrained track)")
+    parser.add_argument("--latency-bench", action="store_true",
+                        help="Deterministic latency mode: pinned threads, warmup, repeated timed trials per example")
+    parser.add_argument("--warmup", type=int, default=3,
+                        help="Untimed warmup generations before a latency benchmark")
+    parser.add_argument("--trials", type=int, default=5,
+                        help="Timed generations per example in a latency benchmark")
+    parser.add_argument("--threads", type=int,
+                        help="Threads (and CPUs) to pin a latency benchmark to (default: all available)")
+    parser.add_argument("--latency-profile", type=str,
+                        help="Write the latency profile JSON here (implies --latency-bench)")
 
     args = parser.parse_args()
 
-    print(f"Loading model: {args.model}")
-    if args.adapter:
-        print(f"Loading LoRA adapter: {args.adapter}")
-    print(f"Device: {args.device}")
-
-    # Load model and tokenizer
-    tokenizer = AutoTokenizer.from_pretrained(args.model)
-    model = AutoModelForCausalLM.from_pretrained(args.model)
-
-    # Load LoRA adapter if specified
-    if args.adapter:
-        print("Applying LoRA adapter...")
-        model = PeftModel.from_pretrained(model, args.adapter)
-        print("✓ LoRA adapter loaded successfully")
-
-    if args.device == "cuda" and torch.cuda.is_available():
-        model = model.to("cuda")
-    else:
-        model = model.to("cpu")
-
-    model.eval()
+    if args.latency_profile:
+        args.latency_bench = True
+    if args.backend == "onnxruntime" and (args.prefix_cache or args.quantize):
+        print("Error: --prefix-cache and --quantize require the pytorch backend")
+        return
+    if args.daemon and (args.workers > 1 or args.latency_bench):
+        print("Error: --daemon cannot be combined with --workers or --latency-bench")
+        return
+    if args.draft_model and (args.daemon or args.workers > 1 or args.batch_size > 1
+                             or args.backend != "pytorch" or args.constrained):
+        print("Error: --draft-model runs unbatched in one process on the pytorch backend "
+              "(not with --daemon, --workers, --batch-size or --constrained)")
+        return
+    if args.latency_bench and (args.workers > 1 or args.batch_size > 1):
+        print("Error: --latency-bench measures single-example latency in one process "
+              "(use --workers 1 --batch-size 1)")
+        return
 
     # Load dataset
     dataset_path = Path(args.dataset)
@@ -377,32 +1213,237 @@ def main():
         print(f"Error: Dataset file not found: {dataset_path}")
         return
 
-    dataset = []
-    with open(dataset_path, 'r') as f:
-        for line in f:
-            dataset.append(json.loads(line))
-
-    if args.limit:
-        dataset = dataset[:args.limit]
-
+    dataset = load_dataset(dataset_path, args.limit)
     print(f"Loaded {len(dataset)} examples from {dataset_path}")
 
-    # Evaluate
-    print("\nEvaluating...")
-    results = []
-    for i, example in enumerate(dataset):
-        if (i + 1) % 10 == 0:
-            print(f"  Progress: {i+1}/{len(dataset)}")
+    # Results log (streams each result to disk as it is computed)
+    if args.results_log:
+        log_path = Path(args.results_log)
+    elif args.output:
+        log_path = Path(args.output).with_suffix(".jsonl")
+    else:
+        log_path = None
 
-        result = evaluate_example(model, tokenizer, example, device=args.device, max_new_tokens=args.max_new_tokens)
-        results.append(result)
+    if args.resume and log_path is None:
+        print("Error: --resume requires --results-log or --output")
+        return
+
+    logged = load_results_log(log_path) if args.resume else {}
+    pending = [example for example in dataset if example["id"] not in logged]
+    if args.resume:
+        print(f"Resuming from {log_path}: {len(dataset) - len(pending)} done, {len(pending)} pending")
+
+    all_done = args.resume and not pending
+    if args.max_examples is not None:
+        pending = pending[:args.max_examples]
+
+    scaling = None
+    speculative_summary = None
+    pinning = None
+    model_info = {"load_time_s": 0.0, "model_size_mb": 0.0}
+    if pending:
+        # Load a cached merged checkpoint instead of applying the adapter at runtime
+        model_path, adapter = args.model, args.adapter
+        if args.merge_adapter and adapter:
+            model_path, adapter = str(merged_checkpoint(args.model, args.adapter)), None
+        elif adapter and args.quantize == "int4" and args.workers > 1:
+            # int4 loads a merged checkpoint: merge it once here, not in every shard worker
+            model_path, adapter = str(merged_checkpoint(args.model, args.adapter)), None
+        if args.backend == "onnxruntime" and args.workers > 1:
+            # Export once here; the shard workers then load the cached export
+            export_onnx(model_path, adapter)
+
+        results_log = ResultsLog(log_path, resume=args.resume) if log_path else None
+        try:
+            if args.daemon:
+                print(f"\nEvaluating via daemon at {args.daemon}...")
+                new_results, model_info = evaluate_via_daemon(
+                    Path(args.daemon),
+                    pending,
+                    str(Path(model_path).resolve()) if Path(model_path).exists() else model_path,
+                    str(Path(adapter).resolve()) if adapter else None,
+                    device=args.device,
+                    max_new_tokens=args.max_new_tokens,
+                    batch_size=args.batch_size,
+                    on_result=results_log.append if results_log else None,
+                    use_prefix_cache=args.prefix_cache,
+                    stop_at_json_end=args.stop_at_json_end,
+                    constrained=args.constrained,
+                    backend=args.backend,
+                    quantize=args.quantize
+                )
+            elif args.workers > 1:
+                print("\nEvaluating...")
+                new_results, wall_time_s, model_info = evaluate_sharded(
+                    pending,
+                    model_path,
+                    adapter,
+                    args.workers,
+                    device=args.device,
+                    max_new_tokens=args.max_new_tokens,
+                    batch_size=args.batch_size,
+                    num_threads=args.threads_per_worker,
+                    on_result=results_log.append if results_log else None,
+                    use_prefix_cache=args.prefix_cache,
+                    stop_at_json_end=args.stop_at_json_end,
+                    constrained=args.constrained,
+                    backend=args.backend,
+                    quantize=args.quantize
+                )
+                scaling = scaling_report(
+                    new_results,
+                    wall_time_s,
+                    args.workers,
+                    Path(args.scaling_baseline) if args.scaling_baseline else None
+                )
+            else:
+                if args.latency_bench:
+                    # Pin before loading so torch's thread pools start with the final sizes
+                    pinning = pin_threads(args.threads)
+                    print(f"✓ Pinned to {pinning['threads']} threads (CPUs: {pinning['cpus']})")
+
+                load_start = time.perf_counter()
+                model, tokenizer = load_model(
+                    model_path,
+                    adapter,
+                    args.device,
+                    args.backend,
+                    pinning["threads"] if pinning else None,
+                    args.quantize
+                )
+                model_info = {
+                    "load_time_s": time.perf_counter() - load_start,
+                    "model_size_mb": model_size_mb(model)
+                }
+
+                prefix_cache = None
+                if args.prefix_cache:
+                    prefix_cache = PrefixCache(model, tokenizer)
+                    print(f"✓ Cached KV for {len(prefix_cache)}-token instruction preamble")
+
+                speculative = None
+                if args.draft_model:
+                    draft_model, draft_tokenizer = load_model(
+                        args.draft_model,
+                        args.draft_adapter,
+                        args.device,
+                        quantize=args.quantize,
+                        merge_adapter=args.merge_adapter
+                    )
+                    check_shared_vocab(tokenizer, draft_tokenizer)
+                    speculative = SpeculativeDecoder(
+                        model,
+                        draft_model,
+                        args.num_draft_tokens,
+                        PrefixCache(draft_model, draft_tokenizer) if args.prefix_cache else None
+                    )
+                    print(f"✓ Speculative decoding: {args.draft_model} drafts {args.num_draft_tokens} tokens/step")
+
+                schema_loader = None
+                if args.constrained:
+                    schema_loader = SchemaLoader(SCHEMAS_DIR)
+                    print(f"✓ Constrained decoding over {len(schema_loader.all_schemas())} schemas")
+
+                if args.latency_bench:
+                    print(f"Warming up ({args.warmup} generations)...")
+                    warmup_model(
+                        model,
+                        tokenizer,
+                        pending,
+                        args.warmup,
+                        device=args.device,
+                        max_new_tokens=args.max_new_tokens,
+                        prefix_cache=prefix_cache,
+                        stop_at_json_end=args.stop_at_json_end,
+                        schema_loader=schema_loader,
+                        speculative=speculative
+                    )
+
+                # Evaluate
+                print("\nEvaluating...")
+                new_results = evaluate_dataset(
+                    model,
+                    tokenizer,
+                    pending,
+                    device=args.device,
+                    max_new_tokens=args.max_new_tokens,
+                    batch_size=args.batch_size,
+                    on_result=results_log.append if results_log else None,
+                    prefix_cache=prefix_cache,
+                    stop_at_json_end=args.stop_at_json_end,
+                    schema_loader=schema_loader,
+                    trials=args.trials if args.latency_bench else 1,
+                    speculative=speculative
+                )
+        finally:
+            if results_log:
+                results_log.close()
+
+        for result in new_results:
+            logged[result.example_id] = result
+
+    # Aggregate exactly over every logged result for this dataset, in dataset order
+    results = [logged[example["id"]] for example in dataset if example["id"] in logged]
+    if len(results) < len(dataset):
+        print(f"\nNote: {len(dataset) - len(results)} examples not yet evaluated (run again with --resume)")
+
+    if not results:
+        print("No results to aggregate")
+        if all_done:
+            sys.exit(args.done_exit_code)
+        return
 
     # Aggregate results
-    aggregate = aggregate_results(results, args.model)
+    track = "constrained" if args.constrained else "standard"
+    aggregate = aggregate_results(
+        results,
+        args.model,
+        track,
+        quantization=args.quantize or "none",
+        **model_info
+    )
 
     # Print results
     print_results(aggregate)
 
+    if scaling:
+        print(f"\nParallel Scaling ({scaling['workers']} workers):")
+        print(f"  Wall Time: {scaling['wall_time_s']:.1f}s")
+        print(f"  Throughput: {scaling['examples_per_sec']:.2f} examples/sec, {scaling['tokens_per_sec']:.1f} tokens/sec")
+        if scaling["scaling_efficiency"] is not None:
+            print(f"  Speedup vs 1 worker: {scaling['speedup']:.2f}x")
+            print(f"  Scaling Efficiency: {scaling['scaling_efficiency']:.1%}")
+        else:
+            print("  Scaling Efficiency: n/a (pass --scaling-baseline with a single-worker results JSON)")
+
+    if args.draft_model:
+        speculative_summary = speculative_report(results, args.draft_model, args.num_draft_tokens)
+        print_speculative_report(speculative_summary)
+
+    latency_profile = None
+    if args.latency_bench:
+        latency_profile = build_latency_profile(
+            args.model,
+            [asdict(r) for r in results if r.latency_trials_ms],
+            {
+                "warmup": args.warmup,
+                "trials": args.trials,
+                "threads": pinning["threads"] if pinning else args.threads,
+                "cpus": pinning["cpus"] if pinning else None,
+                "device": args.device,
+                "max_new_tokens": args.max_new_tokens,
+                "track": track,
+            }
+        )
+        print_latency_profile(latency_profile)
+
+        if args.latency_profile:
+            profile_path = Path(args.latency_profile)
+            profile_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(profile_path, 'w') as f:
+                json.dump(latency_profile, f, indent=2)
+            print(f"\nLatency profile saved to: {profile_path}")
+
     # Save results if requested
     if args.output:
         output_path = Path(args.output)
@@ -412,11 +1453,22 @@ def main():
             "aggregate": asdict(aggregate),
             "individual_results": [asdict(r) for r in results]
         }
+        if scaling:
+            output_data["scaling"] = scaling
+        if speculative_summary:
+            output_data["speculative"] = speculative_summary
+        if latency_profile:
+            output_data["latency_profile"] = latency_profile
 
         with open(output_path, 'w') as f:
             json.dump(output_data, f, indent=2)
 
         print(f"\nResults saved to: {output_path}")
+    if log_path:
+        print(f"Results log: {log_path}")
+
+    if all_done:
+        sys.exit(args.done_exit_code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,421 @@
+# Copyright 2025 CycleCore Technologies
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#!/usr/bin/env python3
+"""
+EdgeJSON Eval Daemon
+Long-lived local worker that keeps models loaded between evaluation jobs.
+
+Running many model x dataset x quantization combinations through eval.py
+pays process startup, imports and model load for every job. The daemon keeps
+an LRU of loaded models within a memory budget, queues evaluation jobs from
+any number of clients (`eval.py --daemon`, `submit_jobs.py`), runs them in
+an order that maximizes model reuse, and streams each EvaluationResult back
+as soon as it is computed.
+
+Usage:
+    python eval_daemon.py
+    python eval_daemon.py --socket /tmp/edgejson.sock --threads 8 --memory-budget-mb 4096
+    python eval.py --model HuggingFaceTB/SmolLM2-135M --dataset dataset/test.jsonl --daemon
+    python submit_jobs.py --jobs nightly_jobs.jsonl
+"""
+
+import argparse
+import gc
+import os
+import socket
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import torch
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent / "lib"))
+
+from eval import SCHEMAS_DIR, evaluate_dataset, load_dataset
+from daemon_protocol import DEFAULT_SOCKET, JOB_DEFAULTS, model_key, read_message, send_message
+from model_loader import load_model
+from prefix_cache import PrefixCache
+from quantization import model_size_mb
+from schema_loader import SchemaLoader
+
+
+class ModelPool:
+    """
+    LRU of loaded models (with their prefix caches) within a memory budget.
+
+    After a load pushes the total model size over the budget, least recently
+    used models are evicted until it fits again; the model just loaded is
+    always kept, even if it alone exceeds the budget.
+    """
+
+    def __init__(self, memory_budget_mb: float):
+        self.memory_budget_mb = memory_budget_mb
+        self._models: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        # Jobs run on one worker thread, but status requests read the pool from client threads
+        self._lock = threading.Lock()
+
+    def is_loaded(self, key: Tuple) -> bool:
+        with self._lock:
+            return key in self._models
+
+    @property
+    def most_recent(self) -> Tuple | None:
+        with self._lock:
+            return next(reversed(self._models), None)
+
+    @property
+    def used_mb(self) -> float:
+        with self._lock:
+            return self._used_mb()
+
+    def _used_mb(self) -> float:
+        return sum(entry["model_info"]["model_size_mb"] for entry in self._models.values())
+
+    def get(self, job: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Return the loaded entry for a job's model, loading it on first use.
+
+        Returns:
+            (entry with model/tokenizer/model_info, whether it was already loaded)
+        """
+        key = model_key(job)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key], True
+
+        load_start = time.perf_counter()
+        model, tokenizer = load_model(
+            job["model"],
+            job["adapter"],
+            job["device"],
+            job["backend"],
+            torch.get_num_threads(),
+            job["quantize"]
+        )
+        entry = {
+            "model": model,
+            "tokenizer": tokenizer,
+            "prefix_cache": None,
+            "model_info": {
+                "load_time_s": time.perf_counter() - load_start,
+                "model_size_mb": model_size_mb(model)
+            }
+        }
+        with self._lock:
+            self._models[key] = entry
+            self._evict()
+        gc.collect()
+        return entry, False
+
+    def _evict(self):
+        while self._used_mb() > self.memory_budget_mb and len(self._models) > 1:
+            key, _ = self._models.popitem(last=False)
+            print(f"Evicted {key[0]} (over {self.memory_budget_mb:.0f}MB budget)")
+
+    def describe(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "model": key[0], "adapter": key[1], "device": key[2], "backend": key[3], "quantize": key[4],
+                    "model_size_mb": entry["model_info"]["model_size_mb"]
+                }
+                for key, entry in self._models.items()
+            ]
+
+
+class ClientGone(Exception):
+    """The client that submitted a job disconnected"""
+
+
+class Connection:
+    """A client's message stream, shared by all jobs it submitted"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.alive = True
+        self.remaining = 0
+        self.finished = threading.Event()
+        self._lock = threading.Lock()
+
+    def send(self, message: Dict[str, Any]) -> bool:
+        """Send a message; returns False once the client has gone away"""
+        with self._lock:
+            if self.alive:
+                try:
+                    send_message(self.stream, message)
+                except OSError:
+                    self.alive = False
+            return self.alive
+
+    def job_finished(self):
+        with self._lock:
+            self.remaining -= 1
+            last = self.remaining == 0
+        if last:
+            self.send({"type": "end"})
+            self.finished.set()
+
+
+class Job:
+    """One evaluation job: a model configuration and its examples"""
+
+    def __init__(self, job_id: int, config: Dict[str, Any], examples: List[Dict], connection: Connection):
+        self.id = job_id
+        self.config = config
+        self.examples = examples
+        self.connection = connection
+
+
+class JobScheduler:
+    """
+    Queue of pending jobs, handed out to maximize reuse of loaded models.
+
+    The next job is the oldest one for the most recently used model, else
+    the oldest one for any loaded model, else the oldest job overall. So all
+    queued jobs for a model run back to back after it is loaded.
+    """
+
+    def __init__(self, pool: ModelPool):
+        self.pool = pool
+        self._pending: List[Job] = []
+        self._next_id = 1
+        self._stopping = False
+        self._cond = threading.Condition()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def new_id(self) -> int:
+        with self._cond:
+            job_id = self._next_id
+            self._next_id += 1
+        return job_id
+
+    def submit(self, jobs: List[Job]):
+        with self._cond:
+            self._pending.extend(jobs)
+            self._cond.notify()
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+
+    def next_job(self) -> Job | None:
+        """Block until a job is available (None once stopping)"""
+        with self._cond:
+            while not self._pending and not self._stopping:
+                self._cond.wait()
+            if self._stopping:
+                return None
+
+            preferences = [
+                lambda job: model_key(job.config) == self.pool.most_recent,
+                lambda job: self.pool.is_loaded(model_key(job.config)),
+            ]
+            for prefer in preferences:
+                for i, job in enumerate(self._pending):
+                    if prefer(job):
+                        return self._pending.pop(i)
+            return self._pending.pop(0)
+
+
+def run_job(job: Job, pool: ModelPool, schema_loader: SchemaLoader):
+    """Evaluate one job, streaming its results to the submitting client"""
+    connection = job.connection
+    config = job.config
+    try:
+        if not connection.alive:
+            raise ClientGone()
+
+        entry, warm = pool.get(config)
+        print(f"Job {job.id}: {'reusing' if warm else 'loaded'} {config['model']}, {len(job.examples)} examples")
+
+        prefix_cache = None
+        if config["prefix_cache"]:
+            if entry["prefix_cache"] is None:
+                entry["prefix_cache"] = PrefixCache(entry["model"], entry["tokenizer"])
+            prefix_cache = entry["prefix_cache"]
+
+        def stream_result(result):
+            if not connection.send({"type": "result", "job": job.id, "result": asdict(result)}):
+                raise ClientGone()
+
+        evaluate_dataset(
+            entry["model"],
+            entry["tokenizer"],
+            job.examples,
+            device=config["device"],
+            max_new_tokens=config["max_new_tokens"],
+            batch_size=config["batch_size"],
+            on_result=stream_result,
+            prefix_cache=prefix_cache,
+            stop_at_json_end=config["stop_at_json_end"],
+            schema_loader=schema_loader if config["constrained"] else None
+        )
+
+        # Report the load time this job paid (0 when the model was warm)
+        model_info = dict(entry["model_info"])
+        if warm:
+            model_info["load_time_s"] = 0.0
+        connection.send({"type": "job_done", "job": job.id, "model_info": model_info, "warm": warm})
+    except ClientGone:
+        print(f"Job {job.id}: client disconnected, skipped")
+    except Exception as e:
+        connection.send({"type": "job_error", "job": job.id, "error": str(e)})
+    finally:
+        connection.job_finished()
+
+
+def prepare_job(spec: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict]]:
+    """Apply job defaults and load the job's examples (inline or from its dataset path)"""
+    config = {**JOB_DEFAULTS, **{k: v for k, v in spec.items() if k != "examples"}}
+    if "model" not in config:
+        raise ValueError("Job has no model")
+
+    if "examples" in spec:
+        examples = spec["examples"]
+    elif config.get("dataset"):
+        examples = load_dataset(Path(config["dataset"]), config["limit"])
+    else:
+        raise ValueError("Job needs a dataset path or inline examples")
+    return config, examples
+
+
+def handle_client(conn: socket.socket, scheduler: JobScheduler, server: socket.socket):
+    """Serve one client connection (runs in its own thread)"""
+    with conn, conn.makefile("rwb") as stream:
+        request = read_message(stream)
+        if request is None:
+            return
+
+        command = request.get("command")
+        if command == "status":
+            send_message(stream, {
+                "status": "ok",
+                "models": scheduler.pool.describe(),
+                "memory_used_mb": scheduler.pool.used_mb,
+                "memory_budget_mb": scheduler.pool.memory_budget_mb,
+                "pending_jobs": len(scheduler)
+            })
+        elif command == "shutdown":
+            send_message(stream, {"status": "ok"})
+            scheduler.stop()
+            server.shutdown(socket.SHUT_RDWR)
+        elif command == "submit":
+            connection = Connection(stream)
+            jobs, job_ids, rejected = [], [], []
+            for spec in request.get("jobs", []):
+                job_id = scheduler.new_id()
+                try:
+                    config, examples = prepare_job(spec)
+                except Exception as e:
+                    job_ids.append(None)
+                    rejected.append({"type": "job_error", "job": job_id, "error": str(e)})
+                    continue
+                job_ids.append(job_id)
+                jobs.append(Job(job_id, config, examples, connection))
+
+            connection.send({"type": "accepted", "jobs": job_ids})
+            for message in rejected:
+                connection.send(message)
+            if not jobs:
+                connection.send({"type": "end"})
+                return
+
+            connection.remaining = len(jobs)
+            scheduler.submit(jobs)
+            # Keep the stream open until the executor has finished every job
+            connection.finished.wait()
+        else:
+            send_message(stream, {"status": "error", "error": f"Unknown command: {command}"})
+
+
+def accept_loop(server: socket.socket, scheduler: JobScheduler):
+    """Hand each incoming connection to its own thread"""
+    while True:
+        try:
+            conn, _ = server.accept()
+        except OSError:
+            break  # Server socket shut down
+        threading.Thread(target=handle_client, args=(conn, scheduler, server), daemon=True).start()
+
+
+def serve(socket_path: Path, memory_budget_mb: float):
+    """Run the daemon until a shutdown request or Ctrl-C"""
+    pool = ModelPool(memory_budget_mb)
+    scheduler = JobScheduler(pool)
+    schema_loader = SchemaLoader(SCHEMAS_DIR)
+
+    if socket_path.exists():
+        # Refuse to steal the socket of a live daemon; remove a stale one
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(socket_path))
+            probe.close()
+            print(f"Error: a daemon is already listening on {socket_path}")
+            return
+        except ConnectionRefusedError:
+            socket_path.unlink()
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    server.listen()
+    print(f"✓ Eval daemon listening on {socket_path} "
+          f"({torch.get_num_threads()} threads, {memory_budget_mb:.0f}MB model budget)")
+
+    threading.Thread(target=accept_loop, args=(server, scheduler), daemon=True).start()
+
+    # Jobs run one at a time on this thread, so each gets every CPU thread
+    try:
+        while True:
+            job = scheduler.next_job()
+            if job is None:
+                break
+            run_job(job, pool, schema_loader)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        socket_path.unlink(missing_ok=True)
+        print("Eval daemon stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep EdgeJSON models loaded and run queued evaluation jobs")
+    parser.add_argument("--socket", type=str, default=str(DEFAULT_SOCKET), help="Unix socket path")
+    parser.add_argument("--threads", type=int, help="torch intra-op threads (default: all CPUs)")
+    parser.add_argument("--memory-budget-mb", type=float, default=8192,
+                        help="Evict least recently used models beyond this total model size")
+
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    elif os.cpu_count():
+        torch.set_num_threads(os.cpu_count())
+
+    serve(Path(args.socket), args.memory_budget_mb)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,7 @@ from collections import defaultdict
 sys.path.insert(0, str(Path(__file__).parent / "lib"))
 
 from schema_loader import SchemaLoader
-from quality_validator import QualityValidator, ValidationStats
+from quality_validator import ValidationStats, validate_many
 
 
 def main():
@@ -46,21 +46,17 @@ def main():
     print("Evaluating Test Set")
     print("=" * 80)
 
-    for example in test_examples:
-        # Get schema
-        schema_info = schema_loader.get(example['schema_id'])
-
-        # Create validator
-        validator = QualityValidator(schema_info.schema, alignment_threshold=0.3)
-
-        # Validate
-        result = validator.validate_pair(
-            example['prompt'],
-            json.dumps(example['expected_output'])
-        )
-
-        # Track stats
-        stats_by_schema[example['schema_id']].add(result)
+    # One validator per schema (compiled once per worker), across a process pool
+    batch = validate_many(
+        ((example['schema_id'], example['prompt'], json.dumps(example['expected_output']))
+         for example in test_examples),
+        schemas={s.schema_id: s.schema for s in schema_loader.all_schemas()},
+        alignment_threshold=0.3
+    )
+
+    # Track stats
+    stats_by_schema.update(batch.stats)
+    for example, result in zip(test_examples, batch.results):
         stats_by_complexity[example['complexity']].add(result)
         stats_by_source[example['source']].add(result)
 
@@ -16,20 +16,31 @@
 """
 Comparison Report Generator for EdgeJSON Benchmark
 
-Generates a detailed markdown report comparing two models' performance.
+Generates a detailed markdown report comparing two models' performance,
+or a leaderboard report of any number of models.
 
 Usage:
     python generate_comparison_report.py \
         --comparison results/comparison_data.json \
         --output results/comparison_report.md
+
+    python generate_comparison_report.py \
+        --leaderboard results/leaderboard.json \
+        --output results/leaderboard_report.md
 """
 
 import json
 import argparse
+import sys
 from pathlib import Path
 from datetime import datetime
 from typing import Dict
 
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent / "lib"))
+
+from leaderboard import load_leaderboard
+
 
 def format_percentage(value: float) -> str:
     """Format a float as percentage"""
@@ -128,6 +139,11 @@ def generate_overall_metrics_table(comparison: Dict) -> str:
     ff1 = overall["field_f1"]
     table += f"| **Field F1 Score** | {ff1['baseline_value']:.3f} | {ff1['comparison_value']:.3f} | {format_change(ff1['absolute_change'])} | {ff1['relative_change']:+.1f}% | {format_improvement_ratio(ff1['improvement_ratio'])} |\n"
 
+    # Nested-field F1 (leaf fields of nested objects and arrays)
+    if "nested_field_f1" in overall:
+        nf1 = overall["nested_field_f1"]
+        table += f"| **Nested Field F1** | {nf1['baseline_value']:.3f} | {nf1['comparison_value']:.3f} | {format_change(nf1['absolute_change'])} | {nf1['relative_change']:+.1f}% | {format_improvement_ratio(nf1['improvement_ratio'])} |\n"
+
     # Schema Compliance
     sc = overall["schema_compliance"]
     table += f"| **Schema Compliance** | {format_percentage(sc['baseline_value'])} | {format_percentage(sc['comparison_value'])} | {format_change(sc['absolute_change'], is_percentage=True)} | {sc['relative_change']:+.1f}% | {format_improvement_ratio(sc['improvement_ratio'])} |\n"
@@ -140,6 +156,23 @@ def generate_overall_metrics_table(comparison: Dict) -> str:
     tps = overall["tokens_per_sec"]
     table += f"| **Throughput (tok/s)** | {tps['baseline_value']:.1f} | {tps['comparison_value']:.1f} | {tps['absolute_change']:+.1f} | {tps['relative_change']:+.1f}% | {format_improvement_ratio(tps['improvement_ratio'])} |\n"
 
+    # Token-level timing (only in comparisons of results with measured token counts)
+    timing_rows = [
+        ("p50_latency_ms", "p50 Latency (ms)"),
+        ("p90_latency_ms", "p90 Latency (ms)"),
+        ("p99_latency_ms", "p99 Latency (ms)"),
+        ("avg_ttft_ms", "Time to First Token (ms)"),
+        ("decode_tokens_per_sec", "Decode Rate (tok/s/seq)"),
+        ("ms_per_token", "Latency per Token (ms)"),
+        ("model_size_mb", "Model Size (MB)"),
+        ("load_time_s", "Load Time (s)"),
+    ]
+    for metric, label in timing_rows:
+        if metric not in overall:
+            continue
+        m = overall[metric]
+        table += f"| **{label}** | {m['baseline_value']:.1f} | {m['comparison_value']:.1f} | {m['absolute_change']:+.1f} | {m['relative_change']:+.1f}% | {format_improvement_ratio(m['improvement_ratio'])} |\n"
+
     return table
 
 
@@ -167,6 +200,11 @@ def generate_complexity_breakdown(comparison: Dict) -> str:
         ff1 = comp_data["field_f1"]
         section += f"| | Field F1 | {ff1['baseline_value']:.3f} | {ff1['comparison_value']:.3f} | {format_change(ff1['absolute_change'])} | {ff1['relative_change']:+.1f}% |\n"
 
+        # Nested-field F1
+        if "nested_field_f1" in comp_data:
+            nf1 = comp_data["nested_field_f1"]
+            section += f"| | Nested Field F1 | {nf1['baseline_value']:.3f} | {nf1['comparison_value']:.3f} | {format_change(nf1['absolute_change'])} | {nf1['relative_change']:+.1f}% |\n"
+
         # Schema Compliance
         sc = comp_data["schema_compliance"]
         section += f"| | Compliance | {format_percentage(sc['baseline_value'])} | {format_percentage(sc['comparison_value'])} | {format_change(sc['absolute_change'], is_percentage=True)} | {sc['relative_change']:+.1f}% |\n"
@@ -174,6 +212,61 @@ def generate_complexity_breakdown(comparison: Dict) -> str:
     return section
 
 
+def generate_significance_section(comparison: Dict) -> str:
+    """Generate paired-bootstrap / McNemar significance section"""
+    significance = comparison["significance"]
+    if not significance.get("paired_examples"):
+        return "## Statistical Significance\n\nNot computed: no example IDs match between the two runs."
+    confidence = f"{significance['confidence']:.0%}"
+    labels = [
+        ("json_exact", "JSONExact", True),
+        ("field_f1", "Field F1", False),
+        ("nested_field_f1", "Nested Field F1", False),
+        ("schema_compliance", "Compliance", True),
+    ]
+
+    def interval(m: Dict, is_percentage: bool) -> str:
+        return f"[{format_change(m['ci_low'], is_percentage)}, {format_change(m['ci_high'], is_percentage)}]"
+
+    section = f"""## Statistical Significance
+
+Paired over {significance["paired_examples"]} examples: {confidence} paired-bootstrap confidence intervals
+({significance["n_resamples"]} resamples) of the change, and McNemar's test on JSONExact.
+
+| Metric | Change | {confidence} CI | Significant |
+|--------|--------|--------|-------------|
+"""
+
+    overall = significance["overall"]
+    for metric, label, is_percentage in labels:
+        if metric not in overall:
+            continue
+        m = overall[metric]
+        section += f"| **{label}** | {format_change(m['delta'], is_percentage)} | {interval(m, is_percentage)} | {'Yes' if m['significant'] else 'No'} |\n"
+
+    if "json_exact" in overall:
+        mcnemar = overall["json_exact"]["mcnemar"]
+        section += f"""
+**McNemar (JSONExact)**: {mcnemar['baseline_only']} examples correct only for the baseline, {mcnemar['comparison_only']} only for the comparison model (p = {mcnemar['p_value']:.4f}, {mcnemar['test']} test).
+"""
+
+    section += f"""
+### JSONExact by Complexity and Schema
+
+| Group | Change | {confidence} CI | McNemar p | Significant |
+|-------|--------|--------|-----------|-------------|
+"""
+
+    groups = [(level.capitalize(), significance["by_complexity"][level])
+              for level in ["simple", "medium", "complex"] if level in significance["by_complexity"]]
+    groups += [(f"`{schema}`", significance["by_schema"][schema]) for schema in sorted(significance["by_schema"])]
+    for label, metrics in groups:
+        je = metrics["json_exact"]
+        section += f"| {label} | {format_change(je['delta'], is_percentage=True)} | {interval(je, True)} | {je['mcnemar']['p_value']:.3f} | {'Yes' if je['significant'] else 'No'} |\n"
+
+    return section
+
+
 def generate_schema_rankings(comparison: Dict) -> str:
     """Generate schema rankings section"""
     rankings = comparison["schema_rankings"]
@@ -306,6 +399,8 @@ def generate_report(comparison_data: Dict) -> str:
     report += generate_executive_summary(comparison_data) + "\n\n"
     report += generate_overall_metrics_table(comparison_data) + "\n\n"
     report += generate_complexity_breakdown(comparison_data) + "\n\n"
+    if comparison_data.get("significance"):
+        report += generate_significance_section(comparison_data) + "\n\n"
     report += generate_schema_rankings(comparison_data) + "\n\n"
     report += generate_detailed_schema_table(comparison_data) + "\n\n"
     report += generate_analysis_recommendations(comparison_data) + "\n\n"
@@ -320,21 +415,111 @@ See `/benchmarks/edge_json/README.md` for benchmark details.
     return report
 
 
+def format_optional(value: float | None, is_percentage: bool = False) -> str:
+    """Format a leaderboard value that is None for models without examples in a group"""
+    if value is None:
+        return "n/a"
+    return format_percentage(value) if is_percentage else f"{value:.3f}"
+
+
+def generate_leaderboard_report(leaderboard: Dict) -> str:
+    """Generate an N-way leaderboard report from a build_leaderboard.py artifact"""
+    models = leaderboard["models"]
+    overall = leaderboard["overall"]
+
+    report = f"""# EdgeJSON Benchmark: Leaderboard
+
+**Generated**: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+**Leaderboard Built**: {leaderboard["generated"]}
+
+**Models**: {len(models)}
+**Examples**: {leaderboard["examples"]}{" (evaluated by every model)" if leaderboard["intersect"] else ""}
+
+---
+
+## Overall Ranking
+
+| Rank | Model | Examples | JSONExact | Field F1 | Nested Field F1 | Compliance | Avg Latency (ms) |
+|------|-------|----------|-----------|----------|-----------------|------------|------------------|
+"""
+
+    for i, model in enumerate(models):
+        latency = overall["avg_latency_ms"][i]
+        report += (f"| {i + 1} | `{model['name']}` | {overall['count'][i]} | "
+                   f"{format_optional(overall['json_exact'][i], is_percentage=True)} | "
+                   f"{format_optional(overall['avg_field_f1'][i])} | "
+                   f"{format_optional(overall['avg_nested_field_f1'][i])} | "
+                   f"{format_optional(overall['schema_compliance'][i], is_percentage=True)} | "
+                   f"{'n/a' if latency is None else f'{latency:.1f}'} |\n")
+
+    # JSONExact per group: one row per model, one column per group
+    def group_table(title: str, groups: Dict[str, Dict], label=str) -> str:
+        names = list(groups)
+        table = f"""
+## {title}
+
+| Model | {" | ".join(label(name) for name in names)} |
+|-------|{"|".join("---" for _ in names)}|
+"""
+        for i, model in enumerate(models):
+            cells = [format_optional(groups[name]["json_exact"][i], is_percentage=True) for name in names]
+            table += f"| `{model['name']}` | {' | '.join(cells)} |\n"
+        return table
+
+    report += group_table("JSONExact by Complexity", leaderboard["by_complexity"], lambda name: name.capitalize())
+    report += group_table("JSONExact by Schema", leaderboard["by_schema"], lambda name: f"`{name}`")
+
+    footprint = [model for model in models if "model_size_mb" in model or "ms_per_token" in model]
+    if footprint:
+        report += """
+## Deployment Footprint
+
+| Model | Size (MB) | Load Time (s) | ms/token | Quantization | Track |
+|-------|-----------|---------------|----------|--------------|-------|
+"""
+        for model in footprint:
+            size = model.get("model_size_mb")
+            load = model.get("load_time_s")
+            ms_per_token = model.get("ms_per_token")
+            report += (f"| `{model['name']}` | {'n/a' if size is None else f'{size:.1f}'} | "
+                       f"{'n/a' if load is None else f'{load:.2f}'} | "
+                       f"{'n/a' if ms_per_token is None else f'{ms_per_token:.2f}'} | "
+                       f"{model.get('quantization', 'none')} | {model.get('track', 'standard')} |\n")
+
+    report += """
+---
+
+**Note**: This report was automatically generated from an EdgeJSON leaderboard (`scripts/build_leaderboard.py`).
+See `/benchmarks/edge_json/README.md` for benchmark details.
+"""
+
+    return report
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate EdgeJSON comparison report")
-    parser.add_argument("--comparison", type=str, required=True, help="Path to comparison data JSON")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--comparison", type=str, help="Path to comparison data JSON (compare_models.py)")
+    source.add_argument("--leaderboard", type=str, help="Path to leaderboard JSON (build_leaderboard.py)")
     parser.add_argument("--output", type=str, required=True, help="Path to save markdown report")
 
     args = parser.parse_args()
 
-    # Load comparison data
-    print(f"Loading comparison data: {args.comparison}")
-    with open(args.comparison, 'r') as f:
-        comparison_data = json.load(f)
+    if args.leaderboard:
+        print(f"Loading leaderboard: {args.leaderboard}")
+        leaderboard = load_leaderboard(args.leaderboard)
 
-    # Generate report
-    print("Generating comparison report...")
-    report = generate_report(comparison_data)
+        print("Generating leaderboard report...")
+        report = generate_leaderboard_report(leaderboard)
+    else:
+        # Load comparison data
+        print(f"Loading comparison data: {args.comparison}")
+        with open(args.comparison, 'r') as f:
+            comparison_data = json.load(f)
+
+        # Generate report
+        print("Generating comparison report...")
+        report = generate_report(comparison_data)
 
     # Save report
     output_path = Path(args.output)
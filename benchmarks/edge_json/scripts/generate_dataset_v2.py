@@ -15,7 +15,7 @@ import json
 import random
 import argparse
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, asdict
 from collections import defaultdict
 import sys
@@ -27,7 +27,8 @@ from schema_loader import SchemaLoader, SchemaInfo
 from template_generator import TemplateGenerator
 from teacher_router import TeacherRouter
 from vllm_generator import VLLMGenerator, DEFAULT_CONFIGS
-from quality_validator import QualityValidator, ValidationStats
+from quality_validator import validate_many
+from placeholder_scanner import PlaceholderScanner
 
 
 @dataclass
@@ -55,7 +56,8 @@ class DatasetGenerator:
         examples_per_schema: int = 60,
         template_ratio: float = 0.5,
         target_total: int = 1000,
-        seed: int = 42
+        seed: int = 42,
+        placeholder_files: Optional[List[Path]] = None
     ):
         """
         Initialize dataset generator.
@@ -67,6 +69,7 @@ class DatasetGenerator:
             template_ratio: Fraction of examples from templates (0.0-1.0)
             target_total: Target number of examples in final dataset
             seed: Random seed for reproducibility
+            placeholder_files: Extra placeholder word lists (added to placeholders.txt)
         """
         self.schemas_root = schemas_root
         self.output_dir = Path(output_dir)
@@ -84,6 +87,7 @@ class DatasetGenerator:
         self.template_gen = TemplateGenerator(seed=seed)
         self.teacher_router = TeacherRouter()
         self.vllm_gen = None  # Lazy initialization
+        self.placeholders = PlaceholderScanner.from_files(*(placeholder_files or []))
 
         # Create output directory
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -92,6 +96,7 @@ class DatasetGenerator:
         print(f"✓ Target: {self.examples_per_schema} examples/schema "
               f"({int(self.template_ratio*100)}% template, "
               f"{int((1-self.template_ratio)*100)}% LLM)")
+        print(f"✓ Placeholder filter: {len(self.placeholders)} words")
         print(f"✓ Final dataset size: {self.target_total} examples\n")
 
     def generate_all(self):
@@ -267,26 +272,18 @@ class DatasetGenerator:
     def _validate_and_filter(self, examples: List[Example]) -> List[Example]:
         """Validate all examples and filter out invalid ones."""
         valid_examples = []
-        stats_by_schema = defaultdict(ValidationStats)
-
         print("\nValidating examples...")
 
-        for example in examples:
-            # Get schema
-            schema_info = self.schema_loader.get(example.schema_id)
-
-            # Create validator
-            validator = QualityValidator(schema_info.schema, alignment_threshold=0.3)
-
-            # Validate
-            result = validator.validate_pair(
-                example.prompt,
-                json.dumps(example.expected_output)
-            )
-
-            # Track stats
-            stats_by_schema[example.schema_id].add(result)
+        # One validator per schema (compiled once per worker), across a process pool
+        batch = validate_many(
+            ((example.schema_id, example.prompt, json.dumps(example.expected_output)) for example in examples),
+            schemas={s.schema_id: s.schema for s in self.schema_loader.all_schemas()},
+            alignment_threshold=0.3,
+            placeholders=self.placeholders
+        )
+        stats_by_schema = batch.stats
 
+        for example, result in zip(examples, batch.results):
             # Keep if valid
             if result.valid:
                 # Update with cleaned JSON
@@ -453,6 +450,12 @@ def main():
         default=42,
         help="Random seed for reproducibility"
     )
+    parser.add_argument(
+        "--placeholders",
+        type=Path,
+        nargs="+",
+        help="Extra placeholder word lists (one word per line) to reject"
+    )
 
     args = parser.parse_args()
 
@@ -463,7 +466,8 @@ def main():
         examples_per_schema=args.examples_per_schema,
         template_ratio=args.template_ratio,
         target_total=args.target_total,
-        seed=args.seed
+        seed=args.seed,
+        placeholder_files=args.placeholders
     )
 
     # Generate dataset
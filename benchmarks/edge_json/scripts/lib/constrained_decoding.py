@@ -0,0 +1,439 @@
+"""
+Constrained Decoding - Schema-driven logit masking for JSON generation.
+
+Compiles an EdgeJSON schema into a character-level JSON grammar, lifts it to
+a token-level automaton over the tokenizer vocabulary, and masks logits so
+greedy decoding can only emit JSON that follows the schema's structure.
+
+Automata are cached per (tokenizer, schema) and memoize every
+(state, token) transition they evaluate, so compile and lookup costs are
+paid once per process.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+from transformers import LogitsProcessor
+
+from schema_loader import schema_hash
+
+
+WHITESPACE = " \t\n\r"
+HEX_DIGITS = "0123456789abcdefABCDEF"
+
+# Number grammar: phase -> {char: next phase}
+NUMBER_TRANSITIONS = {
+    "start": {"-": "minus", "0": "zero", **{d: "int" for d in "123456789"}},
+    "minus": {"0": "zero", **{d: "int" for d in "123456789"}},
+    "zero": {".": "dot", "e": "exp0", "E": "exp0"},
+    "int": {".": "dot", "e": "exp0", "E": "exp0", **{d: "int" for d in "0123456789"}},
+    "dot": {d: "frac" for d in "0123456789"},
+    "frac": {"e": "exp0", "E": "exp0", **{d: "frac" for d in "0123456789"}},
+    "exp0": {"+": "expsign", "-": "expsign", **{d: "exp" for d in "0123456789"}},
+    "expsign": {d: "exp" for d in "0123456789"},
+    "exp": {d: "exp" for d in "0123456789"},
+}
+NUMBER_TERMINAL = {"zero", "int", "frac", "exp"}
+
+# Fixed node indices for unconstrained JSON values
+ANY, ANY_OBJECT, ANY_ARRAY, ANY_NUMBER, ANY_LITERAL = range(5)
+
+
+class SchemaGrammar:
+    """
+    Character-level JSON grammar compiled from a JSON schema.
+
+    Schema nodes are flattened into a table so parser states are small
+    hashable tuples: a stack of frames that refer to nodes by index.
+
+    Enforced keywords: type, properties, required, items, minItems, enum and
+    a non-negative minimum (no minus sign). Objects with properties accept
+    only their declared keys, each at most once, and cannot close before
+    every required key is present. Objects without properties and untyped
+    values accept any JSON. Other keywords (format, pattern, maxLength, ...)
+    are left to post-hoc validation.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        """
+        Compile a schema.
+
+        Args:
+            schema: JSON schema whose top level is an object
+        """
+        self.nodes: List[Tuple] = [
+            ("any",),
+            ("object", None, frozenset()),
+            ("array", ANY, 0),
+            ("number", False, False),
+            ("literal", ("true", "false", "null")),
+        ]
+        self.root = self._compile(schema)
+
+    def _compile(self, schema: Dict[str, Any]) -> int:
+        """Append a node (and its children) to the table, returning its index."""
+        if "enum" in schema:
+            return self._add(("literal", tuple(json.dumps(v) for v in schema["enum"])))
+
+        field_type = schema.get("type")
+        if field_type == "object":
+            properties = schema.get("properties")
+            if not properties:
+                return ANY_OBJECT
+            children = {name: self._compile(sub) for name, sub in properties.items()}
+            return self._add(("object", children, frozenset(schema.get("required", []))))
+        elif field_type == "array":
+            item = self._compile(schema.get("items", {}))
+            return self._add(("array", item, schema.get("minItems", 0)))
+        elif field_type == "string":
+            return self._add(("string",))
+        elif field_type in ("number", "integer"):
+            minimum = schema.get("minimum")
+            unsigned = minimum is not None and minimum >= 0
+            return self._add(("number", field_type == "integer", unsigned))
+        elif field_type == "boolean":
+            return self._add(("literal", ("true", "false")))
+        elif field_type == "null":
+            return self._add(("literal", ("null",)))
+        else:
+            # No type or a union of types
+            return ANY
+
+    def _add(self, node: Tuple) -> int:
+        self.nodes.append(node)
+        return len(self.nodes) - 1
+
+    def initial_state(self) -> Tuple:
+        """State before any output: expecting the root value."""
+        return (("root", self.root, False),)
+
+    def is_complete(self, state: Tuple) -> bool:
+        """True when the root value has been fully emitted."""
+        return len(state) == 1 and state[0][2]
+
+    def step(self, state: Tuple, ch: str) -> Optional[Tuple]:
+        """Advance the parser by one character; None if the character is invalid."""
+        top = state[-1]
+        rest = state[:-1]
+        kind = top[0]
+
+        if kind == "str":
+            return self._step_string(rest, top, ch)
+        elif kind == "key":
+            return self._step_key(rest, top, ch)
+        elif kind == "num":
+            return self._step_number(rest, top, ch)
+        elif kind == "lit":
+            return self._feed_literal(rest, top[1], top[2], ch)
+        elif kind == "val":
+            if ch in WHITESPACE:
+                return state
+            return self._start_value(rest, top[1], ch)
+        elif kind == "obj":
+            return self._step_object(rest, top, ch)
+        elif kind == "arr":
+            return self._step_array(rest, top, ch)
+        else:  # root
+            if ch in WHITESPACE:
+                return state
+            if top[2]:
+                return None
+            return self._start_value(rest + (("root", top[1], True),), top[1], ch)
+
+    def _start_value(self, stack: Tuple, node_index: int, ch: str) -> Optional[Tuple]:
+        """Push the frame for a value of node_index whose first character is ch."""
+        node = self.nodes[node_index]
+        kind = node[0]
+
+        if kind == "any":
+            if ch == "{":
+                node_index, kind = ANY_OBJECT, "object"
+            elif ch == "[":
+                node_index, kind = ANY_ARRAY, "array"
+            elif ch == '"':
+                kind = "string"
+            elif ch == "-" or ch.isdigit():
+                node_index, kind = ANY_NUMBER, "number"
+            else:
+                node_index, kind = ANY_LITERAL, "literal"
+            node = self.nodes[node_index]
+
+        if kind == "object":
+            return stack + (("obj", node_index, "K?", frozenset(), None),) if ch == "{" else None
+        elif kind == "array":
+            return stack + (("arr", node_index, "[", 0),) if ch == "[" else None
+        elif kind == "string":
+            return stack + (("str", 0, False),) if ch == '"' else None
+        elif kind == "literal":
+            return self._feed_literal(stack, node[1], 0, ch)
+        else:  # number
+            return self._step_number(stack, ("num", node_index, "start"), ch)
+
+    def _complete(self, stack: Tuple) -> Tuple:
+        """Notify the parent frame (now on top of stack) that its child value ended."""
+        parent = stack[-1]
+        kind = parent[0]
+
+        if kind == "obj":
+            # A value ends the member; an open-object key string moves on to ':'
+            phase = ":" if parent[2] == "k" else ","
+            return stack[:-1] + (("obj", parent[1], phase, parent[3], None),)
+        elif kind == "arr":
+            return stack[:-1] + (("arr", parent[1], ",", parent[3] + 1),)
+        return stack  # root
+
+    def _step_string(self, rest: Tuple, top: Tuple, ch: str) -> Optional[Tuple]:
+        _, escape, is_key = top
+        if escape == 0:
+            if ch == '"':
+                return self._complete(rest)
+            if ch == "\\":
+                return rest + (("str", -1, is_key),)
+            if ord(ch) < 0x20:
+                return None
+            return rest + (top,)
+        elif escape == -1:
+            if ch in '"\\/bfnrt':
+                return rest + (("str", 0, is_key),)
+            if ch == "u":
+                return rest + (("str", 4, is_key),)
+            return None
+        else:
+            if ch not in HEX_DIGITS:
+                return None
+            return rest + (("str", escape - 1, is_key),)
+
+    def _step_key(self, rest: Tuple, top: Tuple, ch: str) -> Optional[Tuple]:
+        _, node_index, partial = top
+        properties = self.nodes[node_index][1]
+        seen = rest[-1][3]
+
+        if ch == '"':
+            if partial in properties and partial not in seen:
+                return rest[:-1] + (("obj", node_index, ":", seen | {partial}, partial),)
+            return None
+
+        partial += ch
+        for name in properties:
+            if name not in seen and name.startswith(partial):
+                return rest + (("key", node_index, partial),)
+        return None
+
+    def _step_number(self, rest: Tuple, top: Tuple, ch: str) -> Optional[Tuple]:
+        _, node_index, phase = top
+        _, integer, unsigned = self.nodes[node_index]
+
+        next_phase = NUMBER_TRANSITIONS[phase].get(ch)
+        if integer and ch in ".eE":
+            next_phase = None
+        if unsigned and phase == "start" and ch == "-":
+            next_phase = None
+
+        if next_phase is not None:
+            return rest + (("num", node_index, next_phase),)
+
+        # Numbers have no closing delimiter: end it and re-feed ch to the parent
+        if phase in NUMBER_TERMINAL:
+            return self.step(self._complete(rest), ch)
+        return None
+
+    def _feed_literal(self, stack: Tuple, options: Tuple[str, ...], pos: int, ch: str) -> Optional[Tuple]:
+        remaining = tuple(option for option in options if len(option) > pos and option[pos] == ch)
+        if not remaining:
+            return None
+
+        pos += 1
+        if len(remaining) == 1 and len(remaining[0]) == pos:
+            return self._complete(stack)
+        return stack + (("lit", remaining, pos),)
+
+    def _step_object(self, rest: Tuple, top: Tuple, ch: str) -> Optional[Tuple]:
+        _, node_index, phase, seen, key = top
+        _, properties, required = self.nodes[node_index]
+
+        if ch in WHITESPACE:
+            return rest + (top,)
+
+        if phase in ("K?", "K"):
+            if ch == '"':
+                if properties is None:
+                    return rest + (("obj", node_index, "k", seen, None), ("str", 0, True))
+                return rest + (("obj", node_index, "k", seen, None), ("key", node_index, ""))
+            if ch == "}" and phase == "K?" and required <= seen:
+                return self._complete(rest)
+            return None
+        elif phase == ":":
+            if ch != ":":
+                return None
+            child = properties[key] if properties is not None else ANY
+            return rest + (("obj", node_index, "V", seen, key), ("val", child))
+        elif phase == ",":
+            if ch == ",":
+                if properties is not None and all(name in seen for name in properties):
+                    return None
+                return rest + (("obj", node_index, "K", seen, None),)
+            if ch == "}" and required <= seen:
+                return self._complete(rest)
+            return None
+        return None
+
+    def _step_array(self, rest: Tuple, top: Tuple, ch: str) -> Optional[Tuple]:
+        _, node_index, phase, count = top
+        _, item, min_items = self.nodes[node_index]
+
+        if ch in WHITESPACE:
+            return rest + (top,)
+
+        if phase == ",":
+            if ch == ",":
+                return rest + (("arr", node_index, "V", count),)
+            if ch == "]" and count >= min_items:
+                return self._complete(rest)
+            return None
+
+        if phase == "[" and ch == "]":
+            return self._complete(rest) if min_items == 0 else None
+
+        # Phase "[" or "V": a new element starts here
+        return self._start_value(rest + (("arr", node_index, "V", count),), item, ch)
+
+
+class TokenAutomaton:
+    """
+    Token-level view of a SchemaGrammar for one tokenizer vocabulary.
+
+    Transitions are computed lazily by feeding a token's text through the
+    character grammar and memoized, so repeated states (e.g. inside strings)
+    cost a dictionary lookup.
+    """
+
+    def __init__(self, grammar: SchemaGrammar, token_texts: List[Optional[str]], eos_token_id: int):
+        """
+        Initialize token automaton.
+
+        Args:
+            grammar: Compiled schema grammar
+            token_texts: Decoded text per token ID (None for special/empty tokens)
+            eos_token_id: Token allowed once the root object is complete
+        """
+        self.grammar = grammar
+        self.token_texts = token_texts
+        self.eos_token_id = eos_token_id
+        self._transitions: Dict[Tuple[Tuple, int], Optional[Tuple]] = {}
+
+    def initial_state(self) -> Tuple:
+        return self.grammar.initial_state()
+
+    def advance(self, state: Tuple, token_id: int) -> Optional[Tuple]:
+        """State after emitting token_id, or None if the token is not allowed."""
+        key = (state, token_id)
+        if key in self._transitions:
+            return self._transitions[key]
+
+        text = self.token_texts[token_id] if token_id < len(self.token_texts) else None
+        next_state = state if text else None
+        if text:
+            for ch in text:
+                next_state = self.grammar.step(next_state, ch)
+                if next_state is None:
+                    break
+
+        self._transitions[key] = next_state
+        return next_state
+
+    def select(self, state: Tuple, scores: torch.Tensor, k: int = 1, chunk_size: int = 256) -> List[int]:
+        """
+        Return the k highest-scoring allowed tokens in state.
+
+        Candidates are checked in descending score order, so greedy decoding
+        (k=1) picks exactly the argmax over all allowed tokens without
+        checking the whole vocabulary.
+        """
+        if self.grammar.is_complete(state):
+            return [self.eos_token_id]
+
+        order = torch.argsort(scores, descending=True)
+        allowed = []
+        for start in range(0, order.shape[0], chunk_size):
+            for token_id in order[start:start + chunk_size].tolist():
+                if self.advance(state, token_id) is not None:
+                    allowed.append(token_id)
+                    if len(allowed) >= k:
+                        return allowed
+
+        # No structurally valid continuation: let the sequence end
+        return allowed or [self.eos_token_id]
+
+
+class SchemaConstrainedLogitsProcessor(LogitsProcessor):
+    """
+    Mask logits so each batch row can only continue with schema-valid JSON.
+
+    Every row has its own automaton (rows may use different schemas) and
+    parser state, advanced by the token generated at the previous step.
+    """
+
+    def __init__(self, automata: List[TokenAutomaton], prompt_length: int, k: int = 1):
+        """
+        Initialize logits processor for one generate call.
+
+        Args:
+            automata: One TokenAutomaton per batch row
+            prompt_length: Length of the (padded) prompt in tokens
+            k: Allowed tokens kept per step (1 is exact for greedy decoding)
+        """
+        self.automata = automata
+        self.prompt_length = prompt_length
+        self.k = k
+        self.states: List[Optional[Tuple]] = [automaton.initial_state() for automaton in automata]
+
+    def __call__(self, input_ids, scores):
+        if input_ids.shape[1] > self.prompt_length:
+            for row, automaton in enumerate(self.automata):
+                if self.states[row] is not None:
+                    self.states[row] = automaton.advance(self.states[row], int(input_ids[row, -1]))
+
+        mask = torch.full_like(scores, float("-inf"))
+        for row, automaton in enumerate(self.automata):
+            state = self.states[row]
+            if state is None:
+                allowed = [automaton.eos_token_id]
+            else:
+                allowed = automaton.select(state, scores[row], self.k)
+            mask[row, allowed] = 0
+
+        return scores + mask
+
+
+# Process-wide caches: decoded vocabularies per tokenizer, automata per (tokenizer, schema)
+_TOKEN_TEXTS: Dict[str, List[Optional[str]]] = {}
+_AUTOMATA: Dict[Tuple[str, str], TokenAutomaton] = {}
+
+
+def _tokenizer_key(tokenizer) -> str:
+    return f"{tokenizer.name_or_path}:{len(tokenizer)}"
+
+
+def token_texts_for(tokenizer) -> List[Optional[str]]:
+    """Decoded text of every token ID (None for special and empty tokens), cached per tokenizer."""
+    key = _tokenizer_key(tokenizer)
+    if key not in _TOKEN_TEXTS:
+        special_ids = set(tokenizer.all_special_ids)
+        _TOKEN_TEXTS[key] = [
+            None if token_id in special_ids else (tokenizer.decode([token_id]) or None)
+            for token_id in range(len(tokenizer))
+        ]
+    return _TOKEN_TEXTS[key]
+
+
+def get_automaton(tokenizer, schema: Dict[str, Any]) -> TokenAutomaton:
+    """Compiled token automaton for a schema, cached per tokenizer and schema content."""
+    key = (_tokenizer_key(tokenizer), schema_hash(schema))
+    if key not in _AUTOMATA:
+        _AUTOMATA[key] = TokenAutomaton(
+            SchemaGrammar(schema),
+            token_texts_for(tokenizer),
+            tokenizer.eos_token_id
+        )
+    return _AUTOMATA[key]
@@ -0,0 +1,110 @@
+"""
+Daemon Protocol - Wire format shared by eval_daemon.py and its clients.
+
+Messages are newline-delimited JSON objects over a Unix domain socket.
+
+Control commands ("status", "shutdown") get one response object carrying a
+"status" of "ok" or "error". A "submit" command carries a list of
+evaluation jobs; the daemon answers with a stream of typed messages:
+
+    {"type": "accepted", "jobs": [job ID per submitted job, None if rejected]}
+    {"type": "result", "job": ID, "result": {EvaluationResult fields}}
+    {"type": "job_done", "job": ID, "model_info": {...}, "warm": bool}
+    {"type": "job_error", "job": ID, "error": "..."}
+    {"type": "end"}
+"""
+
+import json
+import socket
+from pathlib import Path
+from typing import Any, Dict, BinaryIO, Iterator
+
+from model_cache import DEFAULT_CACHE_DIR
+
+
+# Default socket of the long-lived model worker
+DEFAULT_SOCKET = DEFAULT_CACHE_DIR / "eval_daemon.sock"
+
+# Options of an evaluation job (a job also names a model and either a
+# dataset path or inline examples)
+JOB_DEFAULTS = {
+    "adapter": None,
+    "device": "cpu",
+    "backend": "pytorch",
+    "quantize": None,
+    "max_new_tokens": 512,
+    "batch_size": 1,
+    "prefix_cache": False,
+    "stop_at_json_end": False,
+    "constrained": False,
+    "limit": None,
+}
+
+
+def model_key(job: Dict[str, Any]) -> tuple:
+    """Jobs with equal keys can share one loaded model"""
+    return (job["model"], job["adapter"], job["device"], job["backend"], job["quantize"])
+
+
+def send_message(stream: BinaryIO, message: Dict[str, Any]):
+    """Write one message and flush it"""
+    stream.write(json.dumps(message).encode() + b"\n")
+    stream.flush()
+
+
+def read_message(stream: BinaryIO) -> Dict[str, Any] | None:
+    """Read one message (None when the peer closed the connection)"""
+    line = stream.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def _connect(socket_path: Path) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except (FileNotFoundError, ConnectionRefusedError):
+        sock.close()
+        raise ConnectionError(
+            f"No eval daemon at {socket_path}. Start one with: python scripts/eval_daemon.py"
+        )
+    return sock
+
+
+def request(socket_path: Path, message: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Send one control request to the daemon and wait for its response.
+
+    Raises:
+        ConnectionError: If no daemon is listening on socket_path
+    """
+    sock = _connect(socket_path)
+    with sock, sock.makefile("rwb") as stream:
+        send_message(stream, message)
+        response = read_message(stream)
+
+    if response is None:
+        raise ConnectionError("Eval daemon closed the connection without a response")
+    return response
+
+
+def submit(socket_path: Path, jobs: list) -> Iterator[Dict[str, Any]]:
+    """
+    Submit evaluation jobs and yield the daemon's messages as they arrive.
+
+    Stops after the "end" message.
+
+    Raises:
+        ConnectionError: If no daemon is listening, or it disconnects early
+    """
+    sock = _connect(socket_path)
+    with sock, sock.makefile("rwb") as stream:
+        send_message(stream, {"command": "submit", "jobs": jobs})
+        while True:
+            message = read_message(stream)
+            if message is None:
+                raise ConnectionError("Eval daemon closed the connection before finishing")
+            yield message
+            if message["type"] == "end":
+                return
@@ -0,0 +1,74 @@
+"""
+JSON Stopping - End generation once the model's top-level JSON object closes.
+
+Small models often emit a complete JSON object and then keep generating
+until max_new_tokens. This stopping criterion feeds each new token through a
+JSONBraceScanner per batch row and stops a row as soon as its outermost
+object is balanced.
+"""
+
+from typing import Dict, List
+
+import torch
+from transformers import StoppingCriteria
+
+from json_stream import JSONBraceScanner
+
+
+class JSONObjectStoppingCriteria(StoppingCriteria):
+    """
+    Stop each sequence when its first top-level JSON object is complete.
+
+    Tokens are decoded one at a time; JSON structural characters are ASCII,
+    so per-token decoding never splits a brace, quote or backslash.
+    """
+
+    def __init__(self, tokenizer, prompt_length: int, max_new_tokens: int):
+        """
+        Initialize stopping criterion for one generate call.
+
+        Args:
+            tokenizer: Tokenizer used to decode new tokens
+            prompt_length: Length of the (padded) prompt in tokens
+            max_new_tokens: Generation limit, used to count tokens saved
+        """
+        self.tokenizer = tokenizer
+        self.prompt_length = prompt_length
+        self.max_new_tokens = max_new_tokens
+        self.scanners: List[JSONBraceScanner] = []
+        self.stopped_at: List[int] = []  # New tokens generated when each row stopped (0 = not stopped)
+        self._token_text: Dict[int, str] = {}
+
+    def _decode(self, token_id: int) -> str:
+        text = self._token_text.get(token_id)
+        if text is None:
+            text = self.tokenizer.decode([token_id], skip_special_tokens=True)
+            self._token_text[token_id] = text
+        return text
+
+    def __call__(self, input_ids, scores, **kwargs):
+        batch_size = input_ids.shape[0]
+        if not self.scanners:
+            self.scanners = [JSONBraceScanner() for _ in range(batch_size)]
+            self.stopped_at = [0] * batch_size
+
+        num_generated = input_ids.shape[1] - self.prompt_length
+        done = []
+        for row, scanner in enumerate(self.scanners):
+            if not scanner.complete:
+                if scanner.feed(self._decode(int(input_ids[row, -1]))):
+                    self.stopped_at[row] = num_generated
+            done.append(scanner.complete)
+
+        return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+
+    def tokens_saved(self, row: int = 0) -> int:
+        """
+        Decode budget left when a row stopped (0 if it never stopped early).
+
+        This is an upper bound on the decode steps saved: without the
+        criterion the model may still have emitted EOS before max_new_tokens.
+        """
+        if not self.stopped_at or not self.stopped_at[row]:
+            return 0
+        return self.max_new_tokens - self.stopped_at[row]
@@ -0,0 +1,180 @@
+"""
+JSON Stream - Incremental, string-aware brace matching over streamed text.
+
+Tracks object/array nesting depth while skipping braces inside JSON strings
+(including escaped quotes), so callers can tell the moment the outermost
+JSON object in a stream of model output is balanced. The scanner backs the
+generation stopping criterion; JSON extraction from finished output applies
+the same string and nesting rules in one pass, so both agree on where an
+object ends.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Dict
+
+# Characters that can change scanner state; everything else is skipped in bulk
+_STRUCTURAL = re.compile(r'[{}\[\]"\\]')
+
+_DECODER = json.JSONDecoder()
+
+
+class JSONBraceScanner:
+    """
+    Incrementally scan text for the first complete top-level JSON object.
+
+    Text before the first '{' is ignored. After that, '{'/'[' and '}'/']'
+    outside strings change the nesting depth; the object is complete when
+    the depth returns to zero.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.started = False
+        self.complete = False
+        self.position = 0  # Characters consumed so far
+        self.start = -1    # Offset of the opening '{'
+        self.end = -1      # Offset just past the closing '}'
+
+    def feed(self, text: str) -> bool:
+        """
+        Consume the next chunk of text.
+
+        Returns:
+            True once the first top-level object is complete (stays True)
+        """
+        if self.complete:
+            return True
+
+        consumed = self._scan(text, 0)
+        self.position += consumed
+        return self.complete
+
+    def _scan(self, text: str, pos: int) -> int:
+        """Scan text from pos; returns the offset scanning stopped at (len(text) if incomplete)"""
+        if self.escape:
+            # A backslash ended the previous chunk, so this chunk's first character is escaped
+            self.escape = False
+            pos += 1
+
+        if not self.started:
+            pos = text.find("{", pos)
+            if pos == -1:
+                return len(text)
+            self.started = True
+            self.depth = 1
+            self.start = self.position + pos
+            pos += 1
+
+        while True:
+            match = _STRUCTURAL.search(text, pos)
+            if match is None:
+                return len(text)
+            i = match.start()
+            ch = text[i]
+            pos = i + 1
+
+            if self.in_string:
+                if ch == "\\":
+                    if pos == len(text):
+                        self.escape = True
+                    pos += 1  # Skip the escaped character
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "{" or ch == "[":
+                self.depth += 1
+            elif ch == "}" or ch == "]":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.complete = True
+                    self.end = self.position + pos
+                    return pos
+
+
+@dataclass
+class JSONMatch:
+    """A JSON object found in text, with its [start, end) character span"""
+    value: Dict[str, Any]
+    start: int
+    end: int
+
+
+def find_json_object(text: str, start: int = 0) -> JSONMatch | None:
+    """
+    Find the first complete, parseable top-level JSON object in text.
+
+    One left-to-right, string-aware pass from the first '{' records the
+    balanced {...} spans that are not nested in another balanced object
+    span. A span that closes with nothing left open is decoded at once, so
+    scanning stops right after a well-formed object. Spans inside a brace
+    that never closes (a stray '{' in prose, or output cut off at
+    max_new_tokens) are decoded in order once the text is exhausted. Each
+    span is decoded at most once and the spans are disjoint, so the whole
+    search is linear in the text length. Invalid spans are skipped whole.
+
+    Args:
+        text: Model output (may contain text before and after the object)
+        start: Offset to start scanning at
+
+    Returns:
+        The first object and its span, or None if there is none
+    """
+    pos = text.find("{", start)
+    if pos == -1:
+        return None
+
+    opened = []  # Offsets of the '{' / '[' not yet closed
+    spans = []   # Balanced object spans (start, end) awaiting decoding, in order
+    in_string = False
+    while True:
+        match = _STRUCTURAL.search(text, pos)
+        if match is None:
+            break
+        i = match.start()
+        ch = text[i]
+        pos = i + 1
+
+        if in_string:
+            if ch == "\\":
+                pos += 1  # Skip the escaped character
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{" or ch == "[":
+            opened.append(i)
+        elif opened:
+            span_start = opened.pop()
+            if ch != "}" or text[span_start] != "{":
+                continue
+            # Drop spans nested in this one: they only count if it doesn't parse, and then it is skipped whole
+            while spans and spans[-1][0] > span_start:
+                spans.pop()
+            if opened:
+                spans.append((span_start, pos))
+                continue
+            found = _decode_object(text, span_start, pos)
+            if found is not None:
+                return found
+
+    for span_start, span_end in spans:
+        found = _decode_object(text, span_start, span_end)
+        if found is not None:
+            return found
+    return None
+
+
+def _decode_object(text: str, start: int, end: int) -> JSONMatch | None:
+    """The object spanning text[start:end], if it is valid JSON"""
+    try:
+        value, value_end = _DECODER.raw_decode(text, start)
+    except (json.JSONDecodeError, RecursionError):
+        return None
+    if value_end != end or not isinstance(value, dict):
+        return None
+    return JSONMatch(value, start, end)
@@ -0,0 +1,127 @@
+"""
+Latency Bench - Robust latency statistics and thread pinning for eval runs.
+
+Single wall-clock samples on a cold process are dominated by first-call and
+allocator overhead. The latency benchmark mode pins the process to a fixed
+set of CPUs and threads, warms the model up, repeats each generation several
+times and summarizes the trials with median and median absolute deviation
+(MAD), which are insensitive to the occasional scheduler hiccup.
+"""
+
+import os
+import platform
+from typing import Dict, List, Any, Iterable
+
+import torch
+
+
+def median(values: Iterable[float]) -> float:
+    """Median of a list of values (0.0 if empty)"""
+    ordered = sorted(values)
+    n = len(ordered)
+    if n == 0:
+        return 0.0
+    mid = n // 2
+    if n % 2:
+        return ordered[mid]
+    return (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def median_absolute_deviation(values: List[float]) -> float:
+    """Median absolute deviation from the median (unscaled)"""
+    center = median(values)
+    return median(abs(v - center) for v in values)
+
+
+def pin_threads(num_threads: int | None = None) -> Dict[str, Any]:
+    """
+    Pin the process to a fixed CPU set and fix torch's thread counts.
+
+    Uses the first num_threads CPUs of the current affinity mask (all of them
+    by default). CPU affinity is only available on Linux; elsewhere only the
+    torch thread counts are fixed.
+
+    Returns:
+        Dict describing the pinning (threads, cpus), for the latency profile
+    """
+    cpus = None
+    if hasattr(os, "sched_getaffinity"):
+        available = sorted(os.sched_getaffinity(0))
+        if num_threads is None:
+            num_threads = len(available)
+        cpus = available[:num_threads]
+        os.sched_setaffinity(0, cpus)
+    elif num_threads is None:
+        num_threads = os.cpu_count() or 1
+
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Can only be set before the first parallel op runs
+        pass
+
+    return {"threads": num_threads, "cpus": cpus}
+
+
+def latency_stats(latencies_ms: List[float]) -> Dict[str, float]:
+    """Median/MAD summary of a list of latencies"""
+    return {
+        "count": len(latencies_ms),
+        "median_ms": median(latencies_ms),
+        "mad_ms": median_absolute_deviation(latencies_ms),
+        "min_ms": min(latencies_ms) if latencies_ms else 0.0,
+        "max_ms": max(latencies_ms) if latencies_ms else 0.0,
+    }
+
+
+def build_latency_profile(
+    model_name: str,
+    examples: List[Dict[str, Any]],
+    config: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Build a machine-readable latency profile from repeated-trial results.
+
+    Args:
+        model_name: Model identifier
+        examples: Dicts with example_id, complexity and latency_trials_ms
+        config: Benchmark settings (warmup, trials, threads, ...)
+
+    Per example, the trials are reduced to their median; tiers report the
+    median and MAD of those per-example medians, plus the median per-example
+    MAD as a measure of trial-to-trial noise.
+    """
+    per_example = {}
+    by_tier: Dict[str, List[Dict[str, float]]] = {}
+    for example in examples:
+        trials = example["latency_trials_ms"]
+        stats = {
+            "complexity": example["complexity"],
+            "trials_ms": trials,
+            "median_ms": median(trials),
+            "mad_ms": median_absolute_deviation(trials),
+        }
+        per_example[example["example_id"]] = stats
+        by_tier.setdefault(example["complexity"], []).append(stats)
+
+    def summarize(group: List[Dict[str, float]]) -> Dict[str, float]:
+        summary = latency_stats([s["median_ms"] for s in group])
+        summary["trial_mad_ms"] = median(s["mad_ms"] for s in group)
+        return summary
+
+    return {
+        "model_name": model_name,
+        "config": {
+            **config,
+            "torch_version": torch.__version__,
+            "platform": platform.platform(),
+        },
+        "overall": summarize(list(per_example.values())),
+        "by_complexity": {
+            tier: summarize(by_tier[tier])
+            for tier in ["simple", "medium", "complex"]
+            if tier in by_tier
+        },
+        "examples": per_example,
+    }
@@ -0,0 +1,205 @@
+"""
+Leaderboard - N-way model comparison from any number of eval result files.
+
+Every run's per-example results are joined on example ID into (models x
+examples) metric matrices, NaN where a model has no result for an example.
+All metrics of all models, overall and per complexity tier and schema, then
+come from one matrix product with a one-hot (examples x groups) membership
+matrix. The leaderboard artifact keeps only those aggregates, stored
+column-wise (one list per metric, in model rank order), plus each run's
+footprint metrics, so reports and figures never reload per-example results.
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from metrics import COMPLEXITY_LEVELS, GROUP_STATS, ResultColumns
+
+LEADERBOARD_VERSION = 1
+
+# Run-level aggregate fields copied into each model's leaderboard entry
+FOOTPRINT_FIELDS = [
+    "track",
+    "quantization",
+    "tokens_per_sec",
+    "decode_tokens_per_sec",
+    "avg_ttft_ms",
+    "p50_latency_ms",
+    "p90_latency_ms",
+    "p99_latency_ms",
+    "ms_per_token",
+    "model_size_mb",
+    "load_time_s",
+]
+
+
+@dataclass
+class ModelRun:
+    """One eval.py results file, loaded as metric columns"""
+    name: str
+    source: str
+    columns: ResultColumns
+    aggregate: Dict[str, Any]
+
+
+def load_run(path: str, name: str | None = None) -> ModelRun:
+    """
+    Load an eval.py results JSON.
+
+    Args:
+        path: Results JSON with individual_results
+        name: Leaderboard name (default: the run's model_name)
+
+    Raises:
+        ValueError: If the file has no per-example results
+    """
+    with open(path, 'r') as f:
+        data = json.load(f)
+
+    if not data.get("individual_results"):
+        raise ValueError(f"{path} has no individual_results to build a leaderboard from")
+
+    aggregate = data.get("aggregate", {})
+    return ModelRun(
+        name=name or aggregate.get("model_name") or Path(path).stem,
+        source=str(path),
+        columns=ResultColumns(data["individual_results"]),
+        aggregate=aggregate
+    )
+
+
+def _example_ids(columns: ResultColumns) -> List[str]:
+    """Example IDs of a run; results without one are joined by position"""
+    return [example_id or f"#{i}" for i, example_id in enumerate(columns.example_id)]
+
+
+def build_leaderboard(
+    runs: List[ModelRun],
+    intersect: bool = False,
+    metadata: Dict[str, Dict] | None = None
+) -> Dict[str, Any]:
+    """
+    Join runs per example ID and aggregate every metric per model and group.
+
+    Args:
+        runs: Loaded runs (names must be unique)
+        intersect: Only score examples every run evaluated
+        metadata: Optional extra fields per model name (e.g. params, type)
+
+    Returns:
+        Leaderboard artifact (see module docstring), models ranked by JSONExact
+    """
+    # Join: one column per distinct example ID, labelled from the first run that has it
+    index: Dict[str, int] = {}
+    complexity: List[str] = []
+    schema: List[str] = []
+    positions = []
+    for run in runs:
+        ids = _example_ids(run.columns)
+        for example_id, level, name in zip(ids, run.columns.complexity, run.columns.schema):
+            if example_id not in index:
+                index[example_id] = len(index)
+                complexity.append(str(level))
+                schema.append(str(name))
+        positions.append(np.fromiter((index[i] for i in ids), dtype=np.int64, count=len(ids)))
+
+    # (stats, models, examples) values, NaN where a model has no result
+    values = np.full((len(GROUP_STATS), len(runs), len(index)), np.nan)
+    for m, run in enumerate(runs):
+        values[:, m, positions[m]] = run.columns._stat_matrix().T
+
+    if intersect:
+        shared = ~np.isnan(values[0]).any(axis=0)
+        values = values[:, :, shared]
+        complexity = [c for c, keep in zip(complexity, shared) if keep]
+        schema = [s for s, keep in zip(schema, shared) if keep]
+
+    # One-hot membership: column 0 is every example, then complexity tiers, then schemas
+    complexity_labels, complexity_inverse = np.unique(np.array(complexity, dtype=str), return_inverse=True)
+    schema_labels, schema_inverse = np.unique(np.array(schema, dtype=str), return_inverse=True)
+    num_examples = values.shape[2]
+    membership = np.zeros((num_examples, 1 + len(complexity_labels) + len(schema_labels)))
+    membership[:, 0] = 1
+    membership[np.arange(num_examples), 1 + complexity_inverse] = 1
+    membership[np.arange(num_examples), 1 + len(complexity_labels) + schema_inverse] = 1
+
+    present = ~np.isnan(values[0])
+    counts = present.astype(float) @ membership                  # (models, groups)
+    sums = np.nan_to_num(values) @ membership                    # (stats, models, groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+
+    # Rank by JSONExact, then field F1 (NaN-safe: models without examples sort last)
+    overall = np.nan_to_num(means[:, :, 0], nan=-1.0)
+    order = np.lexsort((-overall[list(GROUP_STATS).index("avg_field_f1")], -overall[0]))
+
+    def group_stats(g: int) -> Dict[str, List]:
+        stats = {"count": [int(c) for c in counts[order, g]]}
+        for s, name in enumerate(GROUP_STATS):
+            stats[name] = [None if np.isnan(v) else float(v) for v in means[s, order, g]]
+        return stats
+
+    metadata = metadata or {}
+    models = []
+    for m in order:
+        run = runs[m]
+        entry = {"name": run.name, "source": run.source, "examples": len(run.columns)}
+        entry.update({field: run.aggregate[field] for field in FOOTPRINT_FIELDS if field in run.aggregate})
+        entry.update(metadata.get(run.name, {}))
+        models.append(entry)
+
+    level_order = [level for level in COMPLEXITY_LEVELS if level in complexity_labels]
+    level_order += [level for level in complexity_labels if level not in level_order]
+    complexity_column = {level: 1 + i for i, level in enumerate(complexity_labels)}
+
+    return {
+        "version": LEADERBOARD_VERSION,
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "examples": num_examples,
+        "intersect": intersect,
+        "metrics": list(GROUP_STATS),
+        "models": models,
+        "overall": group_stats(0),
+        "by_complexity": {level: group_stats(complexity_column[level]) for level in level_order},
+        "by_schema": {
+            name: group_stats(1 + len(complexity_labels) + i) for i, name in enumerate(schema_labels)
+        }
+    }
+
+
+def write_leaderboard(leaderboard: Dict[str, Any], path: str):
+    """Write a leaderboard artifact (compact JSON)"""
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump(leaderboard, f, separators=(",", ":"))
+
+
+def load_leaderboard(path: str) -> Dict[str, Any]:
+    """Read a leaderboard artifact written by write_leaderboard"""
+    with open(path, 'r') as f:
+        leaderboard = json.load(f)
+    if leaderboard.get("version") != LEADERBOARD_VERSION:
+        raise ValueError(f"{path} is not a version {LEADERBOARD_VERSION} leaderboard")
+    return leaderboard
+
+
+def model_stats(leaderboard: Dict[str, Any], group: Dict[str, List] | None = None) -> Dict[str, Dict[str, Any]]:
+    """
+    One group's column-wise stats as {model name: {stat: value}}.
+
+    Args:
+        leaderboard: Leaderboard artifact
+        group: A group of the artifact (default: overall), e.g.
+            leaderboard["by_complexity"]["simple"]
+    """
+    group = group if group is not None else leaderboard["overall"]
+    return {
+        model["name"]: {stat: values[i] for stat, values in group.items()}
+        for i, model in enumerate(leaderboard["models"])
+    }
@@ -0,0 +1,157 @@
+"""
+Metrics - Columnar EdgeJSON metrics with one-pass group-bys.
+
+Per-example results (EvaluationResult objects, or their dicts from a results
+JSON or JSONL log) are loaded once into NumPy columns. Overall, per-complexity
+and per-schema statistics are then array reductions instead of repeated scans
+of the result list. Also provides nested-field F1, which scores every leaf
+value of the expected JSON (objects and arrays are recursed), unlike the
+top-level FieldF1 which counts a nested object as one all-or-nothing field.
+"""
+
+from typing import Any, Dict, Iterable, Tuple
+
+import numpy as np
+
+
+# Group statistic -> column it averages
+GROUP_STATS = {
+    "json_exact": "json_exact",
+    "avg_field_f1": "field_f1",
+    "avg_nested_field_f1": "nested_field_f1",
+    "schema_compliance": "schema_compliance",
+    "avg_latency_ms": "latency_ms",
+}
+
+# Complexity tiers in report order
+COMPLEXITY_LEVELS = ["simple", "medium", "complex"]
+
+
+def flatten_fields(value: Any, path: str = "") -> Dict[str, Any]:
+    """
+    Map every leaf of a JSON value to its path (e.g. "items[0].price").
+
+    Empty objects and arrays are leaves themselves, so they still count.
+    """
+    if isinstance(value, dict) and value:
+        leaves = {}
+        for key, child in value.items():
+            leaves.update(flatten_fields(child, f"{path}.{key}" if path else str(key)))
+        return leaves
+    if isinstance(value, list) and value:
+        leaves = {}
+        for i, child in enumerate(value):
+            leaves.update(flatten_fields(child, f"{path}[{i}]"))
+        return leaves
+    return {path: value}
+
+
+def nested_field_f1(expected: Dict, predicted: Dict | None) -> Tuple[float, float, float]:
+    """
+    Precision, recall and F1 over leaf fields (path + value match).
+
+    Returns:
+        (precision, recall, f1)
+    """
+    if not isinstance(predicted, dict):
+        return 0.0, 0.0, 0.0
+    if not expected and not predicted:
+        return 1.0, 1.0, 1.0
+
+    expected_leaves = flatten_fields(expected)
+    predicted_leaves = flatten_fields(predicted)
+
+    correct = sum(
+        1 for path, value in expected_leaves.items()
+        if path in predicted_leaves and predicted_leaves[path] == value
+    )
+
+    precision = correct / len(predicted_leaves) if predicted_leaves else 0.0
+    recall = correct / len(expected_leaves) if expected_leaves else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0.0
+    return precision, recall, f1
+
+
+def _field(record: Any, name: str, default: Any = None) -> Any:
+    if isinstance(record, dict):
+        return record.get(name, default)
+    return getattr(record, name, default)
+
+
+class ResultColumns:
+    """
+    Per-example results as NumPy columns (row i is example i).
+
+    Records missing nested_field_f1 (written before it existed) get it
+    recomputed from their expected and parsed outputs.
+    """
+
+    def __init__(self, records: Iterable[Any]):
+        records = list(records)
+
+        def column(name: str, dtype, default: Any = 0) -> np.ndarray:
+            return np.array([_field(r, name, default) or default for r in records], dtype=dtype)
+
+        self.example_id = column("example_id", object, "")
+        self.schema = np.array(
+            [_field(r, "schema_name") or _field(r, "schema_id") or "unknown" for r in records], dtype=object
+        )
+        self.complexity = column("complexity", object, "unknown")
+        self.json_exact = column("json_exact", bool, False)
+        self.field_f1 = column("field_f1", float)
+        self.schema_compliance = column("schema_compliance", bool, False)
+        self.latency_ms = column("latency_ms", float)
+        self.ttft_ms = column("ttft_ms", float)
+        self.decode_tokens_per_sec = column("decode_tokens_per_sec", float)
+        self.prompt_tokens = column("prompt_tokens", np.int64)
+        self.generated_tokens = column("generated_tokens", np.int64)
+        self.tokens_saved = column("tokens_saved", np.int64)
+        self.nested_field_f1 = np.array([
+            nested if (nested := _field(r, "nested_field_f1")) is not None
+            else nested_field_f1(_field(r, "expected_output") or {}, _field(r, "model_output_parsed"))[2]
+            for r in records
+        ], dtype=float)
+
+    def __len__(self) -> int:
+        return len(self.json_exact)
+
+    def _stat_matrix(self) -> np.ndarray:
+        """Columns averaged by GROUP_STATS, stacked as an (examples x stats) matrix"""
+        return np.column_stack([getattr(self, column).astype(float) for column in GROUP_STATS.values()])
+
+    def summary(self) -> Dict[str, float]:
+        """GROUP_STATS averaged over every example"""
+        means = self._stat_matrix().mean(axis=0) if len(self) else np.zeros(len(GROUP_STATS))
+        return {"count": len(self), **{name: float(v) for name, v in zip(GROUP_STATS, means)}}
+
+    def group_by(self, key: str) -> Dict[str, Dict[str, float]]:
+        """
+        GROUP_STATS per distinct value of a key column ("complexity" or "schema").
+
+        Every statistic of every group is accumulated in one scatter-add over
+        the stacked stat matrix.
+        """
+        if not len(self):
+            return {}
+        labels, inverse = np.unique(getattr(self, key).astype(str), return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(labels))
+        sums = np.zeros((len(labels), len(GROUP_STATS)))
+        np.add.at(sums, inverse, self._stat_matrix())
+        means = sums / counts[:, None]
+
+        return {
+            label: {"count": int(counts[i]), **{name: float(v) for name, v in zip(GROUP_STATS, means[i])}}
+            for i, label in enumerate(labels)
+        }
+
+    def by_complexity(self) -> Dict[str, Dict[str, float]]:
+        """group_by("complexity") restricted to the known tiers, in tier order"""
+        groups = self.group_by("complexity")
+        return {level: groups[level] for level in COMPLEXITY_LEVELS if level in groups}
+
+    def decode_tokens_per_sec_overall(self) -> float:
+        """Per-sequence decode rate: decode tokens over the time each sequence spent decoding"""
+        decoding = self.decode_tokens_per_sec > 0
+        decode_tokens = (self.generated_tokens[decoding] - 1).astype(float)
+        decode_seconds = (decode_tokens / self.decode_tokens_per_sec[decoding]).sum()
+        return float(decode_tokens.sum() / decode_seconds) if decode_seconds > 0 else 0.0
@@ -0,0 +1,186 @@
+"""
+Model Cache - Content-addressed on-disk cache for derived model artifacts.
+
+Exported or merged models are expensive to produce, so they are stored under
+a cache directory keyed by content hashes of the base model and adapter
+files (or the commit SHA of a hub model). A changed checkpoint (even under
+the same path or hub name) gets a new key; an unchanged one is reused
+across runs without re-reading its weights.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+
+# Root of all cached artifacts (override with SLMBENCH_CACHE)
+DEFAULT_CACHE_DIR = Path(os.environ.get("SLMBENCH_CACHE", Path.home() / ".cache" / "slmbench"))
+
+# Files that define a model or adapter (weights, config, tokenizer)
+HASHED_SUFFIXES = {".safetensors", ".bin", ".json", ".model", ".txt"}
+
+
+def _hub_revision(name: str) -> str:
+    """Commit SHA of a hub model: from the hub, or the newest local snapshot when offline"""
+    from huggingface_hub import HfApi, snapshot_download
+    try:
+        return HfApi().model_info(name).sha
+    except Exception:
+        # Snapshot directories are named after their commit
+        return Path(snapshot_download(name, local_files_only=True)).name
+
+
+def _hashed_files(model_dir: Path) -> Iterable[Path]:
+    return sorted(
+        p for p in model_dir.rglob("*")
+        if p.is_file() and p.suffix in HASHED_SUFFIXES
+    )
+
+
+# Per-file SHA-256 digests, keyed by resolved path and valid while size and mtime match
+_FILE_DIGESTS_NAME = "file_digests.json"
+_FILE_DIGESTS: Dict[str, Dict] | None = None
+
+
+def _file_digests() -> Dict[str, Dict]:
+    global _FILE_DIGESTS
+    if _FILE_DIGESTS is None:
+        try:
+            with open(DEFAULT_CACHE_DIR / _FILE_DIGESTS_NAME, "r") as f:
+                _FILE_DIGESTS = json.load(f)
+        except (OSError, ValueError):
+            _FILE_DIGESTS = {}
+    return _FILE_DIGESTS
+
+
+def _save_file_digests():
+    digests_path = DEFAULT_CACHE_DIR / _FILE_DIGESTS_NAME
+    digests_path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = digests_path.with_name(f"{_FILE_DIGESTS_NAME}.{os.getpid()}.partial")
+    with open(partial_path, "w") as f:
+        json.dump(_file_digests(), f)
+    os.replace(partial_path, digests_path)
+
+
+def file_digest(path: Path) -> Tuple[str, bool]:
+    """
+    SHA-256 of a file's bytes, memoized on (path, size, mtime).
+
+    Returns:
+        (hex digest, whether the file had to be read)
+    """
+    stat = path.stat()
+    key = str(path.resolve())
+    entry = _file_digests().get(key)
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry["sha256"], False
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    _file_digests()[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+    return digest.hexdigest(), True
+
+
+def content_hash(name_or_path: str) -> str:
+    """
+    Content hash of a model or adapter.
+
+    Local directories: SHA-256 over the relative paths and byte digests of
+    the defining files (each file is only re-read when its size or mtime
+    changes). Hub names: the commit SHA, so nothing is downloaded or read.
+    """
+    path = Path(name_or_path)
+    if not path.is_dir():
+        return hashlib.sha256(f"{name_or_path}@{_hub_revision(name_or_path)}".encode()).hexdigest()
+
+    digest = hashlib.sha256()
+    changed = False
+    for file in _hashed_files(path):
+        file_sha, was_read = file_digest(file)
+        changed |= was_read
+        digest.update(str(file.relative_to(path)).encode())
+        digest.update(file_sha.encode())
+    if changed:
+        _save_file_digests()
+    return digest.hexdigest()
+
+
+def cache_key(model_name: str, adapter: str | None = None) -> str:
+    """Cache key for artifacts derived from a base model and optional adapter"""
+    key = content_hash(model_name)[:16]
+    if adapter:
+        key += "-" + content_hash(adapter)[:16]
+    return key
+
+
+def cache_path(kind: str, model_name: str, adapter: str | None = None, cache_dir: Path | None = None) -> Path:
+    """
+    Directory for one kind of cached artifact (e.g. "onnx") of a model/adapter pair.
+
+    The directory name starts with the model's basename for readability,
+    followed by the content-hash key.
+    """
+    root = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+    name = Path(model_name.rstrip("/")).name
+    return root / kind / f"{name}-{cache_key(model_name, adapter)}"
+
+
+def staging_dir(target_dir: Path) -> Path:
+    """Per-process directory to write a cache entry into before publishing it"""
+    return target_dir.with_name(f"{target_dir.name}.{os.getpid()}.partial")
+
+
+def publish_dir(staged_dir: Path, target_dir: Path):
+    """
+    Move a staged cache entry into place.
+
+    Concurrent writers of the same entry each stage their own copy; if
+    another process published first, its copy is kept and ours discarded.
+    """
+    try:
+        staged_dir.rename(target_dir)
+    except OSError:
+        if not target_dir.exists():
+            raise
+        shutil.rmtree(staged_dir, ignore_errors=True)
+
+
+def merged_checkpoint(model_name: str, adapter: str, cache_dir: Path | None = None) -> Path:
+    """
+    Merge a LoRA adapter into its base model once and cache the result.
+
+    The merged model is saved as a plain (safetensors) checkpoint together
+    with the base tokenizer, so later runs load it with from_pretrained and
+    pay no per-forward LoRA overhead. Merging happens in float32.
+
+    Returns:
+        Directory of the merged checkpoint
+    """
+    merged_dir = cache_path("merged", model_name, adapter, cache_dir)
+    if (merged_dir / "config.json").exists():
+        print(f"✓ Using cached merged model: {merged_dir}")
+        return merged_dir
+
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+    from peft import PeftModel
+
+    print(f"Merging LoRA adapter into base weights: {merged_dir}")
+    model = AutoModelForCausalLM.from_pretrained(model_name, torch_dtype=torch.float32)
+    model = PeftModel.from_pretrained(model, adapter).merge_and_unload()
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+    # Write next to the final location, then move into place atomically
+    partial_dir = staging_dir(merged_dir)
+    shutil.rmtree(partial_dir, ignore_errors=True)
+    model.save_pretrained(partial_dir, safe_serialization=True)
+    tokenizer.save_pretrained(partial_dir)
+    publish_dir(partial_dir, merged_dir)
+
+    print("✓ Merged model cached")
+    return merged_dir
@@ -0,0 +1,116 @@
+"""
+Model Loader - Shared fast model-loading path for EdgeJSON scripts.
+
+One loader for eval.py, interactive_test.py and test_mlm_135m_json.py:
+safetensors weights are memory-mapped rather than read and copied, and
+low_cpu_mem_usage skips the random initialization of weights that are
+about to be overwritten by the checkpoint. Backend (PyTorch / ONNX Runtime),
+quantization and adapter handling are dispatched here as well.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import torch
+from transformers import AutoModelForCausalLM, AutoTokenizer
+from peft import PeftModel
+
+from model_cache import merged_checkpoint
+from onnx_backend import load_onnx_model
+from quantization import load_int4, quantize_int8_dynamic
+
+
+def weight_loading_kwargs(model_name: str) -> Dict[str, Any]:
+    """
+    from_pretrained kwargs for the fast load path.
+
+    Local checkpoints that ship safetensors are forced onto them (mmap'd,
+    no pickle); otherwise transformers picks safetensors when available.
+    """
+    kwargs = {"low_cpu_mem_usage": True}
+    path = Path(model_name)
+    if path.is_dir() and any(path.glob("*.safetensors")):
+        kwargs["use_safetensors"] = True
+    return kwargs
+
+
+def load_tokenizer(model_name: str):
+    """Load the tokenizer for a model"""
+    return AutoTokenizer.from_pretrained(model_name)
+
+
+def load_causal_lm(model_name: str, dtype: torch.dtype | None = None, device_map: str | None = None):
+    """Load causal LM weights through the fast path (mmap'd safetensors, no random init)"""
+    return AutoModelForCausalLM.from_pretrained(
+        model_name,
+        torch_dtype=dtype,
+        device_map=device_map,
+        **weight_loading_kwargs(model_name)
+    )
+
+
+def load_model(
+    model_name: str,
+    adapter: str | None = None,
+    device: str = "cpu",
+    backend: str = "pytorch",
+    num_threads: int | None = None,
+    quantize: str | None = None,
+    dtype: torch.dtype | None = None,
+    merge_adapter: bool = False
+) -> Tuple[Any, Any]:
+    """
+    Load tokenizer and model (optionally with a LoRA adapter) ready for inference.
+
+    The onnxruntime backend runs on CPU from a cached ONNX export with the
+    adapter merged in; num_threads sets its intra-op thread count.
+    Quantized models (see quantization.QUANTIZATION_MODES) have the adapter
+    merged first and run on CPU. With merge_adapter, the adapter is loaded
+    from a cached merged checkpoint instead of being applied at runtime.
+
+    Returns:
+        (model, tokenizer)
+    """
+    print(f"Loading model: {model_name}")
+    if adapter:
+        print(f"Loading LoRA adapter: {adapter}")
+    print(f"Device: {device}")
+
+    if backend == "onnxruntime":
+        if device != "cpu":
+            print("Note: onnxruntime backend runs on CPU")
+        print("Backend: onnxruntime")
+        return load_onnx_model(model_name, adapter, num_threads=num_threads)
+
+    if merge_adapter and adapter:
+        model_name, adapter = str(merged_checkpoint(model_name, adapter)), None
+
+    # Load model and tokenizer
+    tokenizer = load_tokenizer(model_name)
+
+    if quantize == "int4":
+        print("Loading 4-bit NF4 weights (adapter merged first)...")
+        model = load_int4(model_name, adapter)
+        model.eval()
+        return model, tokenizer
+
+    model = load_causal_lm(model_name, dtype)
+
+    # Load LoRA adapter if specified
+    if adapter:
+        print("Applying LoRA adapter...")
+        model = PeftModel.from_pretrained(model, adapter)
+        print("✓ LoRA adapter loaded successfully")
+
+    if device == "cuda" and torch.cuda.is_available() and not quantize:
+        model = model.to("cuda")
+    else:
+        model = model.to("cpu")
+
+    if quantize == "int8-dynamic":
+        print("Quantizing linear layers to int8 (dynamic)...")
+        model = quantize_int8_dynamic(model)
+
+    model.eval()
+
+    return model, tokenizer
@@ -0,0 +1,104 @@
+"""
+ONNX Backend - ONNX Runtime inference for EdgeJSON evaluation on CPU.
+
+Exports the base model (with any LoRA adapter merged into its weights) to an
+ONNX graph with past-key-value inputs, caches the export on disk keyed by
+model and adapter content hashes, and loads it as an ONNX Runtime session
+that supports the same greedy generate() call as the PyTorch backend.
+
+Requires the optional `optimum[onnxruntime]` package.
+"""
+
+import shutil
+from pathlib import Path
+from typing import Tuple
+
+from model_cache import cache_path, merged_checkpoint, publish_dir, staging_dir
+
+try:
+    from optimum.onnxruntime import ORTModelForCausalLM
+except ImportError:
+    ORTModelForCausalLM = None
+
+
+def _require_optimum():
+    if ORTModelForCausalLM is None:
+        raise ImportError(
+            "ONNX Runtime backend requires optimum. Run: pip install 'optimum[onnxruntime]'"
+        )
+
+
+def export_onnx(model_name: str, adapter: str | None = None, cache_dir: Path | None = None) -> Path:
+    """
+    Export a model (with merged adapter) to ONNX, reusing a cached export.
+
+    Args:
+        model_name: Hugging Face model name or path
+        adapter: Optional LoRA adapter path, merged (and cached) before export
+        cache_dir: Cache root (default: model_cache.DEFAULT_CACHE_DIR)
+
+    Returns:
+        Directory containing the ONNX graph, config and tokenizer
+    """
+    _require_optimum()
+    from transformers import AutoTokenizer
+
+    export_dir = cache_path("onnx", model_name, adapter, cache_dir)
+    if (export_dir / "model.onnx").exists():
+        print(f"✓ Using cached ONNX export: {export_dir}")
+        return export_dir
+
+    print(f"Exporting to ONNX (with past key values): {export_dir}")
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+    source = str(merged_checkpoint(model_name, adapter, cache_dir)) if adapter else model_name
+
+    # Export next to the final location, then move into place atomically
+    partial_dir = staging_dir(export_dir)
+    shutil.rmtree(partial_dir, ignore_errors=True)
+    ort_model = ORTModelForCausalLM.from_pretrained(source, export=True, use_cache=True)
+    ort_model.save_pretrained(partial_dir)
+    tokenizer.save_pretrained(partial_dir)
+    publish_dir(partial_dir, export_dir)
+
+    print("✓ ONNX export cached")
+    return export_dir
+
+
+def load_onnx_model(
+    model_name: str,
+    adapter: str | None = None,
+    cache_dir: Path | None = None,
+    num_threads: int | None = None
+) -> Tuple["ORTModelForCausalLM", object]:
+    """
+    Load (exporting if needed) an ONNX Runtime model and its tokenizer.
+
+    Args:
+        model_name: Hugging Face model name or path
+        adapter: Optional LoRA adapter path
+        cache_dir: Cache root for exports
+        num_threads: ORT intra-op threads (default: ORT's choice)
+
+    Returns:
+        (model, tokenizer)
+    """
+    _require_optimum()
+    import onnxruntime
+    from transformers import AutoTokenizer
+
+    export_dir = export_onnx(model_name, adapter, cache_dir)
+
+    session_options = onnxruntime.SessionOptions()
+    session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if num_threads:
+        session_options.intra_op_num_threads = num_threads
+
+    model = ORTModelForCausalLM.from_pretrained(
+        export_dir,
+        use_cache=True,
+        provider="CPUExecutionProvider",
+        session_options=session_options
+    )
+    tokenizer = AutoTokenizer.from_pretrained(export_dir)
+    return model, tokenizer
@@ -0,0 +1,165 @@
+"""
+Placeholder Scanner - Detect placeholder tokens in prompts and outputs.
+
+The banned-token list (placeholders.txt by default, extensible at runtime
+or from extra files) is compiled into one automaton: a prefix trie of all
+words, rendered as a single case-insensitive regex and run by the C regex
+engine. A scan is one pass over the text whose cost barely grows with the
+list, unlike an alternation of words, which tries every word at every
+position. Words match as whole tokens: not preceded or followed by a word
+character (the same as the former \\b...\\b regex for words that start and
+end with word characters).
+
+Every match reports which list entry fired.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+DEFAULT_PLACEHOLDERS_PATH = Path(__file__).parent / "placeholders.txt"
+
+
+@dataclass
+class PlaceholderMatch:
+    """A placeholder found in a string."""
+    pattern: str  # List entry that fired
+    text: str     # Matched text as written
+    start: int    # Offset in the scanned string
+
+
+def load_words(path: Union[str, Path]) -> List[str]:
+    """Words from a list file: one per line, '#' comments, blank lines ignored."""
+    words = []
+    with open(path, 'r') as f:
+        for line in f:
+            word = line.split("#", 1)[0].strip()
+            if word:
+                words.append(word)
+    return words
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex source for a prefix trie of words (shared prefixes matched once)."""
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True  # End of word
+
+    def emit(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if "" in node:
+            return "(?:" + "|".join(branches) + ")?"
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return emit(trie)
+
+
+class PlaceholderScanner:
+    """
+    Compiled placeholder word list.
+
+    Adding words recompiles the automaton on the next scan.
+    """
+
+    def __init__(self, words: Optional[Iterable[str]] = None):
+        """
+        Initialize placeholder scanner.
+
+        Args:
+            words: Placeholder words (default: the words in placeholders.txt)
+        """
+        self._words: Dict[str, str] = {}  # Lowercased word -> word as listed
+        self._regex: Optional[re.Pattern] = None
+        self.add(*(load_words(DEFAULT_PLACEHOLDERS_PATH) if words is None else words))
+
+    @classmethod
+    def from_files(cls, *paths: Union[str, Path], include_defaults: bool = True) -> "PlaceholderScanner":
+        """Scanner for the default list (optionally) plus the words in each file."""
+        scanner = cls() if include_defaults else cls(words=[])
+        for path in paths:
+            scanner.add(*load_words(path))
+        return scanner
+
+    def add(self, *words: str):
+        """Add words to the list (case-insensitive duplicates are ignored)."""
+        for word in words:
+            if not word:
+                raise ValueError("Empty placeholder word")
+            if word.lower() not in self._words:
+                self._words[word.lower()] = word
+                self._regex = None
+
+    @property
+    def words(self) -> List[str]:
+        return list(self._words.values())
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    @property
+    def regex(self) -> re.Pattern:
+        """The compiled automaton."""
+        if self._regex is None:
+            if self._words:
+                source = r"(?<!\w)(?:" + _trie_pattern(self._words) + r")(?!\w)"
+            else:
+                source = r"(?!)"  # Matches nothing
+            self._regex = re.compile(source, re.IGNORECASE)
+        return self._regex
+
+    def search(self, text: str) -> Optional[PlaceholderMatch]:
+        """First placeholder in text, if any."""
+        match = self.regex.search(text)
+        if match is None:
+            return None
+        found = match.group()
+        return PlaceholderMatch(
+            pattern=self._words.get(found.lower(), found),
+            text=found,
+            start=match.start()
+        )
+
+    def search_object(self, obj: Any) -> Optional[PlaceholderMatch]:
+        """First placeholder in the keys or string values of a parsed JSON object."""
+        stack = [obj]
+        while stack:
+            d = stack.pop()
+            if isinstance(d, dict):
+                for key, value in d.items():
+                    match = self.search(key)
+                    if match is not None:
+                        return match
+                    stack.append(value)
+            elif isinstance(d, list):
+                stack.extend(d)
+            elif isinstance(d, str):
+                match = self.search(d)
+                if match is not None:
+                    return match
+        return None
+
+
+if __name__ == "__main__":
+    scanner = PlaceholderScanner()
+    print(f"{len(scanner)} placeholder words: {scanner.words}")
+    print(f"Automaton: {scanner.regex.pattern}\n")
+
+    for text in [
+        "Contact John Doe at john.doe@example.com",
+        "Order sample_ for customer",
+        "Sample_size is fine, foobar is fine",
+        "Lorem Ipsum dolor sit amet",
+        "No placeholders here",
+    ]:
+        print(f"{text!r:50} -> {scanner.search(text)}")
+
+    scanner.add("TBD", "n/a")
+    print(f"\nAfter adding TBD, n/a: {scanner.search('Delivery date: tbd')}, {scanner.search('Phone: N/A')}")
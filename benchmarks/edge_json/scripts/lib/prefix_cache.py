@@ -0,0 +1,79 @@
+"""
+Prefix Cache - Reuse the KV cache of the constant EdgeJSON instruction preamble.
+
+Every EdgeJSON prompt starts with the same instruction text. Its key/value
+cache is computed once per model; each generation then continues from a copy
+of that cache, so only the example-specific tokens are prefilled.
+"""
+
+import copy
+from typing import Dict, Any, List
+
+import torch
+
+
+# Instruction preamble shared by every EdgeJSON prompt (matches training format)
+PROMPT_PREFIX = "Extract the structured JSON data from the following text.\n\nInput: "
+
+
+def format_prompt(text: str) -> str:
+    """Format input text as an EdgeJSON extraction prompt."""
+    return f"{PROMPT_PREFIX}{text}\n\nOutput:"
+
+
+class PrefixCache:
+    """
+    Precomputed KV cache for the constant prompt preamble of one model.
+
+    The cached token IDs are those of the preamble without its trailing
+    space, which tokenizes identically at the start of every full prompt
+    (the space is merged into the first input word). Prompts whose token IDs
+    do not start with the cached IDs fall back to a full prefill.
+    """
+
+    def __init__(self, model, tokenizer, prefix: str = PROMPT_PREFIX):
+        """
+        Initialize prefix cache.
+
+        Args:
+            model: Causal LM (or PeftModel) to compute the cache with
+            tokenizer: Tokenizer matching the model
+            prefix: Constant text every prompt starts with
+        """
+        self.prefix_ids: List[int] = tokenizer(prefix.rstrip())["input_ids"]
+        self.hits = 0
+        self.misses = 0
+
+        device = next(model.parameters()).device
+        input_ids = torch.tensor([self.prefix_ids], device=device)
+        with torch.no_grad():
+            outputs = model(input_ids=input_ids, use_cache=True)
+        self.cache = outputs.past_key_values
+
+    def __len__(self) -> int:
+        return len(self.prefix_ids)
+
+    def matches(self, input_ids: torch.Tensor) -> bool:
+        """Check whether a single tokenized prompt starts with the cached prefix."""
+        n = len(self.prefix_ids)
+        return (
+            input_ids.shape[0] == 1
+            and input_ids.shape[1] > n
+            and input_ids[0, :n].tolist() == self.prefix_ids
+        )
+
+    def generate_kwargs(self, input_ids: torch.Tensor) -> Dict[str, Any]:
+        """
+        Extra model.generate kwargs that continue from the cached prefix.
+
+        Pass the full prompt input_ids to generate as usual; generate only
+        prefills the tokens after the cached prefix. Returns {} (full prefill)
+        when the prompt does not start with the prefix.
+        """
+        if not self.matches(input_ids):
+            self.misses += 1
+            return {}
+
+        self.hits += 1
+        # generate extends the cache in place, so each call gets its own copy
+        return {"past_key_values": copy.deepcopy(self.cache)}
@@ -2,30 +2,102 @@
 Quality Validator - Multi-level validation for generated JSON examples.
 
 Validates schema compliance, data realism, and semantic alignment.
+
+Compiled schema validators live in a process-wide registry keyed by schema
+ID and content hash, so each schema is compiled once no matter how many
+QualityValidator instances are built for it. Optionally a schema is also
+compiled to specialized Python code (schema_codegen.py).
+
+validate_many validates large candidate pools across a process pool and
+returns ValidationStats per schema.
 """
 
 import json
+import os
 import re
-from typing import Dict, Any, Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Any, Iterable, List, Tuple, Optional
 from jsonschema import Draft7Validator
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+from placeholder_scanner import PlaceholderMatch, PlaceholderScanner
+from schema_codegen import compile_validator
+from schema_loader import schema_hash
 
-# Regex patterns for validation
-PLACEHOLDER_RE = re.compile(
-    r"\b(sample_|test_|foo|bar|lorem ipsum|placeholder|example\.com|xxx|yyy|zzz)\b",
-    re.IGNORECASE
-)
+
+# Regex patterns for validation (placeholders: placeholder_scanner.py)
 EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 PHONE_RE = re.compile(r"^[+]?[0-9\-\s()]{7,}$")
 
 
+@dataclass
+class CompiledSchema:
+    """A schema compiled once for the registry."""
+    draft7: Draft7Validator
+    generated: Optional[Callable[[Any], bool]] = None  # Codegen validator, if requested and supported
+
+    def is_valid(self, obj: Any) -> bool:
+        if self.generated is not None:
+            return self.generated(obj)
+        return self.draft7.is_valid(obj)
+
+
+# Process-wide registry: (schema ID, schema hash, codegen) -> compiled schema
+_COMPILED_SCHEMAS: Dict[Tuple[Optional[str], str, bool], CompiledSchema] = {}
+
+
+def get_compiled_schema(schema: Dict[str, Any], schema_id: Optional[str] = None, codegen: bool = False) -> CompiledSchema:
+    """
+    Compiled validator for a schema, built on first use and cached per process.
+
+    Args:
+        schema: JSON schema
+        schema_id: Schema ID (part of the key, for readable registry entries)
+        codegen: Also generate a specialized Python validator (falls back to
+            jsonschema if the schema uses unsupported keywords)
+    """
+    key = (schema_id, schema_hash(schema), codegen)
+    compiled = _COMPILED_SCHEMAS.get(key)
+    if compiled is None:
+        compiled = CompiledSchema(
+            draft7=Draft7Validator(schema),
+            generated=compile_validator(schema) if codegen else None
+        )
+        _COMPILED_SCHEMAS[key] = compiled
+    return compiled
+
+
+def compiled_schema_count() -> int:
+    """Number of schemas compiled by this process."""
+    return len(_COMPILED_SCHEMAS)
+
+
+_DEFAULT_PLACEHOLDERS: Optional[PlaceholderScanner] = None
+
+
+def default_placeholders() -> PlaceholderScanner:
+    """Scanner for the default placeholder list, compiled once per process."""
+    global _DEFAULT_PLACEHOLDERS
+    if _DEFAULT_PLACEHOLDERS is None:
+        _DEFAULT_PLACEHOLDERS = PlaceholderScanner()
+    return _DEFAULT_PLACEHOLDERS
+
+
+@dataclass
+class ObjectScan:
+    """What one walk over a parsed output found (see QualityValidator._scan_object)."""
+    placeholder: Optional[PlaceholderMatch] = None
+    contact_ok: bool = True
+    alignment_values: List[str] = field(default_factory=list)
+
+
 @dataclass
 class ValidationResult:
     """Result of validating a (prompt, output) pair."""
     valid: bool
     reason: str
     parsed_json: Optional[Dict[str, Any]] = None
+    placeholder: Optional[str] = None  # Placeholder word that fired (reason "placeholders_detected")
 
 
 class QualityValidator:
@@ -40,17 +112,29 @@ class QualityValidator:
     5. Semantic alignment (prompt ↔ output)
     """
 
-    def __init__(self, schema: Dict[str, Any], alignment_threshold: float = 0.3):
+    def __init__(
+        self,
+        schema: Dict[str, Any],
+        alignment_threshold: float = 0.3,
+        schema_id: Optional[str] = None,
+        codegen: bool = False,
+        placeholders: Optional[PlaceholderScanner] = None
+    ):
         """
         Initialize quality validator.
 
         Args:
             schema: JSON schema to validate against
             alignment_threshold: Minimum ratio of JSON values that should appear in prompt
+            schema_id: Schema ID, used with the schema's content hash as the registry key
+            codegen: Validate with generated Python code instead of jsonschema
+            placeholders: Placeholder word list (default: placeholders.txt)
         """
         self.schema = schema
-        self.validator = Draft7Validator(schema)
+        self.compiled = get_compiled_schema(schema, schema_id, codegen)
+        self.validator = self.compiled.draft7
         self.alignment_threshold = alignment_threshold
+        self.placeholders = placeholders if placeholders is not None else default_placeholders()
 
     def validate_pair(self, prompt: str, output_text: str) -> ValidationResult:
         """
@@ -82,16 +166,28 @@ class QualityValidator:
                 parsed_json=None
             )
 
-        # Level 3: Placeholder detection
-        if self._has_placeholders(prompt) or self._has_placeholders(json.dumps(obj)):
+        # Level 3: Placeholder detection (prompt first; the output's keys and
+        # strings are scanned by the same single walk that serves levels 4-5)
+        placeholder = self.placeholders.search(prompt)
+        if placeholder is not None:
             return ValidationResult(
                 valid=False,
                 reason="placeholders_detected",
-                parsed_json=None
+                parsed_json=None,
+                placeholder=placeholder.pattern
+            )
+
+        scan = self._scan_object(obj)
+        if scan.placeholder is not None:
+            return ValidationResult(
+                valid=False,
+                reason="placeholders_detected",
+                parsed_json=None,
+                placeholder=scan.placeholder.pattern
             )
 
         # Level 4: Contact field validation
-        if not self._check_contact_fields(obj):
+        if not scan.contact_ok:
             return ValidationResult(
                 valid=False,
                 reason="invalid_contact_format",
@@ -99,7 +195,7 @@ class QualityValidator:
             )
 
         # Level 5: Semantic alignment
-        if not self._check_semantic_alignment(prompt, obj):
+        if not self._alignment_ok(prompt, scan.alignment_values):
             return ValidationResult(
                 valid=False,
                 reason="weak_semantic_alignment",
@@ -131,42 +227,61 @@ class QualityValidator:
 
     def _validate_schema(self, obj: Dict[str, Any]) -> bool:
         """Validate object against JSON schema."""
-        errors = list(self.validator.iter_errors(obj))
-        return len(errors) == 0
+        return self.compiled.is_valid(obj)
 
     def _has_placeholders(self, text: str) -> bool:
         """Check if text contains obvious placeholder values."""
-        return bool(PLACEHOLDER_RE.search(text))
+        return self.placeholders.search(text) is not None
 
-    def _check_contact_fields(self, obj: Dict[str, Any]) -> bool:
+    def _scan_object(self, obj: Any) -> "ObjectScan":
         """
-        Validate that email and phone fields have realistic formats.
+        Levels 3-5 data in one walk over the parsed output.
 
-        Returns False if any email or phone field has invalid format.
+        Keys and string values are checked for placeholders in place (the walk
+        stops at the first hit), email/phone/tel string fields are checked for
+        a realistic format, and lowercased string values longer than 2
+        characters are collected for the semantic alignment check.
         """
-        def walk(d: Any) -> bool:
+        scan = ObjectScan()
+        search = self.placeholders.search
+        stack = [obj]
+
+        while stack:
+            d = stack.pop()
             if isinstance(d, dict):
                 for key, value in d.items():
+                    scan.placeholder = search(key)
+                    if scan.placeholder is not None:
+                        return scan
                     if isinstance(value, str):
-                        key_lower = key.lower()
-                        # Check email format
-                        if "email" in key_lower and value:
-                            if not EMAIL_RE.match(value):
-                                return False
-                        # Check phone format
-                        if ("phone" in key_lower or "tel" in key_lower) and value:
-                            if not PHONE_RE.match(value):
-                                return False
-                    # Recurse into nested structures
-                    if not walk(value):
-                        return False
+                        if scan.contact_ok and value:
+                            key_lower = key.lower()
+                            # Check email format
+                            if "email" in key_lower and not EMAIL_RE.match(value):
+                                scan.contact_ok = False
+                            # Check phone format
+                            if ("phone" in key_lower or "tel" in key_lower) and not PHONE_RE.match(value):
+                                scan.contact_ok = False
+                    stack.append(value)
             elif isinstance(d, list):
-                for item in d:
-                    if not walk(item):
-                        return False
-            return True
+                stack.extend(d)
+            elif isinstance(d, str):
+                scan.placeholder = search(d)
+                if scan.placeholder is not None:
+                    return scan
+                # Only check meaningful strings (length > 2)
+                if len(d) > 2:
+                    scan.alignment_values.append(d.lower())
 
-        return walk(obj)
+        return scan
+
+    def _check_contact_fields(self, obj: Dict[str, Any]) -> bool:
+        """
+        Validate that email and phone fields have realistic formats.
+
+        Returns False if any email or phone field has invalid format.
+        """
+        return self._scan_object(obj).contact_ok
 
     def _check_semantic_alignment(self, prompt: str, obj: Dict[str, Any]) -> bool:
         """
@@ -175,34 +290,19 @@ class QualityValidator:
         Heuristic: At least X% of string values in the JSON should appear
         somewhere in the prompt text (case-insensitive).
         """
-        hits = 0
-        total = 0
-        prompt_lower = prompt.lower()
-
-        def collect_strings(d: Any):
-            nonlocal hits, total
-            if isinstance(d, dict):
-                for value in d.values():
-                    collect_strings(value)
-            elif isinstance(d, list):
-                for item in d:
-                    collect_strings(item)
-            elif isinstance(d, str):
-                # Only check meaningful strings (length > 2)
-                if len(d) > 2:
-                    total += 1
-                    # Check if this value appears in the prompt
-                    if d.lower() in prompt_lower:
-                        hits += 1
-
-        collect_strings(obj)
+        return self._alignment_ok(prompt, self._scan_object(obj).alignment_values)
 
+    def _alignment_ok(self, prompt: str, values: List[str]) -> bool:
+        """Alignment check on the lowercased string values collected by _scan_object."""
         # If no strings to check, consider it valid
-        if total == 0:
+        if not values:
             return True
 
+        prompt_lower = prompt.lower()
+        hits = sum(1 for value in values if value in prompt_lower)
+
         # Require at least alignment_threshold ratio of strings to match
-        alignment_ratio = hits / total
+        alignment_ratio = hits / len(values)
         return alignment_ratio >= self.alignment_threshold
 
 
@@ -241,6 +341,98 @@ class ValidationStats:
         )
 
 
+@dataclass
+class BatchValidation:
+    """Result of validate_many: one result per input triple, in input order."""
+    results: List[ValidationResult]
+    stats: Dict[str, ValidationStats]  # Schema ID -> stats
+
+
+# Per-process state for validate_many workers (set by _init_batch_worker)
+_BATCH_SCHEMAS: Dict[str, Dict[str, Any]] = {}
+_BATCH_OPTIONS: Dict[str, Any] = {}
+_BATCH_VALIDATORS: Dict[str, QualityValidator] = {}
+
+
+def _init_batch_worker(
+    schemas: Dict[str, Dict[str, Any]],
+    alignment_threshold: float,
+    codegen: bool,
+    placeholders: Optional[PlaceholderScanner]
+):
+    _BATCH_SCHEMAS.clear()
+    _BATCH_SCHEMAS.update(schemas)
+    _BATCH_OPTIONS.update(alignment_threshold=alignment_threshold, codegen=codegen, placeholders=placeholders)
+    _BATCH_VALIDATORS.clear()
+
+
+def _validate_batch(items: List[Tuple[str, str, str]]) -> List[ValidationResult]:
+    """Validate (schema_id, prompt, output) triples with this process's per-schema validators."""
+    results = []
+    for schema_id, prompt, output in items:
+        validator = _BATCH_VALIDATORS.get(schema_id)
+        if validator is None:
+            if schema_id not in _BATCH_SCHEMAS:
+                raise KeyError(f"Schema not found: {schema_id}")
+            validator = QualityValidator(_BATCH_SCHEMAS[schema_id], schema_id=schema_id, **_BATCH_OPTIONS)
+            _BATCH_VALIDATORS[schema_id] = validator
+        results.append(validator.validate_pair(prompt, output))
+    return results
+
+
+def validate_many(
+    items: Iterable[Tuple[str, str, str]],
+    schemas: Dict[str, Dict[str, Any]],
+    alignment_threshold: float = 0.3,
+    codegen: bool = False,
+    placeholders: Optional[PlaceholderScanner] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 2000
+) -> BatchValidation:
+    """
+    Validate many (schema_id, prompt, output) triples across a process pool.
+
+    Each worker builds one QualityValidator per schema and validates chunks of
+    the input; results come back in input order. Inputs of at most one chunk,
+    or workers=1, are validated in this process.
+
+    Args:
+        items: (schema_id, prompt, output text) triples
+        schemas: Schema ID -> JSON schema, for every schema ID in items
+        alignment_threshold: Passed to QualityValidator
+        codegen: Passed to QualityValidator
+        placeholders: Passed to QualityValidator
+        workers: Worker processes (default: os.cpu_count())
+        chunksize: Triples per task sent to a worker
+
+    Returns:
+        BatchValidation with the results and ValidationStats per schema
+    """
+    items = list(items)
+    chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+
+    if workers <= 1:
+        _init_batch_worker(schemas, alignment_threshold, codegen, placeholders)
+        results = _validate_batch(items)
+    else:
+        needed = {schema_id for schema_id, _, _ in items}
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=({k: v for k, v in schemas.items() if k in needed}, alignment_threshold, codegen, placeholders)
+        ) as executor:
+            results = [result for batch in executor.map(_validate_batch, chunks) for result in batch]
+
+    stats: Dict[str, ValidationStats] = {}
+    for (schema_id, _, _), result in zip(items, results):
+        if schema_id not in stats:
+            stats[schema_id] = ValidationStats()
+        stats[schema_id].add(result)
+
+    return BatchValidation(results=results, stats=stats)
+
+
 if __name__ == "__main__":
     # Test the validator
     print("Testing QualityValidator\n")
@@ -309,6 +501,8 @@ if __name__ == "__main__":
 
         print(f"  Valid: {result.valid}")
         print(f"  Reason: {result.reason}")
+        if result.placeholder:
+            print(f"  Placeholder: {result.placeholder}")
         if result.parsed_json:
             print(f"  Parsed JSON: {json.dumps(result.parsed_json, indent=2)}")
 
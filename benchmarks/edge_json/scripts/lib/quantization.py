@@ -0,0 +1,135 @@
+"""
+Quantization - Quantized CPU model variants and memory footprint measurement.
+
+Two modes are supported for the PyTorch backend:
+  - int8-dynamic: torch dynamic quantization of every nn.Linear (int8
+    weights, activations quantized on the fly)
+  - int4: 4-bit NF4 weights via bitsandbytes, loaded from a checkpoint
+
+LoRA adapters are merged into the base weights before quantizing, so the
+quantized model has no separate adapter matmuls.
+"""
+
+import itertools
+from pathlib import Path
+
+import torch
+
+from model_cache import merged_checkpoint
+
+
+QUANTIZATION_MODES = ["int8-dynamic", "int4"]
+
+
+def merge_adapter(model):
+    """Fold a PeftModel's LoRA weights into the base model (no-op for plain models)"""
+    if hasattr(model, "merge_and_unload"):
+        return model.merge_and_unload()
+    return model
+
+
+def quantize_int8_dynamic(model):
+    """Dynamically quantize all linear layers of a (merged) model to int8"""
+    return torch.ao.quantization.quantize_dynamic(
+        merge_adapter(model),
+        {torch.nn.Linear},
+        dtype=torch.qint8
+    )
+
+
+def check_int4_support():
+    """
+    Fail early unless the installed bitsandbytes can quantize 4-bit on CPU.
+
+    Older and CUDA-only builds either fail to import or only fail deep
+    inside from_pretrained; a tiny NF4 round trip on CPU tells them apart.
+    """
+    try:
+        import bitsandbytes.functional as bnb_functional
+        bnb_functional.quantize_4bit(torch.zeros(64), quant_type="nf4")
+    except Exception as e:
+        raise RuntimeError(
+            "--quantize int4 needs a bitsandbytes build with CPU support "
+            f"(bitsandbytes >= 0.46 on PyPI); the installed one failed a CPU NF4 test: {e}"
+        ) from e
+
+
+def load_int4(model_name: str, adapter: str | None = None):
+    """
+    Load a model with 4-bit NF4 weights (bitsandbytes).
+
+    bitsandbytes quantizes at load time, so an adapter is first merged into
+    a full-precision checkpoint (cached by model_cache) that is then loaded
+    quantized.
+    """
+    from transformers import AutoModelForCausalLM, BitsAndBytesConfig
+
+    check_int4_support()
+
+    quantization_config = BitsAndBytesConfig(
+        load_in_4bit=True,
+        bnb_4bit_quant_type="nf4",
+        bnb_4bit_compute_dtype=torch.float32
+    )
+
+    source = str(merged_checkpoint(model_name, adapter)) if adapter else model_name
+    return AutoModelForCausalLM.from_pretrained(
+        source,
+        quantization_config=quantization_config,
+        device_map="cpu"
+    )
+
+
+class _ByteCounter:
+    """Write-only file object that counts bytes instead of storing them"""
+
+    def __init__(self):
+        self.nbytes = 0
+
+    def write(self, data) -> int:
+        self.nbytes += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def _tensor_nbytes(tensor) -> int:
+    return tensor.numel() * tensor.element_size()
+
+
+def model_size_mb(model) -> float:
+    """
+    Model memory footprint in MB.
+
+    Sums the storage of parameters and buffers (tied weights counted once),
+    including the per-block scales of bitsandbytes 4-bit weights. Dynamic
+    int8 Linear layers keep their packed weights outside any tensor, so
+    those modules alone are measured by serializing their state dict.
+    ONNX Runtime models report the size of their graph and weight files.
+    """
+    if isinstance(model, torch.nn.Module):
+        nbytes = 0
+        seen = set()
+        for tensor in itertools.chain(model.parameters(), model.buffers()):
+            if tensor.data_ptr() in seen:
+                continue
+            seen.add(tensor.data_ptr())
+            nbytes += _tensor_nbytes(tensor)
+            quant_state = getattr(tensor, "quant_state", None)
+            if quant_state is not None:
+                nbytes += _tensor_nbytes(quant_state.absmax)
+
+        for module in model.modules():
+            packed = getattr(module, "_packed_params", None)
+            if packed is not None and not isinstance(packed, torch.nn.Module):
+                counter = _ByteCounter()
+                torch.save(module.state_dict(), counter)
+                nbytes += counter.nbytes
+        return nbytes / 1e6
+
+    model_dir = Path(getattr(model, "model_save_dir", ""))
+    return sum(
+        p.stat().st_size for p in model_dir.iterdir()
+        if p.suffix in (".onnx", ".onnx_data")
+    ) / 1e6 if model_dir.is_dir() else 0.0
@@ -0,0 +1,226 @@
+"""
+Schema Codegen - Compile a JSON schema into a specialized Python validator.
+
+In the spirit of fastjsonschema: the schema is walked once and turned into
+the source of a single function of straight-line isinstance/key checks,
+with patterns and enums bound as constants, which is then exec'd. Checking
+an instance runs that function instead of jsonschema's generic, per-keyword
+dispatch.
+
+Semantics follow Draft7Validator without a format checker (the way
+QualityValidator has always used it): "format" is an annotation only,
+integers accept integral floats, and booleans are neither integers nor
+numbers nor equal to 0/1 in enum/const. Schemas using any keyword outside
+SUPPORTED_KEYWORDS are not compiled (compile_validator returns None) so the
+caller falls back to jsonschema.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+# Keywords with no effect on validity
+ANNOTATION_KEYWORDS = {"$schema", "$id", "title", "description", "default", "examples", "format", "$comment"}
+
+SUPPORTED_KEYWORDS = ANNOTATION_KEYWORDS | {
+    "type", "properties", "required", "additionalProperties", "items", "enum", "const",
+    "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum", "minLength", "maxLength",
+    "pattern", "minItems", "maxItems", "uniqueItems",
+}
+
+# JSON type -> generated test on a variable name
+TYPE_CHECKS = {
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "string": "isinstance({v}, str)",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": "(_is_integer({v}))",
+}
+
+_NUMBER = "(isinstance({v}, (int, float)) and not isinstance({v}, bool))"
+
+
+def _is_integer(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    """JSON equality: booleans never equal numbers, containers compare deeply"""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return isinstance(a, bool) and isinstance(b, bool) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_json_equal(x, y) for x, y in zip(a, b))
+    if isinstance(a, (dict, list)) or isinstance(b, (dict, list)):
+        return False
+    return a == b
+
+
+def _unique(items: List[Any]) -> bool:
+    return not any(_json_equal(items[i], items[j]) for i in range(len(items)) for j in range(i))
+
+
+class _Unsupported(Exception):
+    pass
+
+
+class _Generator:
+    """Emits the body of validate(data) for one schema"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.constants: Dict[str, Any] = {}
+        self.counter = 0
+
+    def name(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def constant(self, value: Any, prefix: str = "C") -> str:
+        name = self.name(prefix)
+        self.constants[name] = value
+        return name
+
+    def emit(self, line: str, indent: int):
+        self.lines.append("    " * indent + line)
+
+    def fail_unless(self, condition: str, indent: int):
+        self.emit(f"if not {condition}:", indent)
+        self.emit("return False", indent + 1)
+
+    def schema(self, schema: Any, v: str, indent: int):
+        if schema is True or schema == {}:
+            return
+        if schema is False:
+            self.emit("return False", indent)
+            return
+        if not isinstance(schema, dict) or set(schema) - SUPPORTED_KEYWORDS:
+            raise _Unsupported(schema)
+
+        if "type" in schema:
+            types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+            if any(t not in TYPE_CHECKS for t in types):
+                raise _Unsupported(schema["type"])
+            self.fail_unless("(" + " or ".join(TYPE_CHECKS[t].format(v=v) for t in types) + ")", indent)
+
+        if "enum" in schema:
+            self.fail_unless(f"any(_json_equal({v}, e) for e in {self.constant(schema['enum'], 'ENUM')})", indent)
+        if "const" in schema:
+            self.fail_unless(f"_json_equal({v}, {self.constant(schema['const'], 'CONST')})", indent)
+
+        self.numeric(schema, v, indent)
+        self.string(schema, v, indent)
+        self.array(schema, v, indent)
+        self.object(schema, v, indent)
+
+    def numeric(self, schema: Dict, v: str, indent: int):
+        bounds = [
+            ("minimum", ">="), ("maximum", "<="), ("exclusiveMinimum", ">"), ("exclusiveMaximum", "<"),
+        ]
+        checks = [(schema[k], op) for k, op in bounds if k in schema]
+        if not checks:
+            return
+        self.emit(f"if {_NUMBER.format(v=v)}:", indent)
+        for bound, op in checks:
+            self.fail_unless(f"{v} {op} {bound!r}", indent + 1)
+
+    def string(self, schema: Dict, v: str, indent: int):
+        checks = []
+        if "minLength" in schema:
+            checks.append(f"len({v}) >= {int(schema['minLength'])}")
+        if "maxLength" in schema:
+            checks.append(f"len({v}) <= {int(schema['maxLength'])}")
+        if "pattern" in schema:
+            checks.append(f"{self.constant(re.compile(schema['pattern']), 'PATTERN')}.search({v})")
+        if not checks:
+            return
+        self.emit(f"if isinstance({v}, str):", indent)
+        for check in checks:
+            self.fail_unless(check, indent + 1)
+
+    def array(self, schema: Dict, v: str, indent: int):
+        keys = {"items", "minItems", "maxItems", "uniqueItems"} & set(schema)
+        if not keys:
+            return
+        self.emit(f"if isinstance({v}, list):", indent)
+        self.emit("pass", indent + 1)
+        if "minItems" in schema:
+            self.fail_unless(f"len({v}) >= {int(schema['minItems'])}", indent + 1)
+        if "maxItems" in schema:
+            self.fail_unless(f"len({v}) <= {int(schema['maxItems'])}", indent + 1)
+        if schema.get("uniqueItems"):
+            self.fail_unless(f"_unique({v})", indent + 1)
+        items = schema.get("items", True)
+        if isinstance(items, list):
+            raise _Unsupported(items)  # Tuple validation
+        if items is not True and items != {}:
+            item = self.name("item")
+            self.emit(f"for {item} in {v}:", indent + 1)
+            self.emit("pass", indent + 2)
+            self.schema(items, item, indent + 2)
+
+    def object(self, schema: Dict, v: str, indent: int):
+        keys = {"properties", "required", "additionalProperties"} & set(schema)
+        if not keys:
+            return
+        self.emit(f"if isinstance({v}, dict):", indent)
+        self.emit("pass", indent + 1)
+        for key in schema.get("required", []):
+            self.fail_unless(f"{key!r} in {v}", indent + 1)
+
+        properties = schema.get("properties", {})
+        for key, subschema in properties.items():
+            if subschema is True or subschema == {}:
+                continue
+            child = self.name("value")
+            self.emit(f"if {key!r} in {v}:", indent + 1)
+            self.emit(f"{child} = {v}[{key!r}]", indent + 2)
+            self.schema(subschema, child, indent + 2)
+
+        additional = schema.get("additionalProperties", True)
+        if additional is False:
+            known = self.constant(frozenset(properties), "KEYS")
+            self.fail_unless(f"{known}.issuperset({v})", indent + 1)
+        elif additional is not True and additional != {}:
+            known = self.constant(frozenset(properties), "KEYS")
+            key, child = self.name("key"), self.name("value")
+            self.emit(f"for {key}, {child} in {v}.items():", indent + 1)
+            self.emit(f"if {key} in {known}:", indent + 2)
+            self.emit("continue", indent + 3)
+            self.schema(additional, child, indent + 2)
+
+
+def generate_source(schema: Dict[str, Any]) -> Optional[tuple]:
+    """
+    Generate validator source for a schema.
+
+    Returns:
+        (source, constants) or None if the schema uses unsupported keywords
+    """
+    generator = _Generator()
+    try:
+        generator.schema(schema, "data", 1)
+    except _Unsupported:
+        return None
+    source = "def validate(data):\n" + "\n".join(generator.lines + ["    return True"]) + "\n"
+    return source, generator.constants
+
+
+def compile_validator(schema: Dict[str, Any]) -> Optional[Callable[[Any], bool]]:
+    """
+    Compile a schema into a validate(instance) -> bool function.
+
+    Returns:
+        The function, or None if the schema needs jsonschema
+    """
+    generated = generate_source(schema)
+    if generated is None:
+        return None
+    source, constants = generated
+    namespace = {"_is_integer": _is_integer, "_json_equal": _json_equal, "_unique": _unique, **constants}
+    exec(compile(source, "<schema_codegen>", "exec"), namespace)
+    return namespace["validate"]
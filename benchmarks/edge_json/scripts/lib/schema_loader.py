@@ -2,22 +2,47 @@
 Schema Loader - Auto-discover and load JSON schemas from directory structure.
 
 Automatically detects complexity level (simple/medium/complex) from directory.
-No YAML config required.
+No YAML config required. Lookups by ID and complexity are dict lookups;
+schema files are parsed lazily and carry a content hash.
 """
 
+import hashlib
 import json
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+
+
+def schema_hash(schema: Dict[str, Any]) -> str:
+    """Content hash of a schema (key order independent)."""
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()
+
+
+COMPLEXITIES = ("simple", "medium", "complex")
 
 
 @dataclass
 class SchemaInfo:
-    """Information about a JSON schema."""
+    """Information about a JSON schema (the file is parsed on first access to .schema)."""
     schema_id: str
-    schema: Dict[str, Any]
     complexity: str  # "simple" | "medium" | "complex"
     path: Path
+    _schema: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
+    _hash: Optional[str] = field(default=None, repr=False, compare=False)
+
+    @property
+    def schema(self) -> Dict[str, Any]:
+        if self._schema is None:
+            with self.path.open() as f:
+                self._schema = json.load(f)
+        return self._schema
+
+    @property
+    def content_hash(self) -> str:
+        """schema_hash of the parsed schema (the key used by the validator and automaton caches)."""
+        if self._hash is None:
+            self._hash = schema_hash(self.schema)
+        return self._hash
 
     def __repr__(self):
         return f"SchemaInfo({self.schema_id}, {self.complexity})"
@@ -28,6 +53,8 @@ class SchemaLoader:
     Load JSON schemas from directory structure.
 
     Auto-detects complexity from directory name (simple/medium/complex).
+    Schema files are discovered up front and indexed by ID and complexity;
+    each file is parsed on first use.
     """
 
     def __init__(self, schemas_root: Path):
@@ -39,56 +66,78 @@ class SchemaLoader:
         """
         self.schemas_root = Path(schemas_root)
         self._schemas: List[SchemaInfo] = []
-        self._load()
-
-    def _load(self):
-        """Load all schemas from directory structure."""
-        complexities = ["simple", "medium", "complex"]
-
-        for complexity in complexities:
+        self._by_id: Dict[str, SchemaInfo] = {}
+        self._by_complexity: Dict[str, List[SchemaInfo]] = {c: [] for c in COMPLEXITIES}
+        self._parsed_tiers = set()  # Complexities whose files have all been parsed
+        self._discover()
+
+    def _discover(self):
+        """Index all schema files in the directory structure (without parsing them)."""
+        for complexity in COMPLEXITIES:
             complexity_dir = self.schemas_root / complexity
             if not complexity_dir.exists():
                 continue
 
-            # Load all .json files in this complexity directory
+            # All .json files in this complexity directory
             for schema_file in complexity_dir.glob("*.json"):
-                schema_id = schema_file.stem  # filename without .json extension
-
-                try:
-                    with schema_file.open() as f:
-                        schema = json.load(f)
-
-                    self._schemas.append(SchemaInfo(
-                        schema_id=schema_id,
-                        schema=schema,
-                        complexity=complexity,
-                        path=schema_file
-                    ))
-                except Exception as e:
-                    print(f"Warning: Failed to load {schema_file}: {e}")
+                info = SchemaInfo(
+                    schema_id=schema_file.stem,  # filename without .json extension
+                    complexity=complexity,
+                    path=schema_file
+                )
+                self._schemas.append(info)
+                self._by_id.setdefault(info.schema_id, info)
+                self._by_complexity[complexity].append(info)
+
+    def _load(self, info: SchemaInfo) -> bool:
+        """Parse a schema file; unparseable schemas are dropped from the indexes."""
+        try:
+            info.schema
+            return True
+        except Exception as e:
+            print(f"Warning: Failed to load {info.path}: {e}")
+            self._schemas.remove(info)
+            self._by_complexity[info.complexity].remove(info)
+            if self._by_id.get(info.schema_id) is info:
+                del self._by_id[info.schema_id]
+                # Next schema file with the same ID, if any
+                for other in self._schemas:
+                    if other.schema_id == info.schema_id:
+                        self._by_id[info.schema_id] = other
+                        break
+            return False
 
     def all_schemas(self) -> List[SchemaInfo]:
         """Return all loaded schemas."""
-        return self._schemas
+        for complexity in COMPLEXITIES:
+            self.by_complexity(complexity)
+        return list(self._schemas)
 
     def get(self, schema_id: str) -> SchemaInfo:
         """Get schema by ID."""
-        for schema in self._schemas:
-            if schema.schema_id == schema_id:
-                return schema
-        raise KeyError(f"Schema not found: {schema_id}")
+        info = self._by_id.get(schema_id)
+        while info is not None and not self._load(info):
+            info = self._by_id.get(schema_id)
+        if info is None:
+            raise KeyError(f"Schema not found: {schema_id}")
+        return info
 
     def by_complexity(self, complexity: str) -> List[SchemaInfo]:
         """Get all schemas of a given complexity level."""
-        return [s for s in self._schemas if s.complexity == complexity]
+        schemas = self._by_complexity.get(complexity, [])
+        if complexity not in self._parsed_tiers:
+            for info in list(schemas):
+                self._load(info)
+            self._parsed_tiers.add(complexity)
+        return list(schemas)
 
     def summary(self) -> Dict[str, int]:
         """Get summary of loaded schemas."""
         summary = {
-            "total": len(self._schemas),
-            "simple": len(self.by_complexity("simple")),
-            "medium": len(self.by_complexity("medium")),
-            "complex": len(self.by_complexity("complex")),
+            "total": len(self.all_schemas()),
+            "simple": len(self._by_complexity["simple"]),
+            "medium": len(self._by_complexity["medium"]),
+            "complex": len(self._by_complexity["complex"]),
         }
         return summary
 
@@ -0,0 +1,184 @@
+"""
+Significance - Paired bootstrap confidence intervals and McNemar tests.
+
+Two eval.py runs on the same test set are joined per example ID, so every
+difference is paired. Bootstrap resampling is done with NumPy index
+matrices: one (resamples x examples) draw, stratified by group, yields the
+resampled mean differences of every metric for the overall set and every
+complexity tier or schema at once. McNemar's test checks whether JSONExact
+flips between the two models are balanced (exact binomial test for few
+discordant pairs, continuity-corrected chi-square otherwise).
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from metrics import ResultColumns
+
+# Paired metric -> ResultColumns column
+PAIRED_METRICS = {
+    "json_exact": "json_exact",
+    "field_f1": "field_f1",
+    "nested_field_f1": "nested_field_f1",
+    "schema_compliance": "schema_compliance",
+}
+
+# Below this many discordant pairs McNemar uses the exact binomial test
+EXACT_MCNEMAR_MAX = 25
+
+
+def pair_results(baseline: Iterable[Dict], comparison: Iterable[Dict]) -> Tuple[ResultColumns, ResultColumns]:
+    """
+    Join two runs' individual_results on example_id (baseline order).
+
+    Returns:
+        (baseline columns, comparison columns), row i is the same example
+    """
+    comparison_by_id = {r.get("example_id"): r for r in comparison if r.get("example_id")}
+    pairs = [(r, comparison_by_id[r["example_id"]]) for r in baseline if r.get("example_id") in comparison_by_id]
+    return ResultColumns(p[0] for p in pairs), ResultColumns(p[1] for p in pairs)
+
+
+def _metric_deltas(baseline: ResultColumns, comparison: ResultColumns) -> np.ndarray:
+    """Per-example comparison - baseline differences, shape (examples, metrics)"""
+    return np.column_stack([
+        getattr(comparison, column).astype(float) - getattr(baseline, column).astype(float)
+        for column in PAIRED_METRICS.values()
+    ])
+
+
+def bootstrap_groups(
+    deltas: np.ndarray,
+    labels: np.ndarray,
+    n_resamples: int = 10000,
+    confidence: float = 0.95,
+    seed: int = 0
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Paired-bootstrap CIs of the mean difference of every metric in every group.
+
+    Examples are resampled with replacement within their own group, so every
+    group's CI comes from the same single (resamples x examples) index matrix.
+
+    Args:
+        deltas: Per-example differences, shape (examples, metrics)
+        labels: Group label of each example
+        n_resamples: Bootstrap resamples
+        confidence: Two-sided confidence level
+        seed: RNG seed (results are reproducible)
+
+    Returns:
+        {group: {metric: {"delta", "ci_low", "ci_high", "significant"}}}
+    """
+    groups, inverse = np.unique(labels.astype(str), return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    sizes = np.bincount(inverse, minlength=len(groups))
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+    # Each column draws only from its own group's (contiguous, sorted) rows
+    rng = np.random.default_rng(seed)
+    column_start = np.repeat(starts, sizes)
+    column_size = np.repeat(sizes, sizes)
+    draws = column_start + (rng.random((n_resamples, len(order))) * column_size).astype(np.int64)
+
+    sorted_deltas = deltas[order]
+    alpha = (1 - confidence) / 2
+    low = np.empty((len(groups), deltas.shape[1]))
+    high = np.empty_like(low)
+    for m in range(deltas.shape[1]):
+        # (resamples, examples) -> (resamples, groups) mean differences
+        group_means = np.add.reduceat(sorted_deltas[draws, m], starts, axis=1) / sizes
+        low[:, m], high[:, m] = np.quantile(group_means, [alpha, 1 - alpha], axis=0)
+    observed = np.add.reduceat(sorted_deltas, starts, axis=0) / sizes[:, None]
+
+    return {
+        group: {
+            metric: {
+                "delta": float(observed[g, m]),
+                "ci_low": float(low[g, m]),
+                "ci_high": float(high[g, m]),
+                "significant": bool(low[g, m] > 0 or high[g, m] < 0)
+            }
+            for m, metric in enumerate(PAIRED_METRICS)
+        }
+        for g, group in enumerate(groups)
+    }
+
+
+def mcnemar(baseline_correct: np.ndarray, comparison_correct: np.ndarray) -> Dict[str, Any]:
+    """
+    McNemar's test on paired binary outcomes.
+
+    Returns:
+        Discordant counts (baseline-only / comparison-only correct), the
+        test used and its two-sided p-value
+    """
+    b = int(np.sum(baseline_correct & ~comparison_correct))
+    c = int(np.sum(~baseline_correct & comparison_correct))
+    n = b + c
+
+    if n == 0:
+        test, p_value = "none", 1.0
+    elif n < EXACT_MCNEMAR_MAX:
+        test = "exact"
+        tail = sum(math.comb(n, k) for k in range(min(b, c) + 1)) / 2 ** n
+        p_value = min(1.0, 2 * tail)
+    else:
+        test = "chi2"
+        statistic = (abs(b - c) - 1) ** 2 / n
+        p_value = math.erfc(math.sqrt(statistic / 2))  # Chi-square survival function, 1 dof
+
+    return {"baseline_only": b, "comparison_only": c, "test": test, "p_value": p_value}
+
+
+def paired_significance(
+    baseline_results: List[Dict],
+    comparison_results: List[Dict],
+    n_resamples: int = 10000,
+    confidence: float = 0.95,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Bootstrap CIs and JSONExact McNemar tests, overall, per complexity and per schema.
+
+    Args:
+        baseline_results: individual_results of the baseline run
+        comparison_results: individual_results of the comparison run
+        n_resamples: Bootstrap resamples
+        confidence: Two-sided confidence level
+        seed: RNG seed
+
+    Returns:
+        Significance section of the comparison output
+    """
+    baseline, comparison = pair_results(baseline_results, comparison_results)
+    report = {
+        "paired_examples": len(baseline),
+        "n_resamples": n_resamples,
+        "confidence": confidence,
+        "overall": {},
+        "by_complexity": {},
+        "by_schema": {}
+    }
+    if not len(baseline):
+        return report
+
+    deltas = _metric_deltas(baseline, comparison)
+    groupings = [
+        ("overall", np.zeros(len(baseline), dtype=object)),
+        ("by_complexity", baseline.complexity),
+        ("by_schema", baseline.schema),
+    ]
+    for section, labels in groupings:
+        intervals = bootstrap_groups(deltas, labels, n_resamples, confidence, seed)
+        for group, metrics in intervals.items():
+            rows = labels.astype(str) == group
+            metrics["json_exact"]["mcnemar"] = mcnemar(baseline.json_exact[rows], comparison.json_exact[rows])
+            if section == "overall":
+                report["overall"] = metrics
+            else:
+                report[section][group] = metrics
+
+    return report
@@ -0,0 +1,156 @@
+"""
+Speculative Decoding - Greedy draft-and-verify generation with a smaller model.
+
+A small draft model (e.g. Maaza-MLM-135M) proposes a few tokens greedily;
+the target model (e.g. Maaza-SLM-360M) scores all of them in one forward
+pass and keeps the longest prefix matching its own greedy choices, plus its
+own next token. Under greedy decoding the output equals the target model's
+plain generate() output, while accepted tokens cost a cheap draft step
+instead of a full target decode step. Both models must share a tokenizer.
+"""
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import torch
+from transformers import DynamicCache, StoppingCriteriaList
+
+
+@dataclass
+class SpeculativeStats:
+    """Draft acceptance counters of one generation"""
+    draft_tokens: int = 0  # Tokens proposed by the draft model
+    accepted_tokens: int = 0  # Proposed tokens the target model agreed with
+    verify_steps: int = 0  # Target forward passes after prefill
+
+    @property
+    def acceptance_rate(self) -> float:
+        return self.accepted_tokens / self.draft_tokens if self.draft_tokens else 0.0
+
+
+def check_shared_vocab(tokenizer, draft_tokenizer):
+    """Raise ValueError unless the draft model's tokenizer matches the target's"""
+    if tokenizer.get_vocab() != draft_tokenizer.get_vocab():
+        raise ValueError("Draft model must share the target model's tokenizer")
+
+
+def _greedy_tokens(model, cache: DynamicCache, new_tokens: List[int], device) -> List[int]:
+    """Extend a KV cache with new tokens; return the greedy next token after each"""
+    outputs = model(
+        input_ids=torch.tensor([new_tokens], device=device),
+        past_key_values=cache,
+        use_cache=True
+    )
+    return outputs.logits[0].argmax(dim=-1).tolist()
+
+
+class SpeculativeDecoder:
+    """
+    Greedy speculative generation for a target model and a draft model.
+
+    Both KV caches are kept across draft/verify rounds and cropped back to
+    the committed tokens after each verification. Generation is unbatched.
+    """
+
+    def __init__(self, model, draft_model, num_draft_tokens: int = 5, draft_prefix_cache=None):
+        """
+        Initialize speculative decoder.
+
+        Args:
+            model: Target causal LM (or PeftModel) whose output is reproduced
+            draft_model: Smaller causal LM with the same tokenizer
+            num_draft_tokens: Tokens drafted per verification step
+            draft_prefix_cache: Optional PrefixCache of the draft model
+        """
+        self.model = model
+        self.draft_model = draft_model
+        self.num_draft_tokens = num_draft_tokens
+        self.draft_prefix_cache = draft_prefix_cache
+
+    def generate(
+        self,
+        input_ids: torch.Tensor,
+        max_new_tokens: int,
+        eos_token_id: int | None = None,
+        stopping_criteria: StoppingCriteriaList | None = None,
+        past_key_values: DynamicCache | None = None
+    ) -> Tuple[torch.Tensor, SpeculativeStats]:
+        """
+        Generate greedily for one prompt.
+
+        Accepted tokens are committed one at a time, and EOS, max_new_tokens
+        and every stopping criterion are checked after each, exactly as
+        generate() would, so stopping criteria see the same token stream.
+
+        Args:
+            input_ids: Prompt token IDs, shape [1, prompt_length]
+            max_new_tokens: Generation limit
+            eos_token_id: Token that ends generation
+            stopping_criteria: Criteria called after each committed token
+            past_key_values: Optional target KV cache of a prompt prefix
+                (e.g. from PrefixCache.generate_kwargs); extended in place
+
+        Returns:
+            (prompt plus generated token IDs of shape [1, n], acceptance stats)
+        """
+        device = input_ids.device
+        tokens = input_ids[0].tolist()
+        prompt_length = len(tokens)
+        stats = SpeculativeStats()
+
+        cache = past_key_values if past_key_values is not None else DynamicCache()
+        draft_cache = None
+        if self.draft_prefix_cache:
+            draft_cache = self.draft_prefix_cache.generate_kwargs(input_ids).get("past_key_values")
+        if draft_cache is None:
+            draft_cache = DynamicCache()
+
+        with torch.no_grad():
+            # Prefill the uncached part of the prompt; its last position gives the first token
+            new_tokens = _greedy_tokens(self.model, cache, tokens[cache.get_seq_length():], device)[-1:]
+
+            while True:
+                for token in new_tokens:
+                    tokens.append(token)
+                    if self._should_stop(tokens, prompt_length, max_new_tokens, eos_token_id, stopping_criteria):
+                        return torch.tensor([tokens], device=device), stats
+
+                # The verify pass yields one target token beyond the drafts
+                num_drafts = min(self.num_draft_tokens, max_new_tokens - (len(tokens) - prompt_length) - 1)
+
+                # Draft: roll the draft cache back to the committed tokens, catch up, then propose
+                draft_cache.crop(min(draft_cache.get_seq_length(), len(tokens) - 1))
+                feed = tokens[draft_cache.get_seq_length():]
+                drafts = []
+                for _ in range(num_drafts):
+                    feed = _greedy_tokens(self.draft_model, draft_cache, feed, device)[-1:]
+                    drafts.append(feed[0])
+
+                # Verify: score the last committed token and every draft in one target pass
+                predictions = _greedy_tokens(self.model, cache, [tokens[-1]] + drafts, device)
+                accepted = 0
+                while accepted < len(drafts) and drafts[accepted] == predictions[accepted]:
+                    accepted += 1
+
+                stats.draft_tokens += len(drafts)
+                stats.accepted_tokens += accepted
+                stats.verify_steps += 1
+
+                # Keep target KV for the committed tokens and accepted drafts only
+                cache.crop(len(tokens) + accepted)
+                new_tokens = drafts[:accepted] + [predictions[accepted]]
+
+    @staticmethod
+    def _should_stop(
+        tokens: List[int],
+        prompt_length: int,
+        max_new_tokens: int,
+        eos_token_id: int | None,
+        stopping_criteria: StoppingCriteriaList | None
+    ) -> bool:
+        stop = tokens[-1] == eos_token_id or len(tokens) - prompt_length >= max_new_tokens
+        if stopping_criteria:
+            # Call every criterion: they track state (timers, JSON scanners) per token
+            input_ids = torch.tensor([tokens])
+            stop = any([bool(criterion(input_ids, None).any()) for criterion in stopping_criteria]) or stop
+        return stop
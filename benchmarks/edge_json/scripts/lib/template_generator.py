@@ -3,14 +3,296 @@ Template Generator - Generate realistic synthetic data using Faker.
 
 Uses generic field name matching to map schema fields to Faker functions.
 No YAML config required - fully automatic.
+
+Field matching depends only on the schema, so each schema is compiled once
+into a generation plan (cached per process by schema hash); generating an
+example runs the plan.
 """
 
-from typing import Dict, Any, Tuple, Optional
+from typing import Callable, Dict, Any, Tuple, Optional
 from faker import Faker
 from datetime import datetime
+from functools import partial
+from operator import methodcaller
 import random
 import re
 
+from schema_loader import schema_hash
+
+
+# A generation plan node: called with the generator's Faker instance
+Plan = Callable[[Faker], Any]
+
+
+def _run_object(fields: Tuple[Tuple[str, bool, Plan], ...], keep_optional: float, fake: Faker) -> Dict[str, Any]:
+    obj = {}
+    for prop_name, required, plan in fields:
+        # Always generate required fields, randomly include others
+        if required or random.random() > keep_optional:
+            value = plan(fake)
+            if value is not None:  # None means skip this field
+                obj[prop_name] = value
+    return obj
+
+
+def _run_array(min_items: int, max_items: int, item: Plan, fake: Faker) -> list:
+    # Generate random number of items
+    count = random.randint(min_items, max_items)
+
+    array = []
+    for i in range(count):
+        value = item(fake)
+        if value is not None:
+            array.append(value)
+    return array
+
+
+def _choice(options: list, fake: Faker) -> Any:
+    return random.choice(options)
+
+
+def _randint(low: int, high: int, fake: Faker) -> int:
+    return random.randint(low, high)
+
+
+def _uniform(low: float, high: float, digits: int, fake: Faker) -> float:
+    return round(random.uniform(low, high), digits)
+
+
+def _none(fake: Faker) -> None:
+    return None
+
+
+def _sentence(fake: Faker) -> str:
+    return fake.sentence(nb_words=random.randint(5, 15))
+
+
+def _paragraph(fake: Faker) -> str:
+    return fake.paragraph(nb_sentences=random.randint(2, 4))
+
+
+def _version(fake: Faker) -> str:
+    return f"{random.randint(1, 3)}.{random.randint(0, 9)}.{random.randint(0, 20)}"
+
+
+def _word(fake: Faker) -> str:
+    return fake.word().capitalize()
+
+
+def _compile_object(schema: Dict[str, Any], keep_optional: float) -> Plan:
+    properties = schema.get("properties", {})
+    required = set(schema.get("required", []))
+    fields = tuple(
+        (prop_name, prop_name in required, _compile_value(prop_name, prop_schema))
+        for prop_name, prop_schema in properties.items()
+    )
+    return partial(_run_object, fields, keep_optional)
+
+
+def _compile_value(field_name: str, schema: Dict[str, Any]) -> Plan:
+    """Plan for a field, chosen from its schema and name."""
+    field_type = schema.get("type")
+    field_format = schema.get("format")
+    field_enum = schema.get("enum")
+
+    # Handle enum first (highest priority)
+    if field_enum:
+        return partial(_choice, field_enum)
+
+    # Handle by type
+    if field_type == "string":
+        return _compile_string(field_name, schema, field_format)
+    elif field_type == "integer":
+        return _compile_integer(field_name, schema)
+    elif field_type == "number":
+        return _compile_number(field_name, schema)
+    elif field_type == "boolean":
+        return partial(_choice, [True, False])
+    elif field_type == "array":
+        items_schema = schema.get("items", {})
+        min_items = schema.get("minItems", 1)
+        max_items = schema.get("maxItems", 5)
+        return partial(_run_array, min_items, min(max_items, 5), _compile_value(f"{field_name}_item", items_schema))
+    elif field_type == "object":
+        return _compile_object(schema, keep_optional=0.4)
+    elif field_type == "null":
+        return _none
+    else:
+        # No type specified or unknown type
+        return _compile_string(field_name, schema, field_format)
+
+
+def _compile_string(field_name: str, schema: Dict[str, Any], field_format: Optional[str]) -> Plan:
+    """Plan for a string value based on field name and format."""
+    field_lower = field_name.lower()
+
+    # Handle format hints first
+    if field_format == "email":
+        return methodcaller("email")
+    elif field_format == "uri" or field_format == "url":
+        return methodcaller("url")
+    elif field_format == "date":
+        return methodcaller("date")
+    elif field_format == "date-time":
+        return methodcaller("iso8601")
+    elif field_format == "time":
+        return methodcaller("time")
+
+    # Handle pattern if specified
+    pattern = schema.get("pattern")
+    if pattern and "phone" not in field_lower:  # Skip regex for phone (use Faker instead)
+        # For simple patterns, try to generate matching values
+        if pattern in ["^[+]?[0-9\\-\\s()]+$", "^[0-9]{3}-[0-9]{3}-[0-9]{4}$"]:
+            return methodcaller("phone_number")
+
+    # Field name-based heuristics
+    if "email" in field_lower:
+        return methodcaller("email")
+    elif "phone" in field_lower or "tel" in field_lower:
+        return methodcaller("phone_number")
+    elif "url" in field_lower or "website" in field_lower or "link" in field_lower:
+        return methodcaller("url")
+    elif "address" in field_lower:
+        return methodcaller("address")
+    elif "street" in field_lower:
+        return methodcaller("street_address")
+    elif "city" in field_lower:
+        return methodcaller("city")
+    elif "state" in field_lower or "province" in field_lower:
+        return methodcaller("state")
+    elif "country" in field_lower:
+        return methodcaller("country")
+    elif "zip" in field_lower or "postal" in field_lower:
+        return methodcaller("zipcode")
+    elif "name" in field_lower:
+        if "first" in field_lower:
+            return methodcaller("first_name")
+        elif "last" in field_lower:
+            return methodcaller("last_name")
+        elif "company" in field_lower or "organization" in field_lower or "vendor" in field_lower:
+            return methodcaller("company")
+        else:
+            return methodcaller("name")
+    elif "company" in field_lower or "organization" in field_lower:
+        return methodcaller("company")
+    elif "job" in field_lower or "title" in field_lower or "position" in field_lower:
+        return methodcaller("job")
+    elif "date" in field_lower:
+        return methodcaller("date")
+    elif "time" in field_lower:
+        return methodcaller("time")
+    elif "description" in field_lower or "comment" in field_lower or "note" in field_lower:
+        return _sentence
+    elif "message" in field_lower or "text" in field_lower or "content" in field_lower:
+        return _paragraph
+    elif "id" in field_lower or "uuid" in field_lower:
+        return methodcaller("uuid4")
+    elif "color" in field_lower:
+        return methodcaller("color_name")
+    elif "username" in field_lower or "user" in field_lower:
+        return methodcaller("user_name")
+    elif "password" in field_lower:
+        return methodcaller("password")
+    elif "domain" in field_lower:
+        return methodcaller("domain_name")
+    elif "ip" in field_lower:
+        return methodcaller("ipv4")
+    elif "mac" in field_lower:
+        return methodcaller("mac_address")
+    elif "currency" in field_lower:
+        return partial(_choice, ["USD", "EUR", "GBP", "JPY", "CAD", "AUD"])
+    elif "status" in field_lower:
+        return partial(_choice, ["active", "inactive", "pending", "completed"])
+    elif "type" in field_lower or "category" in field_lower:
+        return partial(_choice, ["standard", "premium", "basic", "advanced"])
+    elif "version" in field_lower:
+        return _version
+    else:
+        # Generic fallback
+        return _word
+
+
+def _compile_integer(field_name: str, schema: Dict[str, Any]) -> Plan:
+    """Plan for an integer value."""
+    minimum = schema.get("minimum", 0)
+    maximum = schema.get("maximum", 1000)
+
+    field_lower = field_name.lower()
+
+    # Context-specific ranges
+    if "age" in field_lower:
+        return partial(_randint, 18, 90)
+    elif "year" in field_lower:
+        return partial(_randint, 2020, 2025)
+    elif "month" in field_lower:
+        return partial(_randint, 1, 12)
+    elif "day" in field_lower:
+        return partial(_randint, 1, 28)
+    elif "hour" in field_lower:
+        return partial(_randint, 0, 23)
+    elif "minute" in field_lower or "second" in field_lower:
+        return partial(_randint, 0, 59)
+    elif "count" in field_lower or "total" in field_lower or "quantity" in field_lower:
+        return partial(_randint, 1, 100)
+    elif "port" in field_lower:
+        return partial(_randint, 1024, 65535)
+    elif "percentage" in field_lower or "percent" in field_lower:
+        return partial(_randint, 0, 100)
+    else:
+        return partial(_randint, minimum, min(maximum, 10000))
+
+
+def _compile_number(field_name: str, schema: Dict[str, Any]) -> Plan:
+    """Plan for a number (float) value."""
+    minimum = schema.get("minimum", 0.0)
+    maximum = schema.get("maximum", 1000.0)
+
+    field_lower = field_name.lower()
+
+    # Context-specific ranges
+    if "price" in field_lower or "amount" in field_lower or "cost" in field_lower:
+        return partial(_uniform, 10.0, 5000.0, 2)
+    elif "rate" in field_lower or "percentage" in field_lower:
+        return partial(_uniform, 0.0, 100.0, 2)
+    elif "temperature" in field_lower:
+        return partial(_uniform, -20.0, 40.0, 1)
+    elif "latitude" in field_lower:
+        return partial(_uniform, -90.0, 90.0, 6)
+    elif "longitude" in field_lower:
+        return partial(_uniform, -180.0, 180.0, 6)
+    else:
+        return partial(_uniform, minimum, min(maximum, 10000.0), 2)
+
+
+# Process-wide registry: schema hash -> generation plan
+_PLANS: Dict[str, Plan] = {}
+
+
+def get_plan(schema: Dict[str, Any]) -> Plan:
+    """
+    Generation plan for a top-level object schema, compiled on first use and
+    cached per process by schema hash.
+
+    The plan is a tree of bound callables, one per field, picked once from
+    the field's schema and name; running it with a Faker instance generates
+    an object. It draws random numbers in the same order as walking the
+    schema would, so seeded output is unchanged.
+    """
+    if schema.get("type") != "object":
+        raise ValueError("Top-level schema must be type 'object'")
+
+    key = schema_hash(schema)
+    plan = _PLANS.get(key)
+    if plan is None:
+        plan = _compile_object(schema, keep_optional=0.3)
+        _PLANS[key] = plan
+    return plan
+
+
+def plan_count() -> int:
+    """Number of generation plans compiled by this process."""
+    return len(_PLANS)
+
 
 class TemplateGenerator:
     """
@@ -27,6 +309,8 @@ class TemplateGenerator:
             seed: Random seed for reproducibility (optional)
         """
         self.fake = Faker()
+        # id(schema) -> (schema, plan): skips hashing schemas this generator has seen
+        self._plans: Dict[int, Tuple[Dict[str, Any], Plan]] = {}
         if seed is not None:
             Faker.seed(seed)
             random.seed(seed)
@@ -199,223 +483,12 @@ class TemplateGenerator:
         return output
 
     def _generate_object(self, schema: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate a JSON object matching the schema."""
-        if schema.get("type") != "object":
-            raise ValueError("Top-level schema must be type 'object'")
-
-        properties = schema.get("properties", {})
-        required = set(schema.get("required", []))
-        additional_allowed = schema.get("additionalProperties", True)
-
-        obj = {}
-
-        for prop_name, prop_schema in properties.items():
-            # Always generate required fields, randomly include others
-            if prop_name in required or random.random() > 0.3:
-                value = self._generate_value(prop_name, prop_schema)
-                if value is not None:  # None means skip this field
-                    obj[prop_name] = value
-
-        return obj
-
-    def _generate_value(self, field_name: str, schema: Dict[str, Any]) -> Any:
-        """Generate a value for a specific field based on its schema."""
-        field_type = schema.get("type")
-        field_format = schema.get("format")
-        field_enum = schema.get("enum")
-
-        # Handle enum first (highest priority)
-        if field_enum:
-            return random.choice(field_enum)
-
-        # Handle by type
-        if field_type == "string":
-            return self._generate_string(field_name, schema, field_format)
-        elif field_type == "integer":
-            return self._generate_integer(field_name, schema)
-        elif field_type == "number":
-            return self._generate_number(field_name, schema)
-        elif field_type == "boolean":
-            return random.choice([True, False])
-        elif field_type == "array":
-            return self._generate_array(field_name, schema)
-        elif field_type == "object":
-            return self._generate_nested_object(field_name, schema)
-        elif field_type == "null":
-            return None
-        else:
-            # No type specified or unknown type
-            return self._generate_string(field_name, schema, field_format)
-
-    def _generate_string(self, field_name: str, schema: Dict[str, Any], field_format: Optional[str]) -> str:
-        """Generate a string value based on field name and format."""
-        field_lower = field_name.lower()
-
-        # Handle format hints first
-        if field_format == "email":
-            return self.fake.email()
-        elif field_format == "uri" or field_format == "url":
-            return self.fake.url()
-        elif field_format == "date":
-            return self.fake.date()
-        elif field_format == "date-time":
-            return self.fake.iso8601()
-        elif field_format == "time":
-            return self.fake.time()
-
-        # Handle pattern if specified
-        pattern = schema.get("pattern")
-        if pattern and "phone" not in field_lower:  # Skip regex for phone (use Faker instead)
-            # For simple patterns, try to generate matching values
-            if pattern in ["^[+]?[0-9\\-\\s()]+$", "^[0-9]{3}-[0-9]{3}-[0-9]{4}$"]:
-                return self.fake.phone_number()
-
-        # Field name-based heuristics
-        if "email" in field_lower:
-            return self.fake.email()
-        elif "phone" in field_lower or "tel" in field_lower:
-            return self.fake.phone_number()
-        elif "url" in field_lower or "website" in field_lower or "link" in field_lower:
-            return self.fake.url()
-        elif "address" in field_lower:
-            return self.fake.address()
-        elif "street" in field_lower:
-            return self.fake.street_address()
-        elif "city" in field_lower:
-            return self.fake.city()
-        elif "state" in field_lower or "province" in field_lower:
-            return self.fake.state()
-        elif "country" in field_lower:
-            return self.fake.country()
-        elif "zip" in field_lower or "postal" in field_lower:
-            return self.fake.zipcode()
-        elif "name" in field_lower:
-            if "first" in field_lower:
-                return self.fake.first_name()
-            elif "last" in field_lower:
-                return self.fake.last_name()
-            elif "company" in field_lower or "organization" in field_lower or "vendor" in field_lower:
-                return self.fake.company()
-            else:
-                return self.fake.name()
-        elif "company" in field_lower or "organization" in field_lower:
-            return self.fake.company()
-        elif "job" in field_lower or "title" in field_lower or "position" in field_lower:
-            return self.fake.job()
-        elif "date" in field_lower:
-            return self.fake.date()
-        elif "time" in field_lower:
-            return self.fake.time()
-        elif "description" in field_lower or "comment" in field_lower or "note" in field_lower:
-            return self.fake.sentence(nb_words=random.randint(5, 15))
-        elif "message" in field_lower or "text" in field_lower or "content" in field_lower:
-            return self.fake.paragraph(nb_sentences=random.randint(2, 4))
-        elif "id" in field_lower or "uuid" in field_lower:
-            return self.fake.uuid4()
-        elif "color" in field_lower:
-            return self.fake.color_name()
-        elif "username" in field_lower or "user" in field_lower:
-            return self.fake.user_name()
-        elif "password" in field_lower:
-            return self.fake.password()
-        elif "domain" in field_lower:
-            return self.fake.domain_name()
-        elif "ip" in field_lower:
-            return self.fake.ipv4()
-        elif "mac" in field_lower:
-            return self.fake.mac_address()
-        elif "currency" in field_lower:
-            return random.choice(["USD", "EUR", "GBP", "JPY", "CAD", "AUD"])
-        elif "status" in field_lower:
-            return random.choice(["active", "inactive", "pending", "completed"])
-        elif "type" in field_lower or "category" in field_lower:
-            return random.choice(["standard", "premium", "basic", "advanced"])
-        elif "version" in field_lower:
-            return f"{random.randint(1, 3)}.{random.randint(0, 9)}.{random.randint(0, 20)}"
-        else:
-            # Generic fallback
-            return self.fake.word().capitalize()
-
-    def _generate_integer(self, field_name: str, schema: Dict[str, Any]) -> int:
-        """Generate an integer value."""
-        minimum = schema.get("minimum", 0)
-        maximum = schema.get("maximum", 1000)
-
-        field_lower = field_name.lower()
-
-        # Context-specific ranges
-        if "age" in field_lower:
-            return random.randint(18, 90)
-        elif "year" in field_lower:
-            return random.randint(2020, 2025)
-        elif "month" in field_lower:
-            return random.randint(1, 12)
-        elif "day" in field_lower:
-            return random.randint(1, 28)
-        elif "hour" in field_lower:
-            return random.randint(0, 23)
-        elif "minute" in field_lower or "second" in field_lower:
-            return random.randint(0, 59)
-        elif "count" in field_lower or "total" in field_lower or "quantity" in field_lower:
-            return random.randint(1, 100)
-        elif "port" in field_lower:
-            return random.randint(1024, 65535)
-        elif "percentage" in field_lower or "percent" in field_lower:
-            return random.randint(0, 100)
-        else:
-            return random.randint(minimum, min(maximum, 10000))
-
-    def _generate_number(self, field_name: str, schema: Dict[str, Any]) -> float:
-        """Generate a number (float) value."""
-        minimum = schema.get("minimum", 0.0)
-        maximum = schema.get("maximum", 1000.0)
-
-        field_lower = field_name.lower()
-
-        # Context-specific ranges
-        if "price" in field_lower or "amount" in field_lower or "cost" in field_lower:
-            return round(random.uniform(10.0, 5000.0), 2)
-        elif "rate" in field_lower or "percentage" in field_lower:
-            return round(random.uniform(0.0, 100.0), 2)
-        elif "temperature" in field_lower:
-            return round(random.uniform(-20.0, 40.0), 1)
-        elif "latitude" in field_lower:
-            return round(random.uniform(-90.0, 90.0), 6)
-        elif "longitude" in field_lower:
-            return round(random.uniform(-180.0, 180.0), 6)
-        else:
-            return round(random.uniform(minimum, min(maximum, 10000.0)), 2)
-
-    def _generate_array(self, field_name: str, schema: Dict[str, Any]) -> list:
-        """Generate an array value."""
-        items_schema = schema.get("items", {})
-        min_items = schema.get("minItems", 1)
-        max_items = schema.get("maxItems", 5)
-
-        # Generate random number of items
-        count = random.randint(min_items, min(max_items, 5))
-
-        array = []
-        for i in range(count):
-            value = self._generate_value(f"{field_name}_item", items_schema)
-            if value is not None:
-                array.append(value)
-
-        return array
-
-    def _generate_nested_object(self, field_name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate a nested object."""
-        properties = schema.get("properties", {})
-        required = set(schema.get("required", []))
-
-        obj = {}
-        for prop_name, prop_schema in properties.items():
-            if prop_name in required or random.random() > 0.4:
-                value = self._generate_value(prop_name, prop_schema)
-                if value is not None:
-                    obj[prop_name] = value
-
-        return obj
+        """Generate a JSON object matching the schema (by running its generation plan)."""
+        entry = self._plans.get(id(schema))
+        if entry is None or entry[0] is not schema:
+            entry = (schema, get_plan(schema))
+            self._plans[id(schema)] = entry
+        return entry[1](self.fake)
 
     def _generate_prompt(self, schema_id: str, data: Dict[str, Any], schema: Dict[str, Any]) -> str:
         """
@@ -0,0 +1,145 @@
+# Copyright 2025 CycleCore Technologies
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#!/usr/bin/env python3
+"""
+EdgeJSON Job Submitter
+Queue a batch of evaluation jobs on a running eval_daemon.py.
+
+Each line of the jobs file is one job: a model, a dataset and an output
+path, plus any eval option (adapter, quantize, constrained, limit, ...; see
+daemon_protocol.JOB_DEFAULTS). The daemon orders the jobs to reuse loaded
+models; results stream into `<output>.jsonl` as they complete and each job's
+output JSON (same format as eval.py) is written when it finishes.
+
+Example jobs file:
+    {"model": "HuggingFaceTB/SmolLM2-135M", "dataset": "data/edgejson_test_v3.jsonl", "output": "results/135m.json"}
+    {"model": "HuggingFaceTB/SmolLM2-135M", "dataset": "data/edgejson_test_v3.jsonl", "output": "results/135m_int8.json", "quantize": "int8-dynamic"}
+
+Usage:
+    python submit_jobs.py --jobs nightly_jobs.jsonl
+    python submit_jobs.py --jobs nightly_jobs.jsonl --socket /tmp/edgejson.sock
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent / "lib"))
+
+from eval import ResultsLog, aggregate_results, load_dataset, result_from_dict
+from daemon_protocol import DEFAULT_SOCKET, JOB_DEFAULTS, submit
+
+
+def load_jobs(jobs_path: Path) -> List[Dict]:
+    """Read a jobs file, resolving local paths so the daemon can find them"""
+    jobs = []
+    with open(jobs_path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            for key in ("model", "dataset", "output"):
+                if key not in job:
+                    raise ValueError(f"{jobs_path}:{line_number}: job has no '{key}'")
+            for key in ("model", "adapter", "dataset"):
+                if job.get(key) and Path(job[key]).exists():
+                    job[key] = str(Path(job[key]).resolve())
+            jobs.append(job)
+    return jobs
+
+
+def write_output(job: Dict, results: List, model_info: Dict[str, float]):
+    """Write a finished job's output JSON in eval.py's format"""
+    dataset = load_dataset(Path(job["dataset"]), job.get("limit"))
+    by_id = {result.example_id: result for result in results}
+    results = [by_id[example["id"]] for example in dataset if example["id"] in by_id]
+
+    aggregate = aggregate_results(
+        results,
+        job["model"],
+        "constrained" if job.get("constrained") else "standard",
+        quantization=job.get("quantize") or "none",
+        **model_info
+    )
+
+    output_path = Path(job["output"])
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump({
+            "aggregate": asdict(aggregate),
+            "individual_results": [asdict(r) for r in results]
+        }, f, indent=2)
+
+    print(f"✓ {job['model']}: {aggregate.avg_field_f1:.3f} field F1, "
+          f"{aggregate.schema_compliance_rate:.1%} schema compliance -> {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Submit evaluation jobs to a running eval daemon")
+    parser.add_argument("--jobs", type=str, required=True, help="JSONL file with one job per line")
+    parser.add_argument("--socket", type=str, default=str(DEFAULT_SOCKET), help="Eval daemon socket path")
+
+    args = parser.parse_args()
+
+    jobs = load_jobs(Path(args.jobs))
+    unknown = {key for job in jobs for key in job} - set(JOB_DEFAULTS) - {"model", "dataset", "output"}
+    if unknown:
+        print(f"Error: unknown job option(s): {', '.join(sorted(unknown))}")
+        sys.exit(1)
+
+    print(f"Submitting {len(jobs)} jobs to {args.socket}...")
+
+    by_id = {}
+    logs = {}
+    results = {}
+    failed = 0
+    try:
+        for message in submit(Path(args.socket), jobs):
+            if message["type"] == "accepted":
+                for job_id, job in zip(message["jobs"], jobs):
+                    if job_id is not None:
+                        by_id[job_id] = job
+                        logs[job_id] = ResultsLog(Path(job["output"]).with_suffix(".jsonl"))
+                        results[job_id] = []
+            elif message["type"] == "result":
+                job_id = message["job"]
+                result = result_from_dict(message["result"])
+                logs[job_id].append(result)
+                results[job_id].append(result)
+            elif message["type"] == "job_done":
+                job_id = message["job"]
+                logs.pop(job_id).close()
+                write_output(by_id[job_id], results.pop(job_id), message["model_info"])
+            elif message["type"] == "job_error":
+                failed += 1
+                job = by_id.get(message["job"])
+                print(f"✗ Job {message['job']} ({job['model'] if job else 'rejected'}) failed: {message['error']}")
+                if message["job"] in logs:
+                    logs.pop(message["job"]).close()
+    finally:
+        for log in logs.values():
+            log.close()
+
+    print(f"\n{len(jobs) - failed}/{len(jobs)} jobs completed")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
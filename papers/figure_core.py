@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+Shared plotting core for the Maaza paper figures.
+
+Figure data comes from an EdgeJSON leaderboard artifact
+(benchmarks/edge_json/scripts/build_leaderboard.py), from eval result files
+joined into one on the fly, or from the published paper numbers. Each figure
+is drawn by one function taking a theme (light or dark). Renders are cached
+in the output directory: a figure is only redrawn when the hash of its own
+input data, its theme or this module changes, and stale figures are rendered
+in a process pool.
+
+Copyright 2025 CycleCore Technologies
+Licensed under the Apache License, Version 2.0
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+PAPERS_DIR = Path(__file__).parent
+DEFAULT_OUTPUT_DIR = PAPERS_DIR / 'figures'
+CACHE_FILE = '.render_cache.json'
+DPI = 300
+
+# Leaderboard library (benchmarks/edge_json/scripts/lib)
+LEADERBOARD_LIB = PAPERS_DIR.parent / 'benchmarks' / 'edge_json' / 'scripts' / 'lib'
+
+COMPLEXITY_LEVELS = ['Simple', 'Medium', 'Complex']
+
+# Published results (paper v0.7, Tables 2 and 3), used when no eval data is given
+PAPER_MODELS = [
+    {'name': 'SmolLM2-135M (base)', 'type': 'base', 'params': 135, 'disk_mb': 270, 'json_exact': 1.9,
+     'by_complexity': {'Simple': 4.0, 'Medium': 0.0, 'Complex': 0.0}},
+    {'name': 'Maaza-MLM-135M', 'type': 'maaza', 'params': 135, 'disk_mb': 270, 'json_exact': 24.7,
+     'by_complexity': {'Simple': 44.7, 'Medium': 13.5, 'Complex': 0.0},
+     'fine_tuned_from': 'SmolLM2-135M (base)'},
+    {'name': 'SmolLM2-360M (base)', 'type': 'base', 'params': 360, 'disk_mb': 720, 'json_exact': 11.4,
+     'by_complexity': {'Simple': 23.7, 'Medium': 0.0, 'Complex': 0.0}},
+    {'name': 'Maaza-SLM-360M', 'type': 'maaza', 'params': 360, 'disk_mb': 720, 'json_exact': 55.1,
+     'by_complexity': {'Simple': 78.9, 'Medium': 51.4, 'Complex': 4.0},
+     'fine_tuned_from': 'SmolLM2-360M (base)'},
+    {'name': 'Qwen2.5-0.5B', 'type': 'baseline', 'params': 500, 'disk_mb': 954, 'json_exact': 14.6,
+     'by_complexity': {'Simple': 28.9, 'Medium': 2.7, 'Complex': 0.0}},
+]
+
+THEMES = {
+    'light': {
+        'suffix': '',
+        'style': 'seaborn-v0_8-paper',
+        'rc': {'font.family': 'serif', 'font.size': 10, 'figure.dpi': DPI},
+        'colors': {'maaza': '#2E86AB', 'base': '#A23B72', 'baseline': '#F18F01'},
+        'improvement_colors': ['#27AE60', '#16A085'],
+        'facecolor': None,
+        'edge': 'black',
+        'text': '.15',  # seaborn-v0_8-paper text color
+        'title': '.15',
+        'muted': 'gray',
+        'connector': {'color': 'black', 'alpha': 0.3, 'linewidth': 1},
+        'grid': {'alpha': 0.3},
+        'legend': {},
+        'zero_line': 'black',
+        'alpha': {'scatter_minor': 0.7, 'bar_minor': 0.85, 'base_bar': 1.0, 'major': 1.0},
+        'gain_box': {'text': '#27AE60', 'facecolor': 'white', 'edgecolor': '#27AE60', 'linewidth': 1.5, 'alpha': 0.9},
+        'value_box': {'facecolor': 'white', 'edgecolor': 'gray', 'linewidth': 1, 'alpha': 0.85},
+    },
+    'dark': {
+        'suffix': '_DARK',
+        'style': 'dark_background',
+        'rc': {
+            'font.family': 'serif', 'font.size': 10, 'figure.dpi': DPI,
+            'figure.facecolor': '#1a1a1a', 'axes.facecolor': '#1a1a1a', 'savefig.facecolor': '#1a1a1a',
+            'text.color': '#f0f0f0', 'axes.labelcolor': '#f0f0f0',
+            'xtick.color': '#f0f0f0', 'ytick.color': '#f0f0f0', 'grid.color': '#404040',
+        },
+        'colors': {'maaza': '#4FC3F7', 'base': '#CE93D8', 'baseline': '#FFB74D'},
+        'improvement_colors': ['#66BB6A', '#4FC3F7'],
+        'facecolor': '#1a1a1a',
+        'edge': 'white',
+        'text': '#f0f0f0',
+        'title': '#ffffff',
+        'muted': '#aaaaaa',
+        'connector': {'color': 'white', 'alpha': 0.4, 'linewidth': 1.5},
+        'grid': {'alpha': 0.2, 'color': '#505050'},
+        'legend': {'facecolor': '#2a2a2a', 'edgecolor': '#505050'},
+        'zero_line': '#808080',
+        'alpha': {'scatter_minor': 0.8, 'bar_minor': 0.75, 'base_bar': 0.8, 'major': 0.95},
+        'gain_box': {'text': '#66FF66', 'facecolor': '#2a2a2a', 'edgecolor': '#66FF66', 'linewidth': 2, 'alpha': 0.95},
+        'value_box': {'facecolor': '#2a2a2a', 'edgecolor': '#808080', 'linewidth': 1.5, 'alpha': 0.9},
+    },
+}
+
+MARKERS = {'maaza': ('o', 200), 'base': ('D', 150), 'baseline': ('s', 150)}
+
+
+# ---------------------------------------------------------------------------
+# Figure data
+# ---------------------------------------------------------------------------
+
+def label(model):
+    """Short display name"""
+    return model.get('label') or model['name'].replace(' (base)', '')
+
+
+def models_from_leaderboard(leaderboard):
+    """
+    Figure models from a leaderboard artifact.
+
+    Scores become percentages. params, type, disk_mb, label and
+    fine_tuned_from come from the leaderboard's model metadata
+    (build_leaderboard.py --metadata); disk size falls back to the
+    measured model_size_mb.
+    """
+    models = []
+    overall = leaderboard['overall']
+    for i, entry in enumerate(leaderboard['models']):
+        if overall['count'][i] == 0:
+            continue
+        model = {
+            'name': entry['name'],
+            'type': entry.get('type', 'baseline'),
+            'json_exact': overall['json_exact'][i] * 100,
+            'by_complexity': {
+                level.capitalize(): (group['json_exact'][i] or 0.0) * 100
+                for level, group in leaderboard['by_complexity'].items()
+                if level.capitalize() in COMPLEXITY_LEVELS
+            },
+        }
+        for field in ('label', 'params', 'fine_tuned_from'):
+            if field in entry:
+                model[field] = entry[field]
+        disk_mb = entry.get('disk_mb', entry.get('model_size_mb'))
+        if disk_mb is not None:
+            model['disk_mb'] = disk_mb
+        models.append(model)
+    return models
+
+
+def load_models(leaderboard_path=None, result_paths=None, metadata_path=None):
+    """Figure models from a leaderboard, from eval result files, or the paper numbers"""
+    if not leaderboard_path and not result_paths:
+        return PAPER_MODELS
+
+    sys.path.insert(0, str(LEADERBOARD_LIB))
+    from leaderboard import build_leaderboard, load_leaderboard, load_run
+
+    if leaderboard_path:
+        leaderboard = load_leaderboard(leaderboard_path)
+    else:
+        metadata = None
+        if metadata_path:
+            with open(metadata_path, 'r') as f:
+                metadata = json.load(f)
+        leaderboard = build_leaderboard([load_run(path) for path in result_paths], metadata=metadata)
+    return models_from_leaderboard(leaderboard)
+
+
+def fine_tuning_pairs(models):
+    """(base model, fine-tuned model) pairs linked by fine_tuned_from"""
+    by_name = {model['name']: model for model in models}
+    return [
+        (by_name[model['fine_tuned_from']], model)
+        for model in models if model.get('fine_tuned_from') in by_name
+    ]
+
+
+def gain_label(base_score, tuned_score):
+    """Fine-tuning multiplier, e.g. '13×' or '4.8×'"""
+    if base_score <= 0:
+        return 'new'
+    ratio = tuned_score / base_score
+    return f'{ratio:.0f}×' if ratio >= 10 else f'{ratio:.1f}×'
+
+
+def score_ylim(scores):
+    """JSONExact axis range: a little room below zero, top rounded up to 10%"""
+    return -2, max(10, math.ceil(max(scores, default=0) * 1.05 / 10) * 10)
+
+
+# Per-figure data: only what a figure draws goes into its cache key
+
+def performance_vs_size_data(models):
+    points = [m for m in models if 'params' in m]
+    return {
+        'models': [{'label': label(m), 'type': m['type'], 'params': m['params'], 'json_exact': m['json_exact']}
+                   for m in points],
+        'pairs': [{'params': (b['params'], t['params']), 'scores': (b['json_exact'], t['json_exact'])}
+                  for b, t in fine_tuning_pairs(points)],
+    }
+
+
+def performance_by_complexity_data(models):
+    return {
+        'models': [{'label': label(m), 'type': m['type'],
+                    'scores': [m['by_complexity'].get(level, 0.0) for level in COMPLEXITY_LEVELS]}
+                   for m in models],
+    }
+
+
+def disk_size_data(models):
+    return {
+        'models': [{'label': label(m), 'type': m['type'], 'disk_mb': m['disk_mb'],
+                    'json_exact': m['json_exact']}
+                   for m in models if 'disk_mb' in m],
+    }
+
+
+def fine_tuning_data(models):
+    return {
+        'pairs': [{'label': label(b), 'base': b['json_exact'], 'tuned': t['json_exact']}
+                  for b, t in fine_tuning_pairs(models)],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Drawing (one function per figure, all themed)
+# ---------------------------------------------------------------------------
+
+def _style_axes(ax, theme, xlabel, ylabel, title, grid_axis='both', title_size=12, pad=15):
+    if theme['facecolor']:
+        ax.set_facecolor(theme['facecolor'])
+    ax.set_xlabel(xlabel, fontsize=11, fontweight='bold', color=theme['text'])
+    ax.set_ylabel(ylabel, fontsize=11, fontweight='bold', color=theme['text'])
+    ax.set_title(title, fontsize=title_size, fontweight='bold', pad=pad, color=theme['title'])
+    ax.grid(True, linestyle='--', axis=grid_axis, **theme['grid'])
+
+
+def _legend(ax, theme, **kwargs):
+    import matplotlib.pyplot as plt
+
+    legend = ax.legend(**kwargs, **theme['legend'])
+    plt.setp(legend.get_texts(), color=theme['text'])
+
+
+def _type_legend(ax, theme, models, baseline_suffix=''):
+    import matplotlib.patches as mpatches
+
+    baseline_names = ', '.join(m['label'] for m in models if m['type'] == 'baseline')
+    labels = {
+        'maaza': 'Fine-tuned (Maaza)',
+        'base': 'Base (Zero-shot)',
+        'baseline': f'{baseline_names}{baseline_suffix}',
+    }
+    present = {m['type'] for m in models}
+    handles = [mpatches.Patch(color=theme['colors'][t], label=labels[t]) for t in labels if t in present]
+    _legend(ax, theme, handles=handles, loc='upper left', fontsize=9)
+
+
+def _scatter(ax, theme, model, x, y, text_offsets):
+    marker, size = MARKERS[model['type']]
+    major = model['type'] == 'maaza'
+    ax.scatter(x, y, s=size, marker=marker, color=theme['colors'][model['type']],
+               edgecolors=theme['edge'], linewidths=1.5,
+               alpha=theme['alpha']['major'] if major else theme['alpha']['scatter_minor'],
+               zorder=4 if major else 3)
+    offset, ha = text_offsets[model['type']]
+    ax.annotate(model['label'], (x, y), xytext=offset, textcoords='offset points', fontsize=8, ha=ha,
+                fontweight='bold' if major else 'normal',
+                color=theme['title'] if major else theme['text'])
+
+
+def draw_performance_vs_size(data, theme):
+    """Figure 1: JSONExact vs Model Size - showing fine-tuning advantage."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(8, 5), facecolor=theme['facecolor'])
+    offsets = {'maaza': ((10, 10), 'left'), 'base': ((10, -15), 'left'), 'baseline': ((-10, 10), 'right')}
+    for model in data['models']:
+        _scatter(ax, theme, model, model['params'], model['json_exact'], offsets)
+
+    # Connection lines and multipliers show fine-tuning gains
+    for pair in data['pairs']:
+        ax.plot(pair['params'], pair['scores'], linestyle='--', zorder=1, **theme['connector'])
+        ax.annotate(f"{gain_label(*pair['scores'])} gain", (np.mean(pair['params']), np.mean(pair['scores'])),
+                    fontsize=9, ha='center', style='italic', color=theme['muted'])
+
+    _style_axes(ax, theme, 'Model Parameters (millions)', 'JSONExact Score (%)',
+                'Figure 1: Performance vs Model Size\nTask Specialization Outperforms Parameter Scaling')
+    params = [m['params'] for m in data['models']]
+    if params:
+        ax.set_xlim(min(params) - 35, max(params) + 50)
+    ax.set_ylim(*score_ylim(m['json_exact'] for m in data['models']))
+    _type_legend(ax, theme, data['models'], baseline_suffix=' (Baseline)')
+    return fig
+
+
+def draw_performance_by_complexity(data, theme):
+    """Figure 2: Performance breakdown by schema complexity."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 6), facecolor=theme['facecolor'])
+    models = data['models']
+    x = np.arange(len(COMPLEXITY_LEVELS))
+    width = min(0.15, 0.8 / max(len(models), 1))
+
+    base_hatches = ['///', '...']
+    base_seen = 0
+    for i, model in enumerate(models):
+        if model['type'] == 'base':
+            hatch = base_hatches[base_seen % len(base_hatches)]
+            base_seen += 1
+        else:
+            hatch = '' if model['type'] == 'maaza' else 'xxx'
+        ax.bar(x + (i - (len(models) - 1) / 2) * width, model['scores'], width,
+               label=model['label'],
+               color=theme['colors'][model['type']],
+               edgecolor=theme['edge'],
+               linewidth=0.8,
+               hatch=hatch,
+               alpha=theme['alpha']['major'] if model['type'] == 'maaza' else theme['alpha']['bar_minor'])
+
+    _style_axes(ax, theme, 'Schema Complexity', 'JSONExact Score (%)',
+                'Figure 2: Performance by Schema Complexity\nCapacity Threshold Emerges at ~300M Parameters',
+                grid_axis='y')
+    ax.set_xticks(x)
+    ax.set_xticklabels(COMPLEXITY_LEVELS)
+    _legend(ax, theme, fontsize=8, loc='upper right', ncol=1)
+
+    # Horizontal line at 0% for reference
+    ax.axhline(y=0, color=theme['zero_line'], linewidth=0.5)
+    return fig
+
+
+def draw_disk_size_vs_performance(data, theme):
+    """Figure 3: Disk size vs performance - efficiency comparison."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(8, 5), facecolor=theme['facecolor'])
+    offsets = {'maaza': ((10, 10), 'left'), 'base': ((10, -15), 'left'), 'baseline': ((10, -15), 'left')}
+    for model in data['models']:
+        _scatter(ax, theme, model, model['disk_mb'], model['json_exact'], offsets)
+
+    _style_axes(ax, theme, 'Disk Size (MB)', 'JSONExact Score (%)',
+                'Figure 3: Model Size vs Performance\nEdge Deployment Efficiency')
+    sizes = [m['disk_mb'] for m in data['models']]
+    if sizes:
+        ax.set_xlim(min(sizes) * 0.75, max(sizes) * 1.05)
+    ax.set_ylim(*score_ylim(m['json_exact'] for m in data['models']))
+    _type_legend(ax, theme, data['models'])
+    return fig
+
+
+def draw_fine_tuning_comparison(data, theme):
+    """Figure 4: Before/after fine-tuning comparison bars."""
+    import matplotlib.pyplot as plt
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5), facecolor=theme['facecolor'])
+    labels = [p['label'] for p in data['pairs']]
+    base_scores = [p['base'] for p in data['pairs']]
+    tuned_scores = [p['tuned'] for p in data['pairs']]
+    x = np.arange(len(labels))
+    width = 0.35
+
+    # Left plot: Side-by-side comparison
+    ax1.bar(x - width / 2, base_scores, width, label='Base (Zero-shot)', color=theme['colors']['base'],
+            edgecolor=theme['edge'], linewidth=1, alpha=theme['alpha']['base_bar'])
+    ax1.bar(x + width / 2, tuned_scores, width, label='Fine-tuned (Maaza)', color=theme['colors']['maaza'],
+            edgecolor=theme['edge'], linewidth=1, alpha=theme['alpha']['major'])
+    _style_axes(ax1, theme, 'Model', 'JSONExact Score (%)', '(A) Base vs Fine-tuned Performance',
+                grid_axis='y', title_size=11, pad=None)
+    ax1.set_xticks(x)
+    ax1.set_xticklabels(labels)
+    _legend(ax1, theme, fontsize=9)
+
+    # Gain labels above each fine-tuned bar (offsets scale with the axis: +5 at the paper's 55%)
+    gain_offset = 0.09 * max(tuned_scores + [1.0])
+    gain_box = dict(theme['gain_box'])
+    gain_color = gain_box.pop('text')
+    for i, (base, tuned) in enumerate(zip(base_scores, tuned_scores)):
+        ax1.text(i, tuned + gain_offset, gain_label(base, tuned), ha='center', va='bottom', fontsize=10, fontweight='bold',
+                 color=gain_color, bbox=dict(boxstyle='round,pad=0.3', **gain_box))
+
+    # Right plot: Improvement ratios
+    improvement_pct = [(tuned - base) / base * 100 if base > 0 else 0.0
+                       for base, tuned in zip(base_scores, tuned_scores)]
+    colors = [theme['improvement_colors'][i % len(theme['improvement_colors'])] for i in range(len(labels))]
+    bars = ax2.bar(x, improvement_pct, width * 2, color=colors, edgecolor=theme['edge'], linewidth=1)
+    _style_axes(ax2, theme, 'Model', 'Improvement (%)', '(B) Fine-tuning Improvement',
+                grid_axis='y', title_size=11, pad=None)
+    ax2.set_xticks(x)
+    ax2.set_xticklabels(labels)
+
+    value_offset = 0.0125 * max(improvement_pct + [1.0])
+    for bar, value in zip(bars, improvement_pct):
+        ax2.text(bar.get_x() + bar.get_width() / 2., bar.get_height() + value_offset, f'+{value:.0f}%',
+                 ha='center', va='bottom', fontsize=10, fontweight='bold', color=theme['title'],
+                 bbox=dict(boxstyle='round,pad=0.4', **theme['value_box']))
+
+    plt.suptitle('Figure 4: Fine-tuning Impact on Small Language Models',
+                 fontsize=13, fontweight='bold', y=1.02, color=theme['title'])
+    return fig
+
+
+# Output stem -> (data function, draw function)
+FIGURES = {
+    'figure1_performance_vs_size': (performance_vs_size_data, draw_performance_vs_size),
+    'figure2_performance_by_complexity': (performance_by_complexity_data, draw_performance_by_complexity),
+    'figure3_disk_size_vs_performance': (disk_size_data, draw_disk_size_vs_performance),
+    'figure4_fine_tuning_comparison': (fine_tuning_data, draw_fine_tuning_comparison),
+}
+
+
+# ---------------------------------------------------------------------------
+# Cached, parallel rendering
+# ---------------------------------------------------------------------------
+
+def _core_hash():
+    """Hash of this module, so changes to the drawing code invalidate the cache"""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def render_key(figure_data, theme_name):
+    """Cache key of one figure: its data, its theme and the drawing code"""
+    payload = json.dumps({'data': figure_data, 'theme': THEMES[theme_name], 'core': _core_hash()},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def render_figure(figure, theme_name, figure_data, output_dir):
+    """Draw one figure in one theme and save PNG (300 DPI) and PDF; runs in a worker process"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    theme = THEMES[theme_name]
+    stem = f"{figure}{theme['suffix']}"
+    with plt.style.context(theme['style']), plt.rc_context(theme['rc']):
+        fig = FIGURES[figure][1](figure_data, theme)
+        fig.tight_layout()
+        for extension in ('png', 'pdf'):
+            fig.savefig(Path(output_dir) / f'{stem}.{extension}', dpi=DPI, bbox_inches='tight',
+                        facecolor=theme['facecolor'] or 'white')
+        plt.close(fig)
+    return stem
+
+
+def render_all(models, themes, output_dir=DEFAULT_OUTPUT_DIR, workers=None, force=False):
+    """
+    Render every figure in every theme whose cache key changed.
+
+    Returns:
+        (rendered stems, up-to-date stems)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    cache_path = output_dir / CACHE_FILE
+    cache = json.loads(cache_path.read_text()) if cache_path.exists() else {}
+
+    jobs, fresh = [], []
+    for figure, (data_fn, _) in FIGURES.items():
+        figure_data = data_fn(models)
+        for theme_name in themes:
+            stem = f"{figure}{THEMES[theme_name]['suffix']}"
+            key = render_key(figure_data, theme_name)
+            outputs_exist = all((output_dir / f'{stem}.{ext}').exists() for ext in ('png', 'pdf'))
+            if not force and cache.get(stem) == key and outputs_exist:
+                fresh.append(stem)
+            else:
+                jobs.append((stem, key, (figure, theme_name, figure_data, str(output_dir))))
+
+    rendered = []
+    try:
+        if len(jobs) > 1 and workers != 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [(stem, key, pool.submit(render_figure, *args)) for stem, key, args in jobs]
+                for stem, key, future in futures:
+                    future.result()
+                    cache[stem] = key
+                    rendered.append(stem)
+        else:
+            for stem, key, args in jobs:
+                render_figure(*args)
+                cache[stem] = key
+                rendered.append(stem)
+    finally:
+        # Keep the keys of figures that did render, even if another one failed
+        cache_path.write_text(json.dumps(cache, indent=2, sort_keys=True))
+    return rendered, fresh
+
+
+def main(default_theme='light'):
+    """Command line shared by generate_figures.py and generate_figures_dark.py"""
+    parser = argparse.ArgumentParser(description='Generate Maaza paper figures')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--leaderboard', type=str, help='Leaderboard JSON from build_leaderboard.py')
+    source.add_argument('--results', type=str, nargs='+', help='eval.py results JSON files')
+    parser.add_argument('--metadata', type=str,
+                        help='Model metadata JSON for --results (params, type, disk_mb, fine_tuned_from)')
+    parser.add_argument('--theme', choices=[*THEMES, 'all'], default=default_theme, help='Figure theme')
+    parser.add_argument('--output-dir', type=str, default=str(DEFAULT_OUTPUT_DIR), help='Figure directory')
+    parser.add_argument('--workers', type=int, help='Render processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Re-render even if the render cache is current')
+    args = parser.parse_args()
+
+    themes = list(THEMES) if args.theme == 'all' else [args.theme]
+    source = args.leaderboard or (f'{len(args.results)} result files' if args.results else 'paper v0.7 numbers')
+
+    print("\n" + "=" * 70)
+    print(f"📊 Generating Publication Figures for Maaza Paper ({', '.join(themes)})")
+    print("=" * 70 + "\n")
+    print(f"Data: {source}")
+
+    start = time.perf_counter()
+    models = load_models(args.leaderboard, args.results, args.metadata)
+    rendered, fresh = render_all(models, themes, args.output_dir, args.workers, args.force)
+
+    for stem in rendered:
+        print(f"✅ {stem} saved")
+    for stem in fresh:
+        print(f"⏭️  {stem} up to date")
+
+    print("\n" + "=" * 70)
+    print(f"✅ {len(rendered)} rendered, {len(fresh)} cached in {time.perf_counter() - start:.1f}s")
+    print("=" * 70)
+    print(f"\n📁 Output directory: {args.output_dir}")
+    print(f"💡 Figures saved in both PNG ({DPI} DPI) and PDF (vector) formats\n")
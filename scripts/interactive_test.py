@@ -4,13 +4,23 @@ Interactive test script for CycleCore Maaza models
 Allows you to chat with MLM-135M or SLM-360M in the terminal
 """
 
+import argparse
 import sys
+from pathlib import Path
+
 import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM
-from peft import PeftModel
+from transformers import StoppingCriteriaList
+
+# Add EdgeJSON lib to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks" / "edge_json" / "scripts" / "lib"))
 
-def load_model(model_choice):
-    """Load the selected model"""
+from prefix_cache import PrefixCache, format_prompt
+from json_stopping import JSONObjectStoppingCriteria
+from speculative import SpeculativeDecoder, check_shared_vocab
+import model_loader
+
+def load_model(model_choice, merge_adapter=False):
+    """Load the selected model (from the cached merged checkpoint with merge_adapter)"""
     print(f"\n{'='*60}")
     print(f"Loading {model_choice}...")
     print(f"{'='*60}\n")
@@ -24,50 +34,57 @@ def load_model(model_choice):
         adapter_path = "/home/rain/SLMBench/models/slm_360m_json/final_model"
         model_name = "CycleCore Maaza SLM-360M-JSON v1.0.0"
 
-    # Load tokenizer
-    print("Loading tokenizer...")
-    tokenizer = AutoTokenizer.from_pretrained(base_path)
-
-    # Load base model
-    print("Loading base model...")
-    base_model = AutoModelForCausalLM.from_pretrained(
+    # Shared fast load path (mmap'd safetensors, adapter applied or merged)
+    model, tokenizer = model_loader.load_model(
         base_path,
-        torch_dtype=torch.float16,
-        device_map="auto"
+        adapter_path,
+        device="cuda" if torch.cuda.is_available() else "cpu",
+        dtype=torch.float16,
+        merge_adapter=merge_adapter
     )
 
-    # Load LoRA adapter
-    print("Loading LoRA adapter...")
-    model = PeftModel.from_pretrained(base_model, adapter_path)
-    model.eval()
-
     print(f"\n✓ {model_name} loaded successfully!")
     print(f"Device: {next(model.parameters()).device}")
     print(f"{'='*60}\n")
 
     return model, tokenizer, model_name
 
-def format_prompt(user_input):
-    """Format user input as JSON extraction prompt"""
-    return f"""Extract the structured JSON data from the following text.
-
-Input: {user_input}
-
-Output:"""
+def generate_response(model, tokenizer, prompt, max_tokens=512, prefix_cache=None, stop_at_json_end=True, speculative=None):
+    """
+    Generate model response (continuing from the cached preamble if given).
 
-def generate_response(model, tokenizer, prompt, max_tokens=512):
-    """Generate model response"""
+    By default generation stops as soon as the top-level JSON object closes.
+    With a speculative decoder, a smaller model drafts tokens (same output).
+    """
     inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
+    cache_kwargs = prefix_cache.generate_kwargs(inputs["input_ids"]) if prefix_cache else {}
 
-    with torch.no_grad():
-        outputs = model.generate(
-            **inputs,
-            max_new_tokens=max_tokens,
-            temperature=0.0,
-            do_sample=False,
-            pad_token_id=tokenizer.eos_token_id
+    stopping_criteria = StoppingCriteriaList()
+    if stop_at_json_end:
+        stopping_criteria.append(
+            JSONObjectStoppingCriteria(tokenizer, inputs["input_ids"].shape[1], max_tokens)
         )
 
+    with torch.no_grad():
+        if speculative:
+            outputs, _ = speculative.generate(
+                inputs["input_ids"],
+                max_tokens,
+                eos_token_id=tokenizer.eos_token_id,
+                stopping_criteria=stopping_criteria,
+                **cache_kwargs
+            )
+        else:
+            outputs = model.generate(
+                **inputs,
+                max_new_tokens=max_tokens,
+                temperature=0.0,
+                do_sample=False,
+                pad_token_id=tokenizer.eos_token_id,
+                stopping_criteria=stopping_criteria,
+                **cache_kwargs
+            )
+
     # Decode and extract just the generated part
     full_response = tokenizer.decode(outputs[0], skip_special_tokens=True)
 
@@ -96,6 +113,13 @@ def print_examples():
     print()
 
 def main():
+    parser = argparse.ArgumentParser(description="Interactive test for CycleCore Maaza models")
+    parser.add_argument("--merge-adapter", action="store_true",
+                        help="Merge the LoRA adapter into the base weights once and reuse the cached merged model")
+    parser.add_argument("--speculative", action="store_true",
+                        help="With SLM-360M, let MLM-135M draft tokens for it (speculative decoding, same output)")
+    args = parser.parse_args()
+
     print("\n" + "="*60)
     print("CycleCore Maaza Models - Interactive Test")
     print("="*60)
@@ -113,7 +137,17 @@ def main():
         print("Invalid choice. Please enter 1 or 2.")
 
     # Load model
-    model, tokenizer, model_name = load_model(model_choice)
+    model, tokenizer, model_name = load_model(model_choice, args.merge_adapter)
+
+    # Precompute the KV cache of the instruction preamble once
+    prefix_cache = PrefixCache(model, tokenizer)
+
+    speculative = None
+    if args.speculative and model_choice == "360M":
+        draft_model, draft_tokenizer, draft_name = load_model("135M", args.merge_adapter)
+        check_shared_vocab(tokenizer, draft_tokenizer)
+        speculative = SpeculativeDecoder(model, draft_model, draft_prefix_cache=PrefixCache(draft_model, draft_tokenizer))
+        print(f"✓ Speculative decoding: {draft_name} drafts for {model_name}")
 
     # Show examples
     print_examples()
@@ -148,7 +182,7 @@ def main():
             print(f"\n🤖 {model_name}:")
             print("-" * 60)
 
-            response = generate_response(model, tokenizer, prompt)
+            response = generate_response(model, tokenizer, prompt, prefix_cache=prefix_cache, speculative=speculative)
             print(response)
             print("-" * 60)
 
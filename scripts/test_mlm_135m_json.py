@@ -9,6 +9,7 @@ Tests the trained LoRA model on sample prompts to verify:
 
 Usage:
     python scripts/test_mlm_135m_json.py [--device cpu/cuda]
+    python scripts/test_mlm_135m_json.py --base-model <360m> --adapter <360m adapter> --draft-model <135m> --draft-adapter <135m adapter>
 """
 
 import json
@@ -18,8 +19,16 @@ import time
 from pathlib import Path
 
 import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM
-from peft import PeftModel
+from transformers import StoppingCriteriaList
+
+# Add EdgeJSON lib to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks" / "edge_json" / "scripts" / "lib"))
+
+from prefix_cache import PrefixCache, format_prompt
+from json_stopping import JSONObjectStoppingCriteria
+from json_stream import find_json_object
+from speculative import SpeculativeDecoder, check_shared_vocab
+import model_loader
 
 
 # Test cases covering different complexity levels
@@ -51,8 +60,8 @@ TEST_CASES = [
 ]
 
 
-def load_model(base_model_path: str, adapter_path: str, device: str = "cuda"):
-    """Load base model and LoRA adapter."""
+def load_model(base_model_path: str, adapter_path: str, device: str = "cuda", merge_adapter: bool = False):
+    """Load base model and LoRA adapter (or the cached merged checkpoint with merge_adapter)."""
     print("=" * 80)
     print("Loading Model and Adapter")
     print("=" * 80)
@@ -61,27 +70,16 @@ def load_model(base_model_path: str, adapter_path: str, device: str = "cuda"):
     print(f"Device: {device}")
     print()
 
-    # Load tokenizer
-    print("Loading tokenizer...")
-    tokenizer = AutoTokenizer.from_pretrained(base_model_path)
-    if tokenizer.pad_token is None:
-        tokenizer.pad_token = tokenizer.eos_token
-
-    # Load base model
-    print("Loading base model...")
-    base_model = AutoModelForCausalLM.from_pretrained(
+    # Shared fast load path (mmap'd safetensors, adapter applied or merged)
+    model, tokenizer = model_loader.load_model(
         base_model_path,
-        torch_dtype=torch.bfloat16 if device == "cuda" else torch.float32,
-        device_map="auto" if device == "cuda" else None
+        adapter_path,
+        device=device,
+        dtype=torch.bfloat16 if device == "cuda" else torch.float32,
+        merge_adapter=merge_adapter
     )
-
-    if device == "cpu":
-        base_model = base_model.to("cpu")
-
-    # Load LoRA adapter
-    print("Loading LoRA adapter...")
-    model = PeftModel.from_pretrained(base_model, adapter_path)
-    model.eval()
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
 
     print("✓ Model loaded successfully")
     print()
@@ -91,45 +89,21 @@ def load_model(base_model_path: str, adapter_path: str, device: str = "cuda"):
 
 def extract_json_from_output(text: str) -> dict:
     """Extract JSON from model output text."""
-    # Try to find JSON in the output
-    # Model outputs format: "Output: {json}"
+    # Model outputs format: "Output: {json}", so start after the last "Output:"
+    start = text.rfind("Output:")
+    start = start + len("Output:") if start != -1 else 0
 
-    # First try: split on "Output:" and take everything after
-    if "Output:" in text:
-        json_text = text.split("Output:")[-1].strip()
-    else:
-        json_text = text.strip()
+    # Single pass: first balanced, parseable object (trailing generated text is ignored)
+    match = find_json_object(text, start)
+    if match is None:
+        if text.find("{", start) == -1:
+            raise ValueError("No JSON object found in output")
+        raise ValueError("Could not parse valid JSON from output")
+    return match.value
 
-    # Find first { and try to parse progressively
-    start = json_text.find("{")
-    if start == -1:
-        raise ValueError("No JSON object found in output")
 
-    # Try to find valid JSON by progressively including more text
-    # This handles cases where model generates text after JSON
-    for end_pos in range(len(json_text), start, -1):
-        try:
-            candidate = json_text[start:end_pos]
-            # Try to parse
-            parsed = json.loads(candidate)
-            return parsed
-        except json.JSONDecodeError:
-            # Try next position
-            continue
-
-    # If that didn't work, try to find just up to the last }
-    end = json_text.rfind("}") + 1
-    if end > start:
-        try:
-            return json.loads(json_text[start:end])
-        except json.JSONDecodeError:
-            pass
-
-    raise ValueError("Could not parse valid JSON from output")
-
-
-def test_extraction(model, tokenizer, test_case: dict, device: str = "cuda"):
-    """Test model on a single case."""
+def test_extraction(model, tokenizer, test_case: dict, device: str = "cuda", prefix_cache=None, speculative=None):
+    """Test model on a single case (continuing from the cached preamble, drafting with a speculative decoder if given)."""
     print("-" * 80)
     print(f"Test: {test_case['name']} ({test_case['complexity']})")
     print("-" * 80)
@@ -137,27 +111,47 @@ def test_extraction(model, tokenizer, test_case: dict, device: str = "cuda"):
     print()
 
     # Format prompt
-    full_prompt = f"Extract the structured JSON data from the following text.\n\nInput: {test_case['prompt']}\n\nOutput:"
+    full_prompt = format_prompt(test_case['prompt'])
 
     # Tokenize
     inputs = tokenizer(full_prompt, return_tensors="pt")
     if device == "cuda":
         inputs = {k: v.to(device) for k, v in inputs.items()}
+    cache_kwargs = prefix_cache.generate_kwargs(inputs["input_ids"]) if prefix_cache else {}
+
+    # Stop as soon as the top-level JSON object closes
+    max_new_tokens = 200
+    json_stop = JSONObjectStoppingCriteria(tokenizer, inputs["input_ids"].shape[1], max_new_tokens)
 
     # Generate with stop strings
     start_time = time.time()
+    acceptance_rate = None
     with torch.no_grad():
-        outputs = model.generate(
-            **inputs,
-            max_new_tokens=200,
-            do_sample=False,
-            pad_token_id=tokenizer.pad_token_id,
-            eos_token_id=tokenizer.eos_token_id,
-            # Stop at double newline or when repeating the prompt structure
-            stop_strings=["\\n\\nInput:", "\\n\\nExtract", "Please extract"],
-            tokenizer=tokenizer
-        )
+        if speculative:
+            # Speculative generation applies the JSON stop but not stop_strings
+            outputs, stats = speculative.generate(
+                inputs["input_ids"],
+                max_new_tokens,
+                eos_token_id=tokenizer.eos_token_id,
+                stopping_criteria=StoppingCriteriaList([json_stop]),
+                **cache_kwargs
+            )
+            acceptance_rate = stats.acceptance_rate
+        else:
+            outputs = model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                do_sample=False,
+                pad_token_id=tokenizer.pad_token_id,
+                eos_token_id=tokenizer.eos_token_id,
+                # Stop at double newline or when repeating the prompt structure
+                stop_strings=["\\n\\nInput:", "\\n\\nExtract", "Please extract"],
+                tokenizer=tokenizer,
+                stopping_criteria=StoppingCriteriaList([json_stop]),
+                **cache_kwargs
+            )
     generation_time = time.time() - start_time
+    tokens_saved = json_stop.tokens_saved()
 
     # Decode
     result_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
@@ -198,6 +192,10 @@ def test_extraction(model, tokenizer, test_case: dict, device: str = "cuda"):
         json_output = None
 
     print(f"Generation time: {generation_time:.3f}s")
+    if acceptance_rate is not None:
+        print(f"Draft acceptance: {acceptance_rate:.1%}")
+    if tokens_saved:
+        print(f"JSON early stop: up to {tokens_saved} tokens saved")
     print()
 
     return {
@@ -206,6 +204,8 @@ def test_extraction(model, tokenizer, test_case: dict, device: str = "cuda"):
         "parse_status": parse_status,
         "field_status": field_status,
         "generation_time": generation_time,
+        "tokens_saved": tokens_saved,
+        "acceptance_rate": acceptance_rate,
         "output": json_output
     }
 
@@ -220,6 +220,12 @@ def main():
     parser.add_argument("--adapter", type=str,
                        default="/home/rain/SLMBench/models/mlm_135m_json/final_model",
                        help="Path to LoRA adapter")
+    parser.add_argument("--merge-adapter", action="store_true",
+                       help="Merge the adapter into the base weights once and reuse the cached merged model")
+    parser.add_argument("--draft-model", type=str,
+                       help="Smaller base model (same tokenizer) that drafts tokens for speculative decoding")
+    parser.add_argument("--draft-adapter", type=str,
+                       help="LoRA adapter for --draft-model (optional)")
 
     args = parser.parse_args()
 
@@ -247,13 +253,26 @@ def main():
 
     # Load model
     try:
-        model, tokenizer = load_model(str(base_model_path), str(adapter_path), args.device)
+        model, tokenizer = load_model(str(base_model_path), str(adapter_path), args.device, args.merge_adapter)
     except Exception as e:
         print(f"Error loading model: {e}")
         import traceback
         traceback.print_exc()
         return 1
 
+    # Precompute the KV cache of the instruction preamble once
+    prefix_cache = PrefixCache(model, tokenizer)
+
+    speculative = None
+    if args.draft_model:
+        try:
+            draft_model, draft_tokenizer = load_model(args.draft_model, args.draft_adapter, args.device, args.merge_adapter)
+            check_shared_vocab(tokenizer, draft_tokenizer)
+        except Exception as e:
+            print(f"Error loading draft model: {e}")
+            return 1
+        speculative = SpeculativeDecoder(model, draft_model, draft_prefix_cache=PrefixCache(draft_model, draft_tokenizer))
+
     # Run tests
     print("=" * 80)
     print("Running Test Cases")
@@ -263,7 +282,7 @@ def main():
     results = []
     for test_case in TEST_CASES:
         try:
-            result = test_extraction(model, tokenizer, test_case, args.device)
+            result = test_extraction(model, tokenizer, test_case, args.device, prefix_cache, speculative)
             results.append(result)
         except Exception as e:
             print(f"✗ Test failed with error: {e}")
@@ -275,6 +294,8 @@ def main():
                 "parse_status": "ERROR",
                 "field_status": "N/A",
                 "generation_time": 0,
+                "tokens_saved": 0,
+                "acceptance_rate": None,
                 "output": None
             })
         print()
@@ -289,11 +310,13 @@ def main():
     parse_pass = sum(1 for r in results if r["parse_status"] == "PASS")
     field_pass = sum(1 for r in results if r["field_status"] == "PASS")
     avg_time = sum(r["generation_time"] for r in results) / total if total > 0 else 0
+    tokens_saved = sum(r["tokens_saved"] for r in results)
 
     print(f"Total tests: {total}")
     print(f"Valid JSON: {parse_pass}/{total} ({parse_pass/total*100:.1f}%)")
     print(f"All fields correct: {field_pass}/{total} ({field_pass/total*100:.1f}%)")
     print(f"Average generation time: {avg_time:.3f}s")
+    print(f"JSON early stop: up to {tokens_saved} tokens saved")
     print()
 
     # Results table